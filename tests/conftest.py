@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# 脚本都在仓库根目录，测试直接按模块名导入
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wechat_core
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """在临时目录中运行（配置、状态文件都写在这里），列表页失败后的重试不等待"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(wechat_core.AdaptiveThrottle, 'backoff_delay', staticmethod(lambda *a, **k: 0))
+    return tmp_path
+
+
+@pytest.fixture(params=['sync', 'async'])
+def mode(request):
+    """同步与异步爬虫各跑一遍"""
+    return request.param
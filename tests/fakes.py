@@ -0,0 +1,73 @@
+"""测试用的假微信接口：文章列表每页10篇，文章页含一个小程序链接"""
+import asyncio
+
+from wechat_core import AsyncWeChatAPICrawler, CrawlStateStore, WeChatAPICrawler
+from wechatspider import ValidationConfig
+
+ACCOUNT = {'fakeid': 'F', 'nickname': 'N'}
+NEWEST = 1700000000
+MINI_LINK = 'https://mp.weixin.qq.com/mp/waerrpage?appid=wx0123456789abcdef&type=weapp'
+
+
+def make_articles(count, start=0):
+    """按发布时间从新到旧排列的文章（第i篇的update_time为NEWEST-i）"""
+    return [{'title': f't{i}', 'link': f'https://mp.weixin.qq.com/s/{i}', 'update_time': NEWEST - i, 'aid': str(i)}
+            for i in range(start, start + count)]
+
+
+class FakeResponse:
+    def __init__(self, data=None, text='', status_code=200, headers=None):
+        self.data = data
+        self.text = text
+        self.status_code = status_code
+        self.url = 'https://mp.weixin.qq.com/'
+        self.headers = headers or {}
+
+    def json(self):
+        return self.data
+
+
+class FakeServer:
+    """模拟文章列表接口与文章页面，可指定失败的文章（序号）或列表页（页码）"""
+    def __init__(self, articles=None, fail_article=None, fail_page=None):
+        self.articles = make_articles(100) if articles is None else articles
+        self.fail_article = fail_article
+        self.fail_page = fail_page
+        self.pages = []  # 请求过的列表页页码
+        self.article_calls = []  # 请求过的文章链接
+
+    def request(self, url, params=None, **kwargs):
+        if 'appmsg' in url:
+            begin = int(params['begin'])
+            self.pages.append(begin // 10)
+            if self.fail_page is not None and begin // 10 == self.fail_page:
+                raise Exception('文章列表请求失败')
+            page = self.articles[begin:begin + 10]
+            has_more = int(begin + 10 < len(self.articles))
+            return FakeResponse({'base_resp': {'ret': 0}, 'app_msg_list': page, 'has_more': has_more})
+        self.article_calls.append(url)
+        if self.fail_article is not None and url.endswith(f'/{self.fail_article}'):
+            raise Exception('文章页面请求失败')
+        return FakeResponse(text=f'<a href="{MINI_LINK}">x</a>')
+
+
+def crawl(mode, server, journal=None, state_path='state.json', max_pages=3):
+    """用同步或异步爬虫增量抓取ACCOUNT，返回 (记录数, 产出的记录, 爬虫)"""
+    if mode == 'sync':
+        crawler = WeChatAPICrawler(ValidationConfig())
+        crawler._request_with_delay = server.request
+    else:
+        crawler = AsyncWeChatAPICrawler(ValidationConfig())
+
+        async def request(url, **kwargs):
+            return server.request(url, **kwargs)
+        crawler._request = request
+    crawler.token = 't'
+    crawler.state_store = CrawlStateStore(state_path)
+    crawler.journal = journal
+    rows = []
+    if mode == 'sync':
+        count = crawler.crawl_account(ACCOUNT, max_pages, True, rows.append)
+    else:
+        count = asyncio.run(crawler.crawl_account(ACCOUNT, max_pages, True, rows.append))
+    return count, rows, crawler
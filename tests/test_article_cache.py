@@ -0,0 +1,42 @@
+"""文章缓存默认关闭，开启时写在用户缓存目录"""
+import os
+
+from wechat_core import ArticleCache, WeChatAPICrawler
+from wechatspider import ValidationConfig, _configure_cache, build_arg_parser
+
+
+def test_crawler_has_no_cache_by_default(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    crawler = WeChatAPICrawler(ValidationConfig())
+    assert crawler.cache is None
+    assert not (tmp_path / ArticleCache.FILE_NAME).exists()
+
+
+def test_default_path_is_under_user_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'xdg'))
+    monkeypatch.delenv('LOCALAPPDATA', raising=False)
+    path = ArticleCache.default_path()
+    assert path == str(tmp_path / 'xdg' / 'wechat_url_get' / ArticleCache.FILE_NAME)
+
+    cache = ArticleCache()
+    cache.put('https://mp.weixin.qq.com/s/abc', '<html>正文</html>', etag='e1')
+    assert os.path.exists(path)
+    entry = cache.get('http://mp.weixin.qq.com/s/abc?scene=21#rd')
+    assert (entry['text'], entry['etag'], entry['fresh']) == ('<html>正文</html>', 'e1', True)
+    cache.close()
+
+
+def test_headless_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'xdg'))
+    parser = build_arg_parser()
+    crawler = WeChatAPICrawler(ValidationConfig())
+
+    _configure_cache(crawler, parser.parse_args(['extract', 'x']))
+    assert crawler.cache is None
+
+    _configure_cache(crawler, parser.parse_args(['extract', 'x', '--cache']))
+    assert crawler.cache.path == ArticleCache.default_path()
+
+    _configure_cache(crawler, parser.parse_args(['extract', 'x', '--cache-dir', str(tmp_path / 'c')]))
+    assert crawler.cache.path == str(tmp_path / 'c' / ArticleCache.FILE_NAME)
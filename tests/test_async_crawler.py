@@ -0,0 +1,163 @@
+"""异步爬虫对本地aiohttp服务的请求：5xx与超时重试、POST不重试、磁盘读写不阻塞事件循环"""
+import asyncio
+import collections
+import json
+import time
+
+import pytest
+
+from fakes import ACCOUNT, MINI_LINK, make_articles
+from wechat_core import ArticleCache, AsyncWeChatAPICrawler, CrawlStateStore, RateLimiter
+from wechatspider import ValidationConfig
+
+web = pytest.importorskip('aiohttp.web')
+test_utils = pytest.importorskip('aiohttp.test_utils')
+
+UNLIMITED = {name: {'rate': 1000, 'burst': 1000, 'jitter': 0.0} for name in RateLimiter.DEFAULT_PROFILES}
+
+
+class FakeSite:
+    """本地假微信服务：/cgi-bin/appmsg 返回文章列表，其余路径返回含一个小程序链接的文章页
+
+    plans[路径] 是依次消费的预设失败：HTTP状态码，或 'slow'（超过客户端超时才返回）。
+    """
+    def __init__(self, article_count=10):
+        self.article_count = article_count
+        self.plans = collections.defaultdict(list)
+        self.hits = collections.Counter()
+        self.server = None
+
+    async def handle(self, request):
+        self.hits[request.path] += 1
+        plan = self.plans[request.path]
+        if plan:
+            action = plan.pop(0)
+            if action == 'slow':
+                await asyncio.sleep(2)
+            else:
+                return web.Response(status=action)
+        if request.path == '/cgi-bin/appmsg':
+            begin = int(request.query['begin'])
+            articles = make_articles(self.article_count)[begin:begin + 10]
+            for article in articles:
+                article['link'] = self.url(f"/s/{article['aid']}")
+            has_more = int(begin + 10 < self.article_count)
+            body = {'base_resp': {'ret': 0}, 'app_msg_list': articles, 'has_more': has_more}
+            return web.Response(text=json.dumps(body), content_type='application/json')
+        return web.Response(text=f'<a href="{MINI_LINK}">x</a>', content_type='text/html')
+
+    def url(self, path):
+        return str(self.server.make_url(path))
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self.handle)
+        self.server = test_utils.TestServer(app, host='127.0.0.1')
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.server.close()
+
+
+def make_crawler(site, api_timeout=15):
+    config = ValidationConfig()
+    config.api_timeout = api_timeout
+    crawler = AsyncWeChatAPICrawler(config, max_concurrency=10, rate_limiter=RateLimiter(UNLIMITED))
+    crawler.token = 't'
+    crawler.APPMSG_URL = site.url('/cgi-bin/appmsg')
+    crawler.state_store = CrawlStateStore('state.json')
+    return crawler
+
+
+def test_server_errors_are_retried(workdir):
+    async def main():
+        async with FakeSite() as site:
+            site.plans['/s/0'] = [503, 502]
+            async with make_crawler(site) as crawler:
+                links = await crawler.extract_mini_links(site.url('/s/0'))
+            return links, site.hits['/s/0']
+
+    assert asyncio.run(main()) == ([MINI_LINK], 3)
+
+
+def test_server_errors_fail_after_retries(workdir):
+    async def main():
+        async with FakeSite() as site:
+            site.plans['/s/0'] = [500] * 10
+            async with make_crawler(site) as crawler:
+                with pytest.raises(Exception, match='服务器错误'):
+                    await crawler._request(site.url('/s/0'), endpoint=RateLimiter.ARTICLE)
+                retries = crawler.max_retries
+            return site.hits['/s/0'], retries
+
+    hits, retries = asyncio.run(main())
+    assert hits == retries + 1
+
+
+def test_post_is_not_retried(workdir):
+    async def main():
+        async with FakeSite() as site:
+            site.plans['/s/0'] = [503] * 10
+            async with make_crawler(site) as crawler:
+                with pytest.raises(Exception, match='HTTP错误 503'):
+                    await crawler._request(site.url('/s/0'), method='POST', endpoint=RateLimiter.ARTICLE)
+            return site.hits['/s/0']
+
+    assert asyncio.run(main()) == 1
+
+
+def test_timeouts_are_retried_then_reported(workdir):
+    async def main():
+        async with FakeSite() as site:
+            site.plans['/s/0'] = ['slow']
+            site.plans['/s/1'] = ['slow'] * 10
+            async with make_crawler(site, api_timeout=0.2) as crawler:
+                links = await crawler.extract_mini_links(site.url('/s/0'))
+                # 超时重试用尽后抛出普通Exception（不是asyncio.TimeoutError）
+                with pytest.raises(Exception, match='网络请求失败') as error:
+                    await crawler._request(site.url('/s/1'), endpoint=RateLimiter.ARTICLE)
+            return links, error.type, site.hits['/s/1']
+
+    links, error_type, hits = asyncio.run(main())
+    assert links == [MINI_LINK]
+    assert error_type is Exception
+    assert hits == 4
+
+
+def test_crawl_with_slow_disk_keeps_event_loop_responsive(workdir, monkeypatch):
+    # 缓存读写每次阻塞0.2秒：如果在事件循环里执行，心跳协程会停顿同样长的时间
+    for name in ('get', 'put'):
+        original = getattr(ArticleCache, name)
+
+        def slow(self, *args, _original=original, **kwargs):
+            time.sleep(0.2)
+            return _original(self, *args, **kwargs)
+        monkeypatch.setattr(ArticleCache, name, slow)
+
+    async def heartbeat(gaps, stop):
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    async def main():
+        gaps, stop = [], asyncio.Event()
+        async with FakeSite(article_count=10) as site:
+            async with make_crawler(site) as crawler:
+                crawler.set_cache(str(workdir / 'cache.db'))
+                ticker = asyncio.ensure_future(heartbeat(gaps, stop))
+                rows = []
+                count = await crawler.crawl_account(ACCOUNT, 1, True, rows.append)
+                stop.set()
+                await ticker
+                entries = crawler.cache.stats()['entries']
+        return count, rows, entries, max(gaps)
+
+    count, rows, entries, max_gap = asyncio.run(main())
+    assert count == 10
+    assert all(row['mini_links'] == [MINI_LINK] for row in rows)
+    assert entries == 10
+    assert max_gap < 0.15
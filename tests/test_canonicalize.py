@@ -0,0 +1,49 @@
+"""链接规范化：文章链接去追踪参数，其他链接只统一写法不删参数"""
+from wechat_core import ArticleCache, UrlCanonicalizer, canonicalize_url
+
+ARTICLE = 'https://mp.weixin.qq.com/s?__biz=MzA%3D&idx=1&mid=2&sn=abc'
+
+
+def test_canonicalize_article_urls():
+    variants = [
+        'http://MP.weixin.qq.com/s?mid=2&__biz=MzA=&idx=1&sn=abc&chksm=zz&scene=21#wechat_redirect',
+        'https://mp.weixin.qq.com:443/s?__biz=MzA=&amp;mid=2&amp;idx=1&amp;sn=abc&amp;scene=27',
+        '//mp.weixin.qq.com/s?sn=abc&idx=1&mid=2&__biz=MzA=#rd',
+        'https:\\/\\/mp.weixin.qq.com\\/s?__biz=MzA=&mid=2&idx=1&sn=abc&key=k&uin=u',
+    ]
+    assert {canonicalize_url(url) for url in variants} == {ARTICLE}
+    assert canonicalize_url('https://mp.weixin.qq.com/s/AbCd?scene=1&key=k#rd') == 'https://mp.weixin.qq.com/s/AbCd'
+    assert ArticleCache.normalize_url(variants[0]) == ARTICLE
+
+
+def test_canonicalize_keeps_non_article_params_and_fragments():
+    # 非http链接原样保留
+    assert canonicalize_url('weixin://dl/business/?t=abc&scene=1') == 'weixin://dl/business/?t=abc&scene=1'
+    # 小程序链接的 scene/from 等参数可能决定落地页，只排序不删除；普通片段保留
+    assert (canonicalize_url('/mp/waerrpage?appid=wx0123456789abcdef&path=pages%2Findex&scene=1&from=x#frag')
+            == 'https://mp.weixin.qq.com/mp/waerrpage?appid=wx0123456789abcdef&from=x&path=pages%2Findex&scene=1#frag')
+    assert canonicalize_url('https://example.com/p?uin=1&lang=zh#top') == 'https://example.com/p?lang=zh&uin=1#top'
+    # 其他域名上的 /s 路径不是公众号文章
+    assert canonicalize_url('https://example.com/s?scene=1') == 'https://example.com/s?scene=1'
+
+
+def test_resolve_keeps_raw_spelling():
+    canonicalizer = UrlCanonicalizer()
+    assert (canonicalizer.resolve(' /mp/waerrpage?type=weapp&amp;appid=wx0123456789abcdef#rd ')
+            == 'https://mp.weixin.qq.com/mp/waerrpage?type=weapp&appid=wx0123456789abcdef#rd')
+    assert canonicalizer.resolve('weixin:\\/\\/dl/business/?t=1') == 'weixin://dl/business/?t=1'
+
+
+def test_mini_program_appid_and_path():
+    canonicalizer = UrlCanonicalizer()
+    assert (canonicalizer.mini_program('https://mp.weixin.qq.com/mp/miniprogram?appid=wxfedcba9876543210&path=pages%2Fitem')
+            == ('wxfedcba9876543210', 'pages/item'))
+    assert canonicalizer.mini_program('https://mp.weixin.qq.com/wxa/appid=wx1111222233334444') == ('wx1111222233334444', '')
+    assert canonicalizer.mini_program('https://example.com/') == ('', '')
+
+
+def test_custom_tracking_params():
+    canonicalizer = UrlCanonicalizer(tracking_params={'share'})
+    # 身份参数不全时只去掉追踪参数，其余参数保留
+    assert (canonicalizer.canonicalize('https://mp.weixin.qq.com/s?sn=abc&share=1&scene=2')
+            == 'https://mp.weixin.qq.com/s?scene=2&sn=abc')
@@ -0,0 +1,102 @@
+"""从Chromium系Cookie数据库读取并解密mp.weixin.qq.com的Cookie（Linux下的v10/v11密文）"""
+import hashlib
+import sqlite3
+import sys
+import types
+
+import pytest
+
+pytest.importorskip('cryptography')
+from cryptography.hazmat.primitives import hashes, padding  # noqa: E402
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes  # noqa: E402
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC  # noqa: E402
+
+from wechat_core import WeChatCookieAutoGetter  # noqa: E402
+
+pytestmark = pytest.mark.skipif(sys.platform.startswith('win32'), reason="Windows下密钥由DPAPI保护")
+
+HOST = '.mp.weixin.qq.com'
+
+
+def encrypt(version, password, plaintext, host_key=None):
+    """按Chrome在Linux下的方式加密：PBKDF2(口令, saltysalt, 1次) 派生AES-128密钥，CBC，IV为16个空格"""
+    key = PBKDF2HMAC(algorithm=hashes.SHA1(), length=16, salt=b'saltysalt', iterations=1).derive(password)
+    data = plaintext.encode('utf-8')
+    if host_key is not None:  # 较新的数据库在明文前附加host_key的SHA256
+        data = hashlib.sha256(host_key.encode('utf-8')).digest() + data
+    padder = padding.PKCS7(128).padder()
+    padded = padder.update(data) + padder.finalize()
+    encryptor = Cipher(algorithms.AES(key), modes.CBC(b' ' * 16)).encryptor()
+    return version + encryptor.update(padded) + encryptor.finalize()
+
+
+def make_source(tmp_path, rows):
+    """建一个只含cookies表的Cookie数据库，返回对应的Cookie来源"""
+    path = tmp_path / 'Cookies'
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE cookies (host_key TEXT, name TEXT, value TEXT, encrypted_value BLOB)")
+    conn.executemany("INSERT INTO cookies VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return {'name': 'Chrome', 'group': 1, 'cookie_paths': [tmp_path / 'missing', path],
+            'local_state': None, 'keyring_name': 'Chrome'}
+
+
+def fake_keyring(monkeypatch, password):
+    calls = []
+
+    def get_password(service, username):
+        calls.append((service, username))
+        return password
+    monkeypatch.setitem(sys.modules, 'keyring', types.SimpleNamespace(get_password=get_password))
+    return calls
+
+
+def test_v10_and_plain_values(tmp_path, monkeypatch):
+    source = make_source(tmp_path, [
+        (HOST, 'slave_sid', '', encrypt(b'v10', b'peanuts', 'abc')),
+        ('mp.weixin.qq.com', 'data_ticket', '', encrypt(b'v10', b'peanuts', 'xyz', 'mp.weixin.qq.com')),
+        (HOST, 'plain', 'p1', b''),
+        ('.example.com', 'other', '', encrypt(b'v10', b'peanuts', 'nope')),
+    ])
+    opened = []
+    connect = sqlite3.connect
+
+    def recording_connect(database, *args, **kwargs):
+        opened.append((database, kwargs.get('uri')))
+        return connect(database, *args, **kwargs)
+    monkeypatch.setattr(sqlite3, 'connect', recording_connect)
+    cookie = WeChatCookieAutoGetter.read_source(source)
+
+    assert cookie == 'slave_sid=abc; data_ticket=xyz; plain=p1'
+    assert len(opened) == 1
+    database, uri = opened[0]
+    assert uri is True
+    assert database.startswith('file://') and database.endswith('/Cookies?mode=ro&immutable=1')
+
+
+def test_v11_uses_keyring_password(tmp_path, monkeypatch):
+    calls = fake_keyring(monkeypatch, 'secret-pw')
+    source = make_source(tmp_path, [(HOST, 'slave_sid', '', encrypt(b'v11', b'secret-pw', 'abc'))])
+    assert WeChatCookieAutoGetter.read_source(source) == 'slave_sid=abc'
+    assert calls == [('Chrome Safe Storage', 'Chrome')]
+
+
+def test_v11_falls_back_to_empty_password(tmp_path, monkeypatch):
+    fake_keyring(monkeypatch, None)
+    source = make_source(tmp_path, [
+        (HOST, 'slave_sid', '', encrypt(b'v11', b'', 'abc')),
+        (HOST, 'slave_user', '', encrypt(b'v10', b'peanuts', 'gh_1')),
+    ])
+    assert WeChatCookieAutoGetter.read_source(source) == 'slave_sid=abc; slave_user=gh_1'
+
+
+def test_undecryptable_values_are_skipped(tmp_path, monkeypatch, caplog):
+    fake_keyring(monkeypatch, 'right')
+    source = make_source(tmp_path, [
+        (HOST, 'wrong_key', '', encrypt(b'v11', b'wrong', 'abc')),
+        (HOST, 'unknown_version', '', b'v99' + b'\0' * 16),
+        (HOST, 'plain', 'p1', b''),
+    ])
+    assert WeChatCookieAutoGetter.read_source(source) == 'plain=p1'
+    assert '2 个Cookie解密失败' in caplog.text
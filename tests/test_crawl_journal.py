@@ -0,0 +1,52 @@
+"""断点续抓日志：续抓只补做失败的部分，写了一半的行不影响重放（同步/异步两种爬虫）"""
+import json
+
+from fakes import NEWEST, FakeServer, crawl, make_articles
+from wechat_core import CrawlJournal
+
+
+def test_journal_retries_only_failed_article(mode, workdir):
+    path = str(workdir / 'crawl.journal')
+    server = FakeServer(make_articles(10), fail_article=5)
+
+    journal = CrawlJournal(path)
+    count, _, crawler = crawl(mode, server, journal)
+    journal.close()
+    events = [json.loads(line)['event'] for line in open(path, encoding='utf-8')]
+    assert count == 9
+    assert events.count('article') == 9 and 'account' not in events
+    assert not journal.is_account_done('F')
+    assert crawler.state_store.get('F') is None
+
+    # 续抓：列表页不再请求，只重新请求失败的那篇，全部成功后才记账号完成并推进高水位
+    server.fail_article = None
+    server.pages.clear()
+    server.article_calls.clear()
+    journal = CrawlJournal(path, resume=True)
+    count, rows, crawler = crawl(mode, server, journal)
+    journal.close()
+    assert server.pages == []
+    assert server.article_calls == ['https://mp.weixin.qq.com/s/5']
+    assert [row['link'] for row in rows] == ['https://mp.weixin.qq.com/s/5']
+    assert journal.is_account_done('F')
+    assert crawler.state_store.get('F')['update_time'] == NEWEST
+
+
+def test_replay_ignores_torn_last_line(tmp_path):
+    path = str(tmp_path / 'crawl.journal')
+    journal = CrawlJournal(path)
+    journal.record_page('F', 0, make_articles(10), finished=True, complete=True)
+    journal.record_article('https://mp.weixin.qq.com/s/0')
+    journal.record_target('N', {'fakeid': 'F', 'nickname': 'N', 'extra': 1})
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"event": "account", "fak')
+
+    journal = CrawlJournal(path, resume=True)
+    articles, next_page, finished, complete = journal.get_listing('F')
+    journal.close(finished=True)
+    assert (len(articles), next_page, finished, complete) == (10, 1, True, True)
+    assert len(journal.pending(articles)) == 9
+    assert journal.get_target('N') == {'fakeid': 'F', 'nickname': 'N'}
+    assert not journal.is_account_done('F')
+    assert not (tmp_path / 'crawl.journal').exists()
@@ -0,0 +1,66 @@
+"""增量高水位：只有完整、成功的抓取才推进（同步/异步两种爬虫）"""
+from fakes import NEWEST, FakeServer, crawl, make_articles
+
+
+def test_mark_advances_after_full_crawl(workdir, mode):
+    count, _, crawler = crawl(mode, FakeServer())
+    assert count == 30
+    assert crawler.state_store.get('F')['update_time'] == NEWEST
+
+
+def test_mark_not_advanced_when_article_fails(workdir, mode):
+    count, rows, crawler = crawl(mode, FakeServer(fail_article=5))
+    assert count == 29
+    assert 'https://mp.weixin.qq.com/s/5' not in {row['link'] for row in rows}
+    assert crawler.state_store.get('F') is None
+
+
+def test_mark_not_advanced_when_listing_page_fails(workdir, mode):
+    count, _, crawler = crawl(mode, FakeServer(fail_page=2))
+    assert count == 20
+    assert crawler.state_store.get('F') is None
+
+
+def test_incremental_run_stops_at_mark(workdir, mode):
+    server = FakeServer(make_articles(50, start=15))
+    _, _, crawler = crawl(mode, server)
+    assert crawler.state_store.get('F')['update_time'] == NEWEST - 15
+
+    # 又发布了15篇：第二页翻到上次的位置即停止
+    server.articles = make_articles(65)
+    server.pages.clear()
+    count, rows, crawler = crawl(mode, server)
+    assert count == 15
+    assert server.pages == [0, 1]
+    assert crawler.state_store.get('F')['update_time'] == NEWEST
+
+
+def test_mark_not_advanced_when_max_pages_ends_before_mark(workdir, mode):
+    server = FakeServer(make_articles(50, start=40))
+    crawl(mode, server, max_pages=1)
+
+    # 新文章超过max_pages能翻到的范围：本次不推进高水位，否则第1页之后的新文章永远丢失
+    server.articles = make_articles(90)
+    count, _, crawler = crawl(mode, server, max_pages=2)
+    assert count == 20
+    assert crawler.state_store.get('F')['update_time'] == NEWEST - 40
+
+    server.pages.clear()
+    count, rows, crawler = crawl(mode, server, max_pages=5)
+    assert count == 40
+    assert {row['link'] for row in rows} == {a['link'] for a in make_articles(40)}
+    assert crawler.state_store.get('F')['update_time'] == NEWEST
+
+
+def test_pinned_old_article_does_not_stop_paging(workdir, mode):
+    server = FakeServer(make_articles(20, start=20))
+    crawl(mode, server)
+
+    # 置顶的旧文章排在第一页最前面，后面仍是新文章
+    pinned = make_articles(1, start=25)
+    server.articles = pinned + make_articles(40)
+    count, rows, crawler = crawl(mode, server)
+    assert count == 20
+    assert {row['link'] for row in rows} == {a['link'] for a in make_articles(20)}
+    assert crawler.state_store.get('F')['update_time'] == NEWEST
+
@@ -0,0 +1,99 @@
+"""提取规则集：校验与耗时检查、热加载与回退、首次检查不阻塞取规则、检查子进程复用"""
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from wechat_core import ExtractionRules, LinkExtractor, LinkMatcher
+
+
+def write_rules(path, **fields):
+    path.write_text(json.dumps(dict(ExtractionRules.builtin_rules(), **fields)), encoding='utf-8')
+
+
+@pytest.mark.parametrize('rules, message', [
+    ({'schema': 2, 'keywords': ['weapp'], 'script_patterns': ['weapp']}, '规则格式版本'),
+    ({'keywords': ['weapp', ''], 'script_patterns': ['weapp']}, 'keywords'),
+    ({'keywords': ['weapp'], 'script_patterns': [{'name': 'bad', 'pattern': '(unclosed'}]}, 'bad'),
+    ({'keywords': ['weapp'], 'script_patterns': []}, '至少需要'),
+])
+def test_compile_rejects_invalid_rules(rules, message):
+    with pytest.raises(Exception, match=message):
+        ExtractionRules.compile(rules)
+
+
+def test_builtin_rules_pass_cost_check():
+    matcher = ExtractionRules.compile(ExtractionRules.builtin_rules())
+    assert matcher.spec == LinkMatcher.get().spec
+    ExtractionRules.check_cost(matcher)
+
+
+def test_cost_check_rejects_catastrophic_backtracking():
+    matcher = ExtractionRules.compile({'keywords': ['weapp'], 'script_patterns': [r'(a+)+$']})
+    with pytest.raises(Exception, match='回溯'):
+        ExtractionRules.check_cost(matcher, pattern_timeout=1.0)
+
+
+def test_rules_file_load_and_fallback(tmp_path):
+    path = tmp_path / 'rules.json'
+    write_rules(path, version='v1', keywords=['weapp', 'foo'])
+    loaded = ExtractionRules(str(path))
+    loaded.load()
+    assert loaded.version == 'v1'
+    assert loaded.refresh().keywords == ('weapp', 'foo')
+
+    # 无效的新版本被拒绝时继续使用上一版
+    write_rules(path, version='v2', keywords=['weapp', 'foo'], script_patterns=['('])
+    loaded._mtime = -1
+    assert loaded.refresh().keywords == ('weapp', 'foo')
+    assert loaded.version == 'v1'
+
+
+def test_missing_rules_file_uses_builtin_matcher(tmp_path):
+    rules = ExtractionRules(str(tmp_path / 'missing.json'), check_interval=60)
+    try:
+        extractor = LinkExtractor('stream', rules=rules)
+        assert rules.wait_ready(30)
+        assert extractor.matcher is LinkMatcher.get()
+    finally:
+        rules.stop_watcher()
+
+
+def test_builtin_matcher_used_until_first_check_finishes(tmp_path, monkeypatch):
+    path = tmp_path / 'rules.json'
+    write_rules(path, version='v1', keywords=['weapp', 'foo'])
+    release = threading.Event()
+    monkeypatch.setattr(ExtractionRules, 'check_cost', lambda *args, **kwargs: release.wait(30))
+    rules = ExtractionRules(str(path), check_interval=60)
+    try:
+        extractor = LinkExtractor('stream', rules=rules)
+        assert extractor.matcher is LinkMatcher.get()  # 检查还没完成：不等待，用内置规则
+        assert not rules.wait_ready(0.1)
+        release.set()
+        assert rules.wait_ready(30)
+        assert extractor.matcher.keywords == ('weapp', 'foo')
+    finally:
+        release.set()
+        rules.stop_watcher()
+
+
+def test_watcher_reuses_one_checker_process(tmp_path):
+    path = tmp_path / 'rules.json'
+    write_rules(path, version='v1')
+    rules = ExtractionRules(str(path), check_interval=0.05)
+    try:
+        assert rules.wait_ready(60) and rules.version == 'v1'
+        pool = rules._checker._pool
+
+        write_rules(path, version='v2')
+        os.utime(path, (1, 1))  # 保证修改时间变化
+        for _ in range(600):
+            if rules.version == 'v2':
+                break
+            time.sleep(0.1)
+        assert rules.version == 'v2'
+        assert rules._checker._pool is pool
+    finally:
+        rules.stop_watcher()
@@ -0,0 +1,59 @@
+"""各提取引擎与原实现（baseline_extract_links）提取的链接集合一致"""
+import pytest
+
+from wechat_core import LinkExtractor, baseline_extract_links
+
+PAGES = [
+    # 相对链接、协议相对链接、带实体的属性值、与关键词无关的链接
+    """<html><body>
+    <p>正文 <a href="/mp/waerrpage?appid=wx0123456789abcdef&amp;type=weapp">打开小程序</a></p>
+    <a href="//mp.weixin.qq.com/mp/waerrpage?appid=wx0123456789abcdef&type=weapp">同一个小程序</a>
+    <a href="https://mp.weixin.qq.com/s?__biz=MzA=&amp;mid=2&amp;idx=1&amp;sn=abc#wechat_redirect">相关文章</a>
+    <a href="weixin://dl/business/?t=miniprogram">跳转</a>
+    <a href="https://example.com/">无关链接</a>
+    <a name="no-href">锚点</a>
+    </body></html>""",
+    # 脚本中的链接（含 &amp; 和 \\/ 转义，同一链接出现多次，两条规则匹配重叠）
+    """<html><head><script>
+    var card = {"url": "https://mp.weixin.qq.com/mp/miniprogram?appid=wxfedcba9876543210&amp;path=pages%2Fitem"};
+    var esc = "https://mp.weixin.qq.com\\/mp\\/miniprogram?appid=wx1";
+    var dup = 'https://mp.weixin.qq.com/mp/miniprogram?appid=wxfedcba9876543210&amp;path=pages%2Fitem';
+    var other = "https://open.weixin.qq.com/wxa/getwxacode?appid=wx1111222233334444";
+    </script></head><body><script></script><script src="/x.js"></script></body></html>""",
+    # 没有小程序链接的页面
+    "<html><body><p>纯文本文章</p><script>var a = 1;</script></body></html>",
+]
+
+
+@pytest.mark.parametrize('backend', LinkExtractor.BACKENDS)
+@pytest.mark.parametrize('page', PAGES)
+def test_extract_raw_matches_baseline(backend, page):
+    pytest.importorskip('bs4')
+    if backend != 'stream':
+        pytest.importorskip(backend)
+    extractor = LinkExtractor(backend)
+    assert extractor.backend == backend
+    assert set(extractor.extract_raw(page)) == set(baseline_extract_links(page))
+
+
+def test_extract_differences_from_baseline():
+    extractor = LinkExtractor('stream')
+    links = extractor.extract(PAGES[0])
+    # 非http链接原样保留；两种写法的同一小程序链接只保留第一个（实体已解码）
+    assert links == [
+        'https://mp.weixin.qq.com/mp/waerrpage?appid=wx0123456789abcdef&type=weapp',
+        'weixin://dl/business/?t=miniprogram',
+    ]
+    assert 'https://mp.weixin.qq.comweixin://dl/business/?t=miniprogram' in extractor.extract_raw(PAGES[0])
+
+    links = extractor.extract(PAGES[1])
+    # 脚本中的 &amp; 和 \\/ 被还原，重复出现的链接只保留一个
+    assert 'https://mp.weixin.qq.com/mp/miniprogram?appid=wxfedcba9876543210&path=pages%2Fitem' in links
+    assert 'https://mp.weixin.qq.com/mp/miniprogram?appid=wx1' in links
+    assert not any('&amp;' in link or '\\/' in link for link in links)
+
+
+def test_extract_uses_configured_keywords():
+    from wechat_core import LinkMatcher
+    extractor = LinkExtractor('stream', LinkMatcher.get(['foo']))
+    assert extractor.extract('<a href="/foo?x=1">a</a><a href="/weapp">b</a>') == ['https://mp.weixin.qq.com/foo?x=1']
@@ -0,0 +1,61 @@
+"""链接去重索引：按规范化链接去重、首个来源文章、大批量登记"""
+import sqlite3
+
+import pytest
+
+from wechat_core import LinkIndex
+
+KEY = 'https://mp.weixin.qq.com/mp/waerrpage?appid=wx0123456789abcdef&type=1'
+
+
+def test_link_index_keeps_raw_link_and_canonical_key(tmp_path):
+    index = LinkIndex(str(tmp_path / 'index.db'))
+    raw = 'http://mp.weixin.qq.com/mp/waerrpage?type=1&appid=wx0123456789abcdef#rd'
+    assert index.add([raw], 'a1') == [raw]
+    assert index.add([KEY], 'a2') == []
+    row, = index.iter_links()
+    assert row['link'] == raw
+    assert row['key'] == KEY
+    assert (row['hits'], row['articles']) == (2, 2)
+
+
+def test_first_article_is_the_earliest_reference(tmp_path):
+    index = LinkIndex(str(tmp_path / 'index.db'))
+    index.add([KEY])  # 没有来源文章的登记（如直接提取的页面）
+    index.add([KEY], 'https://mp.weixin.qq.com/s/zzz')
+    index.add([KEY], 'https://mp.weixin.qq.com/s/aaa')
+    row, = index.iter_links()
+    assert row['first_article'] == 'https://mp.weixin.qq.com/s/zzz'
+    assert row['articles'] == 2
+
+
+@pytest.mark.skipif(not hasattr(sqlite3.Connection, 'setlimit'), reason="需要Python 3.11+")
+def test_add_more_links_than_sqlite_variable_limit(tmp_path):
+    index = LinkIndex(str(tmp_path / 'index.db'))
+    index._connect().setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+    links = [f'https://mp.weixin.qq.com/mp/waerrpage?appid=wx{i:016x}&type=1' for i in range(2500)]
+
+    assert index.add(links[:1200], 'a1') == links[:1200]
+    assert index.add(links, 'a2') == links[1200:]
+    assert index.stats() == {'links': 2500, 'appids': 2500, 'hits': 3700}
+
+
+def test_old_index_without_first_article_column(tmp_path):
+    path = str(tmp_path / 'index.db')
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE links (key TEXT PRIMARY KEY, link TEXT NOT NULL, appid TEXT,
+                            first_seen INTEGER NOT NULL, last_seen INTEGER NOT NULL, hits INTEGER NOT NULL);
+        CREATE TABLE link_refs (key TEXT NOT NULL, article TEXT NOT NULL, account TEXT,
+                                PRIMARY KEY (key, article)) WITHOUT ROWID;
+    """)
+    conn.execute("INSERT INTO links VALUES (?, ?, 'wx0123456789abcdef', 1, 1, 1)", (KEY, KEY))
+    conn.execute("INSERT INTO link_refs VALUES (?, 'old', NULL)", (KEY,))
+    conn.commit()
+    conn.close()
+
+    index = LinkIndex(path)
+    assert index.add([KEY], 'new') == []
+    row, = index.iter_links()
+    assert row['first_article'] == 'old'
+    assert row['hits'] == 2
@@ -0,0 +1,37 @@
+"""预编译匹配器：与逐个规则匹配的结果一致，保留不同规则之间重叠的匹配"""
+from wechat_core import LinkMatcher, benchmark_matchers
+
+OVERLAP_RULES = [r'https?://\S+?miniprogram\S*', r'appid=wx[0-9a-f]{16}']
+OVERLAP_SCRIPT = 'go("https://mp.weixin.qq.com/miniprogram?appid=wx0123456789abcdef")'
+
+
+def test_matcher_keeps_overlapping_script_matches():
+    matcher = LinkMatcher(script_patterns=OVERLAP_RULES)
+    assert list(matcher.find_links(OVERLAP_SCRIPT)) == [
+        'https://mp.weixin.qq.com/miniprogram?appid=wx0123456789abcdef")',
+        'appid=wx0123456789abcdef',
+    ]
+
+
+def test_matcher_href_keywords():
+    matcher = LinkMatcher(keywords=['weapp', 'a.b'])
+    hrefs = ['/mp/waerrpage?type=weapp', 'https://example.com/', 'https://aXb.com/', 'https://a.b/']
+    assert list(matcher.match_hrefs(hrefs)) == ['/mp/waerrpage?type=weapp', 'https://a.b/']
+    assert LinkMatcher.get(['weapp']) is LinkMatcher.get(['weapp'])
+
+
+def test_bench_match_shows_alternation_losing_overlaps(tmp_path):
+    page = tmp_path / 'page.html'
+    page.write_text(f'<html><script>{OVERLAP_SCRIPT}</script></html>', encoding='utf-8')
+    rows = benchmark_matchers([str(tmp_path)], LinkMatcher(script_patterns=OVERLAP_RULES), repeat=1)
+    assert {row['matcher']: row['mismatches'] for row in rows} == {
+        'per-pattern': 0, 'alternation': 1, 'matcher': 0
+    }
+
+
+def test_bench_match_skips_alternation_for_unmergeable_rules(tmp_path):
+    page = tmp_path / 'page.html'
+    page.write_text('<html><script>var a = "x";</script></html>', encoding='utf-8')
+    matcher = LinkMatcher(script_patterns=[r'(?P<p1>weapp)\S*', r'miniprogram'])
+    rows = benchmark_matchers([str(page)], matcher, repeat=1)
+    assert [row['matcher'] for row in rows] == ['per-pattern', 'matcher']
@@ -0,0 +1,66 @@
+"""解析进程池损坏时的回退：从未成功过的进程池不再重建，并计入指标"""
+import asyncio
+import logging
+from concurrent.futures.process import BrokenProcessPool
+
+from fakes import MINI_LINK
+from wechat_core import AsyncWeChatAPICrawler, WeChatAPICrawler
+from wechatspider import ValidationConfig
+
+PAGE = f'<p>{"x" * WeChatAPICrawler.PARSE_INLINE_CHARS}</p><a href="{MINI_LINK}">go</a>'
+
+
+class BrokenPool:
+    """模拟子进程无法启动的进程池"""
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        BrokenPool.created += 1
+
+    def submit(self, *args):
+        raise BrokenProcessPool("process pool was terminated abruptly\nbootstrapping phase")
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def parse(mode, crawler):
+    if mode == 'sync':
+        return crawler.parse_html(PAGE)
+    return asyncio.run(crawler.parse_html(PAGE))
+
+
+def test_pool_that_never_worked_is_disabled(mode, monkeypatch, caplog):
+    import concurrent.futures
+    BrokenPool.created = 0
+    monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor', BrokenPool)
+    crawler = (WeChatAPICrawler if mode == 'sync' else AsyncWeChatAPICrawler)(ValidationConfig())
+    crawler.set_parse_workers(2)
+    crawler.metrics.reset()
+
+    with caplog.at_level(logging.WARNING):
+        assert MINI_LINK in parse(mode, crawler)
+        assert MINI_LINK in parse(mode, crawler)
+
+    assert BrokenPool.created == 1
+    assert crawler.parse_workers == 0
+    errors = [r for r in caplog.records if r.levelno == logging.ERROR]
+    assert len(errors) == 1 and '\n' not in errors[0].getMessage()
+    assert crawler.metrics._counters[('wechat_parse_fallbacks_total', ())] == 1
+
+
+def test_pool_that_worked_is_rebuilt(monkeypatch, caplog):
+    import concurrent.futures
+    BrokenPool.created = 0
+    monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor', BrokenPool)
+    crawler = WeChatAPICrawler(ValidationConfig())
+    crawler.set_parse_workers(2)
+    crawler._parse_pool_ok = True
+
+    with caplog.at_level(logging.WARNING):
+        assert MINI_LINK in crawler.parse_html(PAGE)
+        assert MINI_LINK in crawler.parse_html(PAGE)
+
+    assert BrokenPool.created == 2
+    assert crawler.parse_workers == 2
+    assert not [r for r in caplog.records if r.levelno == logging.ERROR]
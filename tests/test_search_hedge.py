@@ -0,0 +1,120 @@
+"""公众号搜索的对冲请求：计时从主接口发出后开始，已有结果时排队中的备用请求不再发出"""
+import asyncio
+import time
+
+import pytest
+
+from wechat_core import AsyncWeChatAPICrawler, RateLimiter, WeChatAPICrawler
+from wechatspider import ValidationConfig, build_arg_parser
+
+PRIMARY, BACKUP = WeChatAPICrawler.SEARCH_BIZ_URLS
+
+
+class SearchResponse:
+    def __init__(self, accounts):
+        self.status_code = 200
+        self.content = b'{}'
+        self.accounts = accounts
+
+    def json(self):
+        return {'base_resp': {'ret': 0}, 'list': self.accounts}
+
+
+class FakeSearch:
+    """两个搜索接口：delays[url] 为返回前的耗时，empty 中的接口返回空结果"""
+    def __init__(self, delays=None, empty=()):
+        self.delays = delays or {}
+        self.empty = empty
+        self.calls = []
+
+    def response(self, url):
+        """记录一次请求（在返回前的耗时之前），返回它的响应"""
+        self.calls.append(url)
+        return SearchResponse([] if url in self.empty else [{'fakeid': url, 'nickname': 'N'}])
+
+
+def make_crawler(mode, server, interval, hedge_delay, drained=False):
+    """SEARCH每 interval 秒一个令牌；drained为True时令牌已被用掉，主接口要先排队"""
+    limiter = RateLimiter({RateLimiter.SEARCH: {'rate': 1 / interval, 'burst': 1, 'jitter': 0.0}})
+    if drained:
+        limiter.acquire(RateLimiter.SEARCH)
+    if mode == 'sync':
+        crawler = WeChatAPICrawler(ValidationConfig())
+        crawler.rate_limiter = limiter
+
+        def get(url, **kwargs):
+            response = server.response(url)
+            time.sleep(server.delays.get(url, 0))
+            return response
+        crawler.session.get = get
+    else:
+        crawler = AsyncWeChatAPICrawler(ValidationConfig(), rate_limiter=limiter)
+
+        async def send(method, url, *args):
+            response = server.response(url)
+            await asyncio.sleep(server.delays.get(url, 0))
+            return response
+
+        async def open_session():
+            pass
+        crawler._send = send
+        crawler.open = open_session
+    crawler.token = 't'
+    crawler.search_hedge_delay = hedge_delay
+    return crawler
+
+
+def search(mode, crawler, settle=0.0):
+    """搜索并在返回后再等 settle 秒（让仍在排队的备用请求有机会发出）"""
+    if mode == 'sync':
+        accounts = crawler.search_public_accounts('kw')
+        time.sleep(settle)
+        return accounts
+
+    async def run():
+        accounts = await crawler.search_public_accounts('kw')
+        await asyncio.sleep(settle)
+        return accounts
+    return asyncio.run(run())
+
+
+def test_token_wait_does_not_trigger_hedge(mode):
+    server = FakeSearch()
+    crawler = make_crawler(mode, server, interval=0.4, hedge_delay=0.2, drained=True)
+    accounts = search(mode, crawler, settle=0.6)
+    assert [a['fakeid'] for a in accounts] == [PRIMARY]
+    assert server.calls == [PRIMARY]
+
+
+def test_queued_backup_is_not_sent_after_result(mode):
+    server = FakeSearch(delays={PRIMARY: 0.2})
+    crawler = make_crawler(mode, server, interval=0.5, hedge_delay=0.05)
+    accounts = search(mode, crawler, settle=0.5)
+    assert [a['fakeid'] for a in accounts] == [PRIMARY]
+    assert server.calls == [PRIMARY]
+
+
+def test_slow_primary_is_hedged(mode):
+    server = FakeSearch(delays={PRIMARY: 0.5})
+    crawler = make_crawler(mode, server, interval=0.001, hedge_delay=0.1)
+    accounts = search(mode, crawler)
+    assert [a['fakeid'] for a in accounts] == [BACKUP]
+    assert server.calls == [PRIMARY, BACKUP]
+    assert crawler._ordered_search_urls()[0] == BACKUP
+
+
+def test_hedging_off_tries_endpoints_in_turn(mode):
+    server = FakeSearch(delays={PRIMARY: 0.3}, empty=(PRIMARY,))
+    crawler = make_crawler(mode, server, interval=0.001, hedge_delay=None)
+    accounts = search(mode, crawler)
+    assert [a['fakeid'] for a in accounts] == [BACKUP]
+    assert server.calls == [PRIMARY, BACKUP]
+
+
+def test_search_hedge_argument():
+    parser = build_arg_parser()
+    assert parser.parse_args(['search-accounts', 'kw']).search_hedge == 1.0
+    assert parser.parse_args(['search-accounts', 'kw', '--search-hedge', 'off']).search_hedge is None
+    assert parser.parse_args(['search-accounts', 'kw', '--search-hedge', '0.5']).search_hedge == 0.5
+    with pytest.raises(SystemExit):
+        parser.parse_args(['search-accounts', 'kw', '--search-hedge', '-1'])
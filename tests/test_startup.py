@@ -0,0 +1,38 @@
+"""启动检查：导入耗时上限与GUI依赖提示"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from wechatspider import DEFAULT_IMPORT_BUDGET_MS, measure_import_time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_wechatspider_import_within_budget():
+    result = measure_import_time('wechatspider', repeat=5)
+    assert result['total_ms'] <= DEFAULT_IMPORT_BUDGET_MS, result['modules']
+
+
+def test_import_time_of_preloaded_module_is_reported():
+    # sys在解释器启动时已导入，-X importtime 输出中没有它的记录
+    with pytest.raises(Exception, match='没有 sys 的记录'):
+        measure_import_time('sys', repeat=1)
+
+
+def test_gui_reports_missing_pyqt5():
+    # 让PyQt5找不到：GUI应在导入界面库之前给出安装提示，而不是抛出ImportError
+    code = (
+        "import runpy, sys\n"
+        "class NoPyQt5:\n"
+        "    def find_spec(self, name, path=None, target=None):\n"
+        "        if name.split('.')[0] == 'PyQt5':\n"
+        "            raise ImportError(name)\n"
+        "sys.meta_path.insert(0, NoPyQt5())\n"
+        f"runpy.run_path({os.path.join(ROOT, 'wechat_url_get_gui.py')!r}, run_name='__main__')\n"
+    )
+    proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, encoding='utf-8')
+    assert proc.returncode == 1
+    assert 'pip install PyQt5' in proc.stdout
+    assert 'Traceback' not in proc.stderr
@@ -0,0 +1,3708 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🌸 微信开放平台接口提取工具 · 共享核心 🌸
+
+命令行版（wechatspider.py）和图形界面版（wechat_url_get_gui.py）共用的部分：
+Cookie读取、登录态存储、限速、连接池、抓取指标、链接规范化与提取、
+文章缓存、增量状态、断点续抓、结果输出，以及同步/异步爬虫核心。
+这里只用logging输出，不做界面相关的打印。
+"""
+
+import os
+import sys
+import re
+import time
+import logging
+import threading
+import itertools
+import functools
+from collections import deque
+from html.parser import HTMLParser
+from datetime import datetime
+
+# ====================== Cookie自动获取类 ======================
+class _ChromiumCookieDecryptor:
+    """Chromium系Cookie解密器：每个来源只派生一次密钥，每种密文版本只创建一个解密器
+
+    - Windows: v10/v11 为 AES-256-GCM，密钥存放在 Local State 中并由DPAPI保护
+    - Linux:   v10 为 AES-128-CBC，密钥由固定口令 peanuts 经PBKDF2派生；
+               v11 的口令保存在系统密钥环中（取不到时按空口令处理）
+    较新的Cookie数据库会在明文前附加 host_key 的SHA256，解密后一并去掉。
+    """
+    LINUX_SALT = b'saltysalt'
+    LINUX_IV = b' ' * 16
+
+    def __init__(self, local_state=None, keyring_name=None):
+        self.local_state = local_state  # Local State 文件路径（Windows）
+        self.keyring_name = keyring_name  # 密钥环中的应用名（Linux）
+        self._ciphers = {}  # 密文版本 -> 解密器
+        self._host_hashes = {}
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _linux_key(password):
+        """由口令派生Linux下的AES密钥（同一口令只派生一次）"""
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA1(), length=16, salt=_ChromiumCookieDecryptor.LINUX_SALT, iterations=1)
+        return kdf.derive(password)
+
+    def _keyring_password(self):
+        """从系统密钥环读取v11口令（需要keyring库，取不到时返回空口令）"""
+        try:
+            import keyring
+            password = keyring.get_password(f"{self.keyring_name} Safe Storage", self.keyring_name)
+            return password.encode('utf-8') if password else b''
+        except Exception:
+            return b''
+
+    def _windows_key(self):
+        """从Local State读取并用DPAPI解开AES密钥"""
+        import json
+        import base64
+        import win32crypt
+        with open(self.local_state, 'r', encoding='utf-8') as f:
+            encrypted_key = base64.b64decode(json.load(f)["os_crypt"]["encrypted_key"])
+        return win32crypt.CryptUnprotectData(encrypted_key[5:], None, None, None, 0)[1]  # 去掉DPAPI前缀
+
+    def _get_cipher(self, version):
+        """获取某个密文版本的解密器（首次使用时派生密钥）"""
+        if sys.platform.startswith('win32'):
+            version = b'gcm'  # Windows下各版本共用Local State中的同一个密钥
+        cipher = self._ciphers.get(version)
+        if cipher is None:
+            if sys.platform.startswith('win32'):
+                from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+                cipher = AESGCM(self._windows_key())
+            else:
+                from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+                password = b'peanuts' if version == b'v10' else self._keyring_password()
+                cipher = Cipher(algorithms.AES(self._linux_key(password)), modes.CBC(self.LINUX_IV))
+            self._ciphers[version] = cipher
+        return cipher
+
+    def decrypt(self, encrypted_value, host_key):
+        """解密一个Cookie值"""
+        version = encrypted_value[:3]
+        if version not in (b'v10', b'v11'):
+            raise ValueError(f"不支持的Cookie密文版本: {version!r}")
+        cipher = self._get_cipher(version)
+        if sys.platform.startswith('win32'):
+            plaintext = cipher.decrypt(encrypted_value[3:15], encrypted_value[15:], None)
+        else:
+            from cryptography.hazmat.primitives import padding
+            decryptor = cipher.decryptor()
+            padded = decryptor.update(encrypted_value[3:]) + decryptor.finalize()
+            # 去掉PKCS#7填充；口令不对时填充几乎不可能合法，这里会抛出ValueError，而不是得到乱码
+            unpadder = padding.PKCS7(128).unpadder()
+            plaintext = unpadder.update(padded) + unpadder.finalize()
+        
+        host_hash = self._host_hashes.get(host_key)
+        if host_hash is None:
+            import hashlib
+            host_hash = self._host_hashes[host_key] = hashlib.sha256(host_key.encode('utf-8')).digest()
+        if plaintext.startswith(host_hash):
+            plaintext = plaintext[32:]
+        return plaintext.decode('utf-8')
+
+class WeChatCookieAutoGetter:
+    """微信Cookie自动获取器 (๑＞ڡ＜)☆
+
+    各浏览器和微信客户端统一描述为Cookie来源，由同一套流程读取：数据库以只读
+    immutable方式打开（浏览器运行中也不会被锁住），每个来源只派生一次密钥，
+    获取全部来源时并行查询。
+    """
+    SOURCE_NAMES = {1: 'Chrome', 2: 'Edge', 3: '微信客户端'}
+    HOST_PATTERN = '%mp.weixin.qq.com%'
+    
+    @staticmethod
+    def get_wechat_cookies(source=0):
+        """从指定来源获取Cookie（0表示全部来源并行查询，按Chrome、Edge、微信客户端的顺序取第一个有效结果）"""
+        try:
+            sources = WeChatCookieAutoGetter.cookie_sources()
+            if source:
+                sources = [item for item in sources if item['group'] == source]
+            if not sources:
+                logging.warning("当前系统上没有可用的Cookie来源")
+                return None
+            
+            if len(sources) == 1:
+                results = [WeChatCookieAutoGetter.read_source(sources[0])]
+            else:
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='cookie') as pool:
+                    results = list(pool.map(WeChatCookieAutoGetter.read_source, sources))
+            
+            for cookies in results:
+                if cookies and WeChatCookieAutoGetter._validate_cookie_basic(cookies):
+                    logging.info("成功获取微信Cookie")
+                    return cookies
+            
+            logging.warning("所有获取Cookie的方法都失败了")
+            return None
+            
+        except Exception as e:
+            logging.error(f"获取Cookie时出错: {str(e)}")
+            return None
+    
+    @staticmethod
+    def cookie_sources():
+        """当前系统上的Cookie来源（group与来源编号对应: 1=Chrome 2=Edge 3=微信客户端）"""
+        from pathlib import Path
+        sources = []
+        
+        def chromium(name, group, user_data, keyring_name=None):
+            profile = Path(user_data) / "Default"
+            sources.append({
+                'name': name, 'group': group,
+                'cookie_paths': [profile / "Network" / "Cookies", profile / "Cookies"],
+                'local_state': Path(user_data) / "Local State",
+                'keyring_name': keyring_name
+            })
+        
+        if sys.platform.startswith('win32'):
+            local_appdata = Path(os.getenv('LOCALAPPDATA', ''))
+            appdata = Path(os.getenv('APPDATA', ''))
+            chromium('Chrome', 1, local_appdata / "Google" / "Chrome" / "User Data")
+            chromium('Edge', 2, local_appdata / "Microsoft" / "Edge" / "User Data")
+            chromium('微信客户端', 3, appdata / "Tencent" / "WeChat" / "XPlugin" / "Plugins" / "WeChatBrowser" / "User Data")
+            sources[-1]['cookie_paths'].append(appdata / "Tencent" / "WeChat" / "WeChat Files" / "All Users" / "Cookies")
+        else:
+            config_home = Path(os.getenv('XDG_CONFIG_HOME') or Path.home() / ".config")
+            chromium('Chrome', 1, config_home / "google-chrome", 'Chrome')
+            chromium('Chromium', 1, config_home / "chromium", 'Chromium')
+            chromium('Edge', 2, config_home / "microsoft-edge", 'Microsoft Edge')
+        return sources
+    
+    @staticmethod
+    def read_source(source):
+        """读取一个来源中mp.weixin.qq.com的Cookie，返回Cookie字符串（没有时返回None）"""
+        cookie_path = next((path for path in source['cookie_paths'] if path.exists()), None)
+        if cookie_path is None:
+            return None
+        
+        import sqlite3
+        try:
+            # 只读+immutable：不加锁、不读日志文件，浏览器运行时也能直接读取
+            # （代价是浏览器刚写入、尚未落盘的Cookie可能读不到）
+            conn = sqlite3.connect(f"{cookie_path.resolve().as_uri()}?mode=ro&immutable=1", uri=True)
+            try:
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(cookies)")}
+                host_column = 'host_key' if 'host_key' in columns else 'host'
+                encrypted_column = 'encrypted_value' if 'encrypted_value' in columns else "x''"
+                rows = conn.execute(
+                    f"SELECT {host_column}, name, value, {encrypted_column} FROM cookies WHERE {host_column} LIKE ?",
+                    (WeChatCookieAutoGetter.HOST_PATTERN,)
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logging.warning(f"{source['name']} Cookie获取失败: {str(e)}")
+            return None
+        
+        decryptor = _ChromiumCookieDecryptor(source.get('local_state'), source.get('keyring_name'))
+        cookies = {}
+        failed = 0
+        for host_key, name, value, encrypted_value in rows:
+            if value:
+                cookies[name] = value
+            elif encrypted_value:
+                try:
+                    cookies[name] = decryptor.decrypt(encrypted_value, host_key)
+                except ImportError:
+                    logging.warning(f"缺少{source['name']} Cookie解密所需的库")
+                    return None
+                except Exception:
+                    failed += 1
+        if failed:
+            logging.warning(f"{source['name']} 有 {failed} 个Cookie解密失败")
+        return WeChatCookieAutoGetter._dict_to_cookie_str(cookies) if cookies else None
+    
+    @staticmethod
+    def _validate_cookie_basic(cookie_str):
+        """基础Cookie格式验证"""
+        return cookie_str and '=' in cookie_str and ';' in cookie_str
+    
+    @staticmethod
+    def _cookie_str_to_dict(cookie_str):
+        """Cookie字符串转字典"""
+        cookies = {}
+        for item in cookie_str.split(';'):
+            item = item.strip()
+            if '=' in item:
+                key, value = item.split('=', 1)
+                cookies[key.strip()] = value.strip()
+        return cookies
+    
+    @staticmethod
+    def _dict_to_cookie_str(cookie_dict):
+        """Cookie字典转字符串"""
+        return '; '.join([f"{k}={v}" for k, v in cookie_dict.items()])
+
+# ====================== 登录态存储类 ======================
+class SessionStore:
+    """登录态持久化：保存Cookie、Token和上次验证时间 ✧
+
+    验证时间在有效期内的登录态直接复用，不发任何请求；过期后由
+    WeChatAPICrawler.login 请求一次 cgi-bin/home，同时完成Cookie校验和Token提取。
+    """
+    DEFAULT_PATH = "wechat_session.json"
+    DEFAULT_TTL = 3600  # 验证结果的有效期（秒）
+
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+
+    def load(self):
+        """读取保存的登录态，文件不存在或损坏时返回空字典"""
+        import json
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"读取登录态失败: {str(e)}")
+            return {}
+
+    def save(self, cookie, token, validated=True):
+        """保存登录态（仅当前用户可读）；validated为False表示Token未经服务端验证"""
+        import json
+        now = int(time.time())
+        session = {'cookie': cookie, 'token': token, 'saved_at': now, 'validated_at': now if validated else 0}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(session, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        try:
+            os.chmod(self.path, 0o600)
+        except OSError:
+            pass
+
+    def is_fresh(self, session):
+        """登录态是否在有效期内（旧版文件没有验证时间，视为已过期）"""
+        return bool(session.get('token')) and time.time() - session.get('validated_at', 0) < self.ttl
+
+    def lookup(self, cookie=None):
+        """查找可复用的登录态，返回 (cookie, token, 是否在有效期内)
+
+        指定了cookie且与保存的不同时，保存的Token不可用。
+        """
+        session = self.load()
+        if cookie and cookie != session.get('cookie'):
+            return cookie, None, False
+        return session.get('cookie'), session.get('token'), self.is_fresh(session)
+
+    def clear(self):
+        """删除保存的登录态"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+# ====================== 限速器类 ======================
+class TokenBucket:
+    """令牌桶限速器（线程/协程安全，多个worker共享同一预算） (๑•̀ㅂ•́)و✧"""
+    def __init__(self, rate, burst=1, jitter=0.0):
+        self.rate = rate  # 每秒补充的令牌数
+        self.burst = burst  # 桶容量（允许的突发请求数）
+        self.jitter = jitter  # 每次请求额外的随机延迟上限（秒）
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate, burst=None, jitter=None):
+        """调整速率（已积累的令牌保留）"""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            if burst is not None:
+                self.burst = burst
+            if jitter is not None:
+                self.jitter = jitter
+            self._tokens = min(self._tokens, self.burst)
+
+    def _refill(self):
+        """按流逝时间补充令牌（调用方需持有锁）"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def reserve(self):
+        """预约一个令牌，返回需要等待的秒数"""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            # 令牌不足时记为欠账，后来者依次排队
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if self.jitter:
+            import random
+            wait += random.uniform(0, self.jitter)
+        return wait
+
+    def acquire(self):
+        """阻塞直到获得令牌，返回实际等待时间"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        """协程版acquire，等待期间不阻塞事件循环"""
+        import asyncio
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        """暂停发放令牌，所有共享此桶的worker都会一起等待"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+class RateLimitError(Exception):
+    """触发微信频率限制（HTTP 429 / base_resp.ret=200013）"""
+
+class AdaptiveThrottle:
+    """AIMD自适应限速 (๑•̀ㅂ•́)و✧
+
+    遇到限流信号时速率减半并指数退避（带抖动），
+    连续成功一定次数后线性回升，直到配置的速率上限。
+    """
+    def __init__(self, bucket, max_rate=None, min_rate=None, decrease=0.5,
+                 increase=None, success_threshold=10, base_backoff=2.0, max_backoff=120.0):
+        self.bucket = bucket
+        self.max_rate = max_rate or bucket.rate  # 速率上限
+        self.min_rate = min_rate or self.max_rate / 16  # 速率下限
+        self.decrease = decrease  # 乘性减小系数
+        self.increase = increase or self.max_rate / 10  # 加性增大步长
+        self.success_threshold = success_threshold  # 连续成功多少次后提速
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.successes = 0
+        self.failures = 0  # 连续限流次数
+        self._lock = threading.Lock()
+
+    @property
+    def current_rate(self):
+        """当前速率（请求/秒）"""
+        return self.bucket.rate
+
+    def set_max_rate(self, max_rate):
+        """修改速率上限（同时重置为该速率）"""
+        with self._lock:
+            self.max_rate = max_rate
+            self.min_rate = max_rate / 16
+            self.increase = max_rate / 10
+            self.successes = 0
+            self.failures = 0
+        self.bucket.set_rate(max_rate)
+
+    @staticmethod
+    def backoff_delay(attempt, base=2.0, cap=120.0):
+        """第attempt次失败的退避时间（指数增长 + 抖动）"""
+        delay = min(cap, base * (2 ** max(0, attempt - 1)))
+        import random
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def on_success(self):
+        """记录一次成功请求"""
+        with self._lock:
+            self.failures = 0
+            self.successes += 1
+            if self.successes < self.success_threshold or self.current_rate >= self.max_rate:
+                return
+            self.successes = 0
+            new_rate = min(self.max_rate, self.current_rate + self.increase)
+        self.bucket.set_rate(new_rate)
+
+    def on_rate_limited(self):
+        """记录一次限流，降速并暂停，返回退避时间（秒）"""
+        with self._lock:
+            self.successes = 0
+            self.failures += 1
+            new_rate = max(self.min_rate, self.current_rate * self.decrease)
+            backoff = self.backoff_delay(self.failures, self.base_backoff, self.max_backoff)
+        self.bucket.set_rate(new_rate)
+        self.bucket.pause(backoff)
+        return backoff
+
+class RateLimiter:
+    """按接口类别分别限速的限速器 (◍•ᴗ•◍)
+
+    每个类别一个令牌桶，各自配置速率、突发量与随机抖动；
+    同一实例可被多个线程和协程共享，共用同一份请求预算。
+    """
+    SEARCH = 'search'    # searchbiz / 小程序搜索（最容易触发封禁）
+    APPMSG = 'appmsg'    # 历史文章列表
+    ARTICLE = 'article'  # 文章HTML
+    TOKEN = 'token'      # 登录态/Token页面
+
+    # 默认配置：rate为每秒请求数，jitter为额外随机延迟上限（秒）
+    DEFAULT_PROFILES = {
+        SEARCH: {'rate': 1 / 5, 'burst': 1, 'jitter': 2.0},
+        APPMSG: {'rate': 1 / 1.5, 'burst': 1, 'jitter': 1.0},
+        ARTICLE: {'rate': 1 / 1.5, 'burst': 2, 'jitter': 1.0},
+        TOKEN: {'rate': 1 / 1.5, 'burst': 3, 'jitter': 0.5},
+    }
+
+    def __init__(self, profiles=None):
+        self.buckets = {}
+        merged = {name: dict(profile) for name, profile in self.DEFAULT_PROFILES.items()}
+        for name, profile in (profiles or {}).items():
+            merged.setdefault(name, {}).update(profile)
+        self.throttles = {}
+        for name, profile in merged.items():
+            self.buckets[name] = TokenBucket(
+                profile['rate'], profile.get('burst', 1), profile.get('jitter', 0.0)
+            )
+            self.throttles[name] = AdaptiveThrottle(self.buckets[name])
+
+    @staticmethod
+    def classify(url):
+        """根据URL判断接口类别"""
+        if 'searchbiz' in url or 'wxa-api/search' in url:
+            return RateLimiter.SEARCH
+        if 'cgi-bin/appmsg' in url:
+            return RateLimiter.APPMSG
+        if 'cgi-bin/home' in url or 'cgi-bin/menu' in url or url.rstrip('/').endswith('mp.weixin.qq.com'):
+            return RateLimiter.TOKEN
+        return RateLimiter.ARTICLE
+
+    def configure(self, endpoint, rate=None, burst=None, jitter=None):
+        """调整某一类别的限速参数（rate同时作为自适应限速的上限）"""
+        bucket = self.buckets[endpoint]
+        bucket.set_rate(bucket.rate, burst, jitter)
+        if rate is not None:
+            self.throttles[endpoint].set_max_rate(rate)
+
+    def get_bucket(self, endpoint):
+        """获取类别对应的令牌桶（未知类别按文章页处理）"""
+        return self.buckets.get(endpoint) or self.buckets[self.ARTICLE]
+
+    def get_throttle(self, endpoint):
+        """获取类别对应的自适应限速器"""
+        return self.throttles.get(endpoint) or self.throttles[self.ARTICLE]
+
+    def report_success(self, endpoint):
+        """上报一次成功请求"""
+        self.get_throttle(endpoint).on_success()
+
+    def report_rate_limited(self, endpoint):
+        """上报一次限流，返回退避时间（秒）"""
+        throttle = self.get_throttle(endpoint)
+        backoff = throttle.on_rate_limited()
+        logging.warning(
+            f"触发限流({endpoint})，降速至 {throttle.current_rate:.2f} 次/秒，暂停 {backoff:.1f} 秒"
+        )
+        return backoff
+
+    def current_rates(self):
+        """各类别当前速率（请求/秒）"""
+        return {name: throttle.current_rate for name, throttle in self.throttles.items()}
+
+    def acquire(self, endpoint):
+        """阻塞直到该类别获得令牌"""
+        return self.get_bucket(endpoint).acquire()
+
+    async def acquire_async(self, endpoint):
+        """协程版acquire"""
+        return await self.get_bucket(endpoint).acquire_async()
+
+# ====================== 连接池类 ======================
+class ConnectionStats:
+    """HTTP连接复用统计（线程安全）"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0  # 发出的请求数（含urllib3重试前的首次发送）
+        self.new_connections = 0  # 新建的TCP/TLS连接数
+        self.active = 0  # 正在进行中的请求数
+
+    def on_request_start(self):
+        with self._lock:
+            self.requests += 1
+            self.active += 1
+
+    def on_request_end(self):
+        with self._lock:
+            self.active -= 1
+
+    def on_new_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def snapshot(self):
+        """返回统计快照：请求数、新建连接数、复用率、进行中的请求数"""
+        with self._lock:
+            reused = max(0, self.requests - self.new_connections)
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'reused': reused,
+                'reuse_ratio': reused / self.requests if self.requests else 0.0,
+                'active': self.active
+            }
+
+@functools.lru_cache(maxsize=None)
+def _instrumented_adapter_class():
+    """定义带连接统计的HTTPAdapter（首次使用时才导入requests/urllib3）"""
+    from requests.adapters import HTTPAdapter
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class InstrumentedHTTPAdapter(HTTPAdapter):
+        """统计新建连接与请求数的适配器，连接池按主机复用、所有worker线程共享"""
+        def __init__(self, stats, **kwargs):
+            self.stats = stats
+            super().__init__(**kwargs)
+
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            stats = self.stats
+
+            def counting(base):
+                def _new_conn(pool):
+                    stats.on_new_connection()
+                    return base._new_conn(pool)
+                return type(base.__name__, (base,), {'_new_conn': _new_conn})
+
+            self.poolmanager.pool_classes_by_scheme = {
+                'http': counting(HTTPConnectionPool),
+                'https': counting(HTTPSConnectionPool)
+            }
+
+        def send(self, request, **kwargs):
+            self.stats.on_request_start()
+            try:
+                return super().send(request, **kwargs)
+            finally:
+                self.stats.on_request_end()
+
+        def idle_connections(self):
+            """连接池中空闲且仍保持打开的连接数"""
+            count = 0
+            for key in list(self.poolmanager.pools.keys()):
+                pool = self.poolmanager.pools.get(key)
+                if pool is None or pool.pool is None:
+                    continue
+                count += sum(
+                    1 for conn in list(pool.pool.queue)
+                    if conn is not None and getattr(conn, 'sock', None) is not None
+                )
+            return count
+
+    return InstrumentedHTTPAdapter
+
+def build_retry_policy(retries=3, backoff_base=2.0, backoff_cap=30.0):
+    """urllib3重试策略：只处理连接错误和5xx，与AdaptiveThrottle的退避节奏一致
+
+    429不在重试范围内（也不遵循Retry-After），交给RateLimiter降速，
+    避免两层重试叠加；POST不重试（非幂等）。
+    """
+    from urllib3.util.retry import Retry
+    options = {
+        'total': retries,
+        'connect': retries,
+        'read': 1,
+        'status': retries,
+        'status_forcelist': (500, 502, 503, 504),
+        'allowed_methods': frozenset({'GET', 'HEAD'}),
+        'backoff_factor': backoff_base / 2,
+        'respect_retry_after_header': False,
+        'raise_on_status': False  # 重试用尽后返回最后的响应，由调用方统一报错
+    }
+    try:
+        return Retry(backoff_max=backoff_cap, backoff_jitter=backoff_base / 2, **options)
+    except TypeError:
+        # urllib3 1.x 不支持 backoff_max/backoff_jitter 参数
+        return Retry(**options)
+
+# ====================== 抓取指标类 ======================
+class CrawlMetrics:
+    """抓取指标（线程安全） ✧
+
+    - 各接口类别的请求耗时直方图、状态码计数和下载字节数
+    - 每篇文章的解析耗时直方图
+    - 限速器中的等待时间、文章缓存命中情况
+    - 按 base_resp.ret 统计的接口错误数
+    直方图为Prometheus风格的累计桶，snapshot()可直接转成JSON。
+    """
+    REQUEST_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # 请求耗时（秒）
+    PARSE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)  # 解析耗时（秒）
+    HELP = {
+        'wechat_request_seconds': ('histogram', "请求耗时（秒，含重试前的每次发送）"),
+        'wechat_requests_total': ('counter', "请求数（按接口类别和HTTP状态码）"),
+        'wechat_response_bytes_total': ('counter', "下载的响应体字节数"),
+        'wechat_parse_seconds': ('histogram', "每篇文章的解析耗时（秒）"),
+        'wechat_parse_fallbacks_total': ('counter', "解析进程池不可用、改在本进程内解析的文章数"),
+        'wechat_ratelimit_wait_seconds_total': ('counter', "在限速器中等待的时间（秒）"),
+        'wechat_cache_requests_total': ('counter', "文章缓存查询（hit/revalidated/miss）"),
+        'wechat_api_errors_total': ('counter', "接口返回的错误数（按base_resp.ret）"),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """清空所有指标"""
+        with self._lock:
+            self.started_at = time.time()
+            self._counters = {}  # (名称, 标签) -> 值
+            self._histograms = {}  # (名称, 标签) -> [各桶计数..., 总和, 次数]
+
+    def inc(self, name, labels=(), value=1):
+        """计数器累加；labels为 ((标签名, 值), ...)"""
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, buckets, labels=()):
+        """直方图记录一次观测值"""
+        key = (name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    hist[i] += 1
+                    break
+            hist[-2] += value
+            hist[-1] += 1
+
+    # ---------- 埋点 ----------
+    def observe_request(self, endpoint, seconds, status, nbytes=0):
+        """记录一次HTTP请求（status为状态码，网络异常时为'error'）"""
+        labels = (('endpoint', endpoint),)
+        self.observe('wechat_request_seconds', seconds, self.REQUEST_BUCKETS, labels)
+        self.inc('wechat_requests_total', labels + (('status', str(status)),))
+        if nbytes:
+            self.inc('wechat_response_bytes_total', labels, nbytes)
+
+    def observe_parse(self, seconds):
+        """记录一篇文章的解析耗时"""
+        self.observe('wechat_parse_seconds', seconds, self.PARSE_BUCKETS)
+
+    def parse_fallback(self):
+        """记录一篇因解析进程池不可用而在本进程内解析的文章"""
+        self.inc('wechat_parse_fallbacks_total')
+
+    def observe_wait(self, endpoint, seconds):
+        """记录在限速器中等待的时间"""
+        if seconds > 0:
+            self.inc('wechat_ratelimit_wait_seconds_total', (('endpoint', endpoint),), seconds)
+
+    def cache_result(self, result):
+        """记录一次文章缓存查询：hit（新鲜命中）、revalidated（304后复用）、miss"""
+        self.inc('wechat_cache_requests_total', (('result', result),))
+
+    def api_error(self, ret):
+        """记录一次 base_resp.ret 非0的接口返回"""
+        self.inc('wechat_api_errors_total', (('ret', str(ret)),))
+
+    # ---------- 读取 ----------
+    def _buckets_of(self, name):
+        return self.PARSE_BUCKETS if name == 'wechat_parse_seconds' else self.REQUEST_BUCKETS
+
+    def snapshot(self):
+        """所有指标的JSON友好快照"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(hist) for key, hist in self._histograms.items()}
+        result = {'started_at': self.started_at, 'uptime': time.time() - self.started_at,
+                  'counters': {}, 'histograms': {}}
+        for (name, labels), value in sorted(counters.items()):
+            result['counters'].setdefault(name, []).append({'labels': dict(labels), 'value': value})
+        for (name, labels), hist in sorted(histograms.items()):
+            cumulative, buckets = 0, {}
+            for bound, count in zip(self._buckets_of(name), hist):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            result['histograms'].setdefault(name, []).append({
+                'labels': dict(labels), 'buckets': buckets, 'sum': hist[-2], 'count': hist[-1]
+            })
+        return result
+
+    def to_prometheus(self):
+        """Prometheus文本格式（0.0.4）"""
+        snapshot = self.snapshot()
+        lines = []
+
+        def fmt(labels, extra=None):
+            items = list(labels.items()) + ([extra] if extra else [])
+            if not items:
+                return ''
+            return '{' + ','.join(f'{k}="{v}"' for k, v in items) + '}'
+
+        for name, (kind, help_text) in self.HELP.items():
+            samples = snapshot['histograms' if kind == 'histogram' else 'counters'].get(name)
+            if not samples:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample in samples:
+                labels = sample['labels']
+                if kind == 'counter':
+                    lines.append(f"{name}{fmt(labels)} {sample['value']:g}")
+                    continue
+                for bound, count in sample['buckets'].items():
+                    lines.append(f"{name}_bucket{fmt(labels, ('le', bound))} {count}")
+                lines.append(f"{name}_bucket{fmt(labels, ('le', '+Inf'))} {sample['count']}")
+                lines.append(f"{name}_sum{fmt(labels)} {sample['sum']:g}")
+                lines.append(f"{name}_count{fmt(labels)} {sample['count']}")
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _quantile(buckets, count, q):
+        """由累计桶估算分位数（取所在桶的上界）"""
+        target = q * count
+        for bound, cumulative in buckets.items():
+            if cumulative >= target:
+                return float(bound)
+        return float('inf')
+
+    def summary(self):
+        """面向人的汇总：各接口请求数/平均与P95耗时、下载量、解析耗时、限速等待、缓存命中率、错误码"""
+        snapshot = self.snapshot()
+        counters = snapshot['counters']
+        endpoints = {}
+
+        def endpoint_stats(endpoint):
+            return endpoints.setdefault(endpoint, {'requests': 0, 'avg_ms': 0.0, 'p95_ms': 0.0, 'bytes': 0, 'wait_s': 0.0})
+
+        for sample in snapshot['histograms'].get('wechat_request_seconds', []):
+            count = sample['count']
+            endpoint_stats(sample['labels']['endpoint']).update(
+                requests=count,
+                avg_ms=sample['sum'] / count * 1000 if count else 0.0,
+                p95_ms=self._quantile(sample['buckets'], count, 0.95) * 1000 if count else 0.0
+            )
+        for sample in counters.get('wechat_response_bytes_total', []):
+            endpoint_stats(sample['labels']['endpoint'])['bytes'] = sample['value']
+        for sample in counters.get('wechat_ratelimit_wait_seconds_total', []):
+            endpoint_stats(sample['labels']['endpoint'])['wait_s'] = sample['value']
+        
+        parse = (snapshot['histograms'].get('wechat_parse_seconds') or [{'sum': 0.0, 'count': 0}])[0]
+        cache = {s['labels']['result']: s['value'] for s in counters.get('wechat_cache_requests_total', [])}
+        lookups = sum(cache.values())
+        return {
+            'uptime': snapshot['uptime'],
+            'endpoints': endpoints,
+            'parsed': parse['count'],
+            'parse_avg_ms': parse['sum'] / parse['count'] * 1000 if parse['count'] else 0.0,
+            'cache': cache,
+            'cache_hit_ratio': (cache.get('hit', 0) + cache.get('revalidated', 0)) / lookups if lookups else 0.0,
+            'api_errors': {s['labels']['ret']: s['value'] for s in counters.get('wechat_api_errors_total', [])}
+        }
+
+    def format_summary(self):
+        """汇总的多行文本（日志/命令行/界面共用）"""
+        summary = self.summary()
+        lines = [f"运行 {summary['uptime']:.0f} 秒"]
+        for endpoint, stats in sorted(summary['endpoints'].items()):
+            lines.append(
+                f"[{endpoint}] 请求 {stats['requests']} 次，平均 {stats['avg_ms']:.0f}ms，P95≤{stats['p95_ms']:.0f}ms，"
+                f"下载 {stats['bytes'] / 1024:.1f}KB，限速等待 {stats['wait_s']:.1f}秒"
+            )
+        lines.append(f"解析 {summary['parsed']} 篇，平均 {summary['parse_avg_ms']:.1f}ms/篇")
+        cache = summary['cache']
+        lines.append(
+            f"文章缓存命中率 {summary['cache_hit_ratio']:.0%}（命中 {cache.get('hit', 0)}，"
+            f"304复用 {cache.get('revalidated', 0)}，未命中 {cache.get('miss', 0)}）"
+        )
+        errors = ', '.join(f"ret={ret}: {count}" for ret, count in sorted(summary['api_errors'].items()))
+        lines.append(f"接口错误: {errors or '无'}")
+        return '\n'.join(lines)
+
+class MetricsExporter:
+    """指标导出器基类：start()后在后台线程中工作，stop()停止"""
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def start(self):
+        raise NotImplementedError
+
+    def stop(self):
+        raise NotImplementedError
+
+class PrometheusExporter(MetricsExporter):
+    """以HTTP提供Prometheus文本格式指标（GET /metrics）"""
+    def __init__(self, metrics, port=9108, host='127.0.0.1'):
+        super().__init__(metrics)
+        self.host = host
+        self.port = port
+        self._server = None
+
+    def start(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 抓取日志里不记录每次拉取
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]  # port为0时取实际分配的端口
+        threading.Thread(target=self._server.serve_forever, name='metrics-http', daemon=True).start()
+        logging.info(f"指标端点: http://{self.host}:{self.port}/metrics")
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+class JsonMetricsDumper(MetricsExporter):
+    """定期把指标快照写入JSON文件（先写临时文件再替换，读取方不会读到半个文件）"""
+    def __init__(self, metrics, path, interval=30.0):
+        super().__init__(metrics)
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def dump(self):
+        """立即写出一次快照"""
+        import json
+        snapshot = self.metrics.snapshot()
+        snapshot['summary'] = self.metrics.summary()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.dump()
+            except OSError as e:
+                logging.warning(f"写入指标文件失败: {str(e)}")
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='metrics-json', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止并写出最终快照"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.dump()
+
+# ====================== 链接规范化引擎 ======================
+class UrlCanonicalizer:
+    """URL规范化引擎 ✧
+
+    同一个链接常以多种写法出现（http/https、参数顺序不同、文章链接带 scene/chksm 等追踪参数、
+    #rd 锚点、HTML/JSON转义），规范化后才能作为缓存键和去重键（导出时原始链接另外保留）：
+    - 协议相对和站内相对链接补全为 https://mp.weixin.qq.com
+    - http 统一为 https，域名小写，去掉默认端口、#rd 和 #wechat_redirect 锚点，参数排序
+    - 只有 mp.weixin.qq.com 的文章链接（/s）去掉追踪参数，带齐身份参数时只保留 __biz/mid/idx/sn；
+      小程序等其他链接的参数都是有意义的，不做删减
+    - weixin:// 等非http链接只还原转义，其余原样保留
+    """
+    DEFAULT_HOST = 'mp.weixin.qq.com'
+    # 文章链接中与文章内容无关、随分享场景或用户变化的参数
+    TRACKING_PARAMS = frozenset({
+        'scene', 'subscene', 'chksm', 'sessionid', 'clicktime', 'enterid', 'ascene', 'devicetype',
+        'version', 'nettype', 'abtest_cookie', 'pass_ticket', 'wx_header', 'key', 'uin', 'exportkey',
+        'acctmode', 'fontgear', 'from', 'isappinstalled', 'share_token', 'poc_token', 'realreporttime',
+        'countrycode', 'exptype', 'lang', 'srcid', 'sharer_sharetime', 'sharer_shareid', 'mpshare'
+    })
+    ARTICLE_PARAMS = ('__biz', 'mid', 'idx', 'sn')  # 唯一确定一篇文章的参数
+    REDIRECT_FRAGMENTS = frozenset({'rd', 'wechat_redirect'})  # 微信分享/跳转时追加的锚点
+    APPID_PATTERN = re.compile(r'\b(wx[0-9a-f]{16})\b')
+
+    def __init__(self, tracking_params=None):
+        self.tracking_params = frozenset(tracking_params) if tracking_params is not None else self.TRACKING_PARAMS
+
+    def resolve(self, url):
+        """还原HTML/JSON转义并补全相对链接，链接其余部分保持原样（导出的原始链接）"""
+        url = url.strip().replace('&amp;', '&').replace('\\/', '/')
+        if url.startswith('//'):
+            return f"https:{url}"
+        if url.startswith('/'):
+            return f"https://{self.DEFAULT_HOST}{url}"
+        return url
+
+    def is_article(self, host, path):
+        """是否为公众号文章链接（只有文章链接会去掉追踪参数）"""
+        return host == self.DEFAULT_HOST and (path == '/s' or path.startswith('/s/'))
+
+    def canonicalize(self, url):
+        """返回链接的规范形式"""
+        from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+        url = self.resolve(url)
+        parts = urlsplit(url)
+        if parts.scheme.lower() not in ('http', 'https'):
+            return url
+        
+        host = parts.netloc.lower()
+        if host.endswith(':80') or host.endswith(':443'):
+            host = host.rsplit(':', 1)[0]
+        fragment = '' if parts.fragment in self.REDIRECT_FRAGMENTS else parts.fragment
+        
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        if self.is_article(host, parts.path):
+            params = [(name, value) for name, value in params if name.lower() not in self.tracking_params]
+            article = [(name, value) for name, value in params if name in self.ARTICLE_PARAMS]
+            if len(article) == len(self.ARTICLE_PARAMS):
+                params = article
+        return urlunsplit(('https', host, parts.path, urlencode(sorted(params)), fragment))
+
+    def mini_program(self, url):
+        """提取小程序的 (AppID, 页面路径)，不是小程序链接时对应项为空字符串"""
+        from urllib.parse import urlsplit, parse_qs
+        query = parse_qs(urlsplit(url).query)
+        appid = (query.get('appid') or [''])[0]
+        if not appid:
+            match = self.APPID_PATTERN.search(url)
+            appid = match.group(1) if match else ''
+        path = (query.get('path') or query.get('pagepath') or [''])[0]
+        return appid, path
+
+_CANONICALIZER = UrlCanonicalizer()
+
+@functools.lru_cache(maxsize=65536)
+def canonicalize_url(url):
+    """用默认规则规范化链接（结果缓存：同一链接在大量文章中反复出现）"""
+    return _CANONICALIZER.canonicalize(url)
+
+# ====================== 文章缓存类 ======================
+class ArticleCache:
+    """文章页面磁盘缓存（SQLite + zlib压缩） (◍•ᴗ•◍)
+
+    已发布的公众号文章几乎不会变化：TTL内直接命中不发请求，
+    过期后带 If-None-Match / If-Modified-Since 条件请求重新验证；
+    总大小超过上限时按最近访问时间淘汰（LRU）。
+    不指定位置时放在用户缓存目录（见 default_path），不会写到当前目录。
+    """
+    FILE_NAME = "wechat_article_cache.db"
+
+    def __init__(self, path=None, max_bytes=512 * 1024 * 1024, ttl=30 * 86400):
+        self.path = path or self.default_path()
+        self.max_bytes = max_bytes  # 压缩后总大小上限（字节）
+        self.ttl = ttl  # 有效期（秒）
+        self._conn = None
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default_path(cls):
+        """用户缓存目录下的缓存文件（Windows为%LOCALAPPDATA%，其他系统为$XDG_CACHE_HOME或~/.cache）"""
+        from pathlib import Path
+        if sys.platform.startswith('win32') and os.getenv('LOCALAPPDATA'):
+            cache_home = Path(os.getenv('LOCALAPPDATA'))
+        else:
+            cache_home = Path(os.getenv('XDG_CACHE_HOME') or Path.home() / ".cache")
+        return str(cache_home / "wechat_url_get" / cls.FILE_NAME)
+
+    def _connect(self):
+        """首次使用时再打开数据库（调用方需持有锁）"""
+        if self._conn is None:
+            import sqlite3
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    key TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON articles(accessed_at)")
+            self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM articles").fetchone()[0]
+        return self._conn
+
+    @staticmethod
+    def normalize_url(url):
+        """规范化文章URL作为缓存键（见 UrlCanonicalizer）"""
+        return canonicalize_url(url)
+
+    def get(self, url):
+        """查询缓存，返回 {'text', 'etag', 'last_modified', 'fresh'} 或 None"""
+        import zlib
+        key = self.normalize_url(url)
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM articles WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE articles SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+        body, etag, last_modified, fetched_at = row
+        return {
+            'text': zlib.decompress(body).decode('utf-8'),
+            'etag': etag,
+            'last_modified': last_modified,
+            'fresh': time.time() - fetched_at < self.ttl
+        }
+
+    def put(self, url, text, etag=None, last_modified=None):
+        """写入缓存，超过大小上限时淘汰最久未访问的条目"""
+        import zlib
+        key = self.normalize_url(url)
+        body = zlib.compress(text.encode('utf-8'), 6)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            old = conn.execute("SELECT size FROM articles WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, len(body), etag, last_modified, now, now)
+            )
+            self._total += len(body) - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._evict(conn)
+            conn.commit()
+
+    def touch(self, url):
+        """条件请求返回304后刷新有效期"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE articles SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, self.normalize_url(url))
+            )
+            conn.commit()
+
+    def _evict(self, conn):
+        """按LRU淘汰到上限的90%以下（调用方需持有锁）"""
+        target = self.max_bytes * 0.9
+        rows = conn.execute("SELECT key, size FROM articles ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if self._total <= target:
+                break
+            conn.execute("DELETE FROM articles WHERE key = ?", (key,))
+            self._total -= size
+
+    def stats(self):
+        """缓存统计：条目数与压缩后总大小"""
+        with self._lock:
+            conn = self._connect()
+            count = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            return {'entries': count, 'bytes': self._total}
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM articles")
+            conn.commit()
+            self._total = 0
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+# ====================== 增量状态类 ======================
+class CrawlStateStore:
+    """按fakeid记录已抓取文章的高水位（最新update_time及该时刻的aid） ✧
+
+    增量模式下翻页遇到已见过的文章即停止，日常刷新通常只需请求一页列表。
+    """
+    def __init__(self, path="wechat_crawl_state.json"):
+        self.path = path
+        self._state = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """首次使用时读取状态文件（调用方需持有锁）"""
+        if self._state is None:
+            import json
+            self._state = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._state = json.load(f)
+                except (OSError, ValueError) as e:
+                    logging.warning(f"读取增量状态失败，将重新全量抓取: {str(e)}")
+        return self._state
+
+    def _save(self):
+        """原子写入状态文件（调用方需持有锁）"""
+        import json
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, fakeid):
+        """获取某账号的高水位，未抓取过返回None"""
+        with self._lock:
+            return self._load().get(fakeid)
+
+    def is_seen(self, mark, article):
+        """文章是否早于或等于高水位（即上次已抓取过）"""
+        if not mark:
+            return False
+        update_time = article.get('update_time', 0)
+        if update_time != mark['update_time']:
+            return update_time < mark['update_time']
+        return article.get('aid') in mark['aids']
+
+    def update(self, fakeid, articles):
+        """用本次抓取的文章推进高水位"""
+        if not articles:
+            return
+        newest = max(article.get('update_time', 0) for article in articles)
+        aids = [article.get('aid') for article in articles if article.get('update_time', 0) == newest]
+        with self._lock:
+            state = self._load()
+            mark = state.get(fakeid)
+            if mark and mark['update_time'] > newest:
+                return
+            if mark and mark['update_time'] == newest:
+                aids = sorted(set(aids) | set(mark['aids']))
+            state[fakeid] = {
+                'update_time': newest,
+                'aids': aids,
+                'crawled_at': int(time.time())
+            }
+            self._save()
+
+    def reset(self, fakeid=None):
+        """清除某账号（或全部）的高水位"""
+        with self._lock:
+            state = self._load()
+            if fakeid is None:
+                state.clear()
+            else:
+                state.pop(fakeid, None)
+            self._save()
+
+# ====================== 断点续抓类 ======================
+class CrawlJournal:
+    """断点续抓日志：只追加的JSON Lines，记录已完成的列表页、文章和账号 ✧
+
+    每完成一步追加一行，进程随时被打断也只会丢失正在进行的那一步；
+    以 resume=True 打开时读入已有日志，抓取时跳过其中已完成的部分，
+    长时间任务重启后只需几秒即可接着上次的进度继续。
+    """
+    SUFFIX = '.journal'  # 日志文件名 = 结果文件名 + 后缀
+    ARTICLE_FIELDS = ('title', 'link', 'update_time', 'aid')  # 列表页中续抓需要的字段
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self._listings = {}  # fakeid -> {'articles': [...], 'next_page': n, 'finished': bool, 'complete': bool}
+        self._done_links = set()  # 已写入结果的文章链接
+        self._done_accounts = set()  # 已全部完成的账号fakeid
+        self._targets = {}  # 批量任务项 -> 解析得到的账号
+        self._lock = threading.Lock()
+        if resume:
+            self._replay()
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8', buffering=1)
+
+    def _replay(self):
+        """读入已有日志（末尾写了一半的行直接忽略）"""
+        import json
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                event = entry.get('event')
+                if event == 'page':
+                    listing = self._listings.setdefault(
+                        entry['fakeid'], {'articles': [], 'next_page': 0, 'finished': False, 'complete': False}
+                    )
+                    listing['articles'].extend(entry['articles'])
+                    listing['next_page'] = entry['page'] + 1
+                    listing['finished'] = entry['finished']
+                    listing['complete'] = entry.get('complete', False)
+                elif event == 'article':
+                    self._done_links.add(entry['link'])
+                elif event == 'account':
+                    self._done_accounts.add(entry['fakeid'])
+                elif event == 'target':
+                    self._targets[entry['target']] = entry['account']
+
+    def _append(self, entry):
+        import json
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+
+    def get_listing(self, fakeid):
+        """已记录的文章列表进度，返回 (文章列表, 下一页页码, 是否已翻完, 是否完整)"""
+        listing = self._listings.get(fakeid)
+        if not listing:
+            return [], 0, False, False
+        return list(listing['articles']), listing['next_page'], listing['finished'], listing['complete']
+
+    def record_page(self, fakeid, page, articles, finished=False, complete=False):
+        """记录一页文章列表（finished表示不再翻页，complete表示列表完整，见 ArticleList）"""
+        articles = [{key: article.get(key) for key in self.ARTICLE_FIELDS} for article in articles]
+        self._append({'event': 'page', 'fakeid': fakeid, 'page': page, 'articles': articles,
+                      'finished': finished, 'complete': complete})
+
+    def pending(self, articles):
+        """过滤掉结果已写入的文章"""
+        return [article for article in articles if article['link'] not in self._done_links]
+
+    def record_article(self, link):
+        """记录一篇文章的结果已写入"""
+        self._done_links.add(link)
+        self._append({'event': 'article', 'link': link})
+
+    def is_account_done(self, fakeid):
+        """账号是否已全部完成"""
+        return fakeid in self._done_accounts
+
+    def record_account(self, fakeid):
+        """记录一个账号的全部文章已处理完"""
+        self._done_accounts.add(fakeid)
+        self._append({'event': 'account', 'fakeid': fakeid})
+
+    def get_target(self, target):
+        """批量任务项上次解析得到的账号，未解析过返回None"""
+        return self._targets.get(target)
+
+    def record_target(self, target, account):
+        """记录批量任务项解析得到的账号，续抓时不再重复搜索"""
+        account = {'fakeid': account['fakeid'], 'nickname': account['nickname']}
+        self._targets[target] = account
+        self._append({'event': 'target', 'target': target, 'account': account})
+
+    def close(self, finished=False):
+        """关闭日志；finished为True时任务已全部完成，删除日志文件"""
+        with self._lock:
+            self._file.close()
+        if finished:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+# ====================== 链接去重索引 ======================
+class LinkIndex:
+    """小程序链接去重索引（SQLite） ✧
+
+    每个规范化后的链接只存一行，记录首次出现时的原始链接、AppID、页面路径、首次/最后发现时间和出现次数，
+    来源文章单独存一张表；跨文章、跨账号、跨多次运行累积，
+    导出时每个链接只输出一次。
+    """
+    QUERY_CHUNK = 500  # 每条 IN (...) 查询的参数个数（旧版SQLite最多允许999个）
+
+    def __init__(self, path="wechat_link_index.db"):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """首次使用时再打开数据库（调用方需持有锁）"""
+        if self._conn is None:
+            import sqlite3
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS links (
+                    key TEXT PRIMARY KEY,
+                    link TEXT NOT NULL,
+                    appid TEXT,
+                    path TEXT,
+                    first_seen INTEGER NOT NULL,
+                    last_seen INTEGER NOT NULL,
+                    hits INTEGER NOT NULL,
+                    first_article TEXT
+                );
+                CREATE TABLE IF NOT EXISTS link_refs (
+                    key TEXT NOT NULL,
+                    article TEXT NOT NULL,
+                    account TEXT,
+                    PRIMARY KEY (key, article)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_links_appid ON links(appid);
+            """)
+            # 旧版索引没有path、first_article列；已有链接的首个来源文章无从得知，取来源文章中的一篇
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(links)")}
+            with self._conn:
+                if 'path' not in columns:
+                    self._conn.execute("ALTER TABLE links ADD COLUMN path TEXT")
+                if 'first_article' not in columns:
+                    self._conn.execute("ALTER TABLE links ADD COLUMN first_article TEXT")
+                    self._conn.execute(
+                        "UPDATE links SET first_article = (SELECT MIN(article) FROM link_refs r WHERE r.key = links.key)"
+                    )
+        return self._conn
+
+    @staticmethod
+    def link_key(link):
+        """链接的去重键（规范化后的链接）"""
+        return canonicalize_url(link)
+
+    def add(self, links, article=None, account=None):
+        """登记一篇文章中的链接，返回其中首次出现的链接（原始写法，保持原顺序）"""
+        if not links:
+            return []
+        now = int(time.time())
+        # 规范化链接作为去重键，同时保留首次出现的原始链接
+        keys = {}
+        for link in links:
+            keys.setdefault(self.link_key(link), link)
+        with self._lock:
+            conn = self._connect()
+            known = set()
+            key_list = list(keys)
+            for start in range(0, len(key_list), self.QUERY_CHUNK):
+                chunk = key_list[start:start + self.QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                known.update(row[0] for row in conn.execute(f"SELECT key FROM links WHERE key IN ({placeholders})", chunk))
+            new_links = [link for key, link in keys.items() if key not in known]
+            with conn:
+                # first_article 记录最早引用该链接的文章（此前的登记都没有来源文章时，取之后第一篇）
+                conn.executemany(
+                    "INSERT INTO links (key, link, appid, path, first_seen, last_seen, hits, first_article) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 1, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET last_seen = excluded.last_seen, hits = hits + 1, "
+                    "first_article = COALESCE(first_article, excluded.first_article)",
+                    [(key, link, *self._mini_program(key), now, now, article) for key, link in keys.items()]
+                )
+                if article:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO link_refs VALUES (?, ?, ?)",
+                        [(key, article, account) for key in keys]
+                    )
+        return new_links
+
+    @staticmethod
+    def _mini_program(link):
+        """从链接中提取小程序AppID和页面路径"""
+        appid, path = _CANONICALIZER.mini_program(link)
+        return appid or None, path or None
+
+    def add_record(self, record):
+        """登记一条文章结果记录，返回其中首次出现的链接"""
+        return self.add(record.get('mini_links'), record.get('link'), record.get('account'))
+
+    def iter_links(self):
+        """按首次发现时间逐个产出已索引的链接"""
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute("""
+                SELECT l.link, l.key, l.appid, l.path, l.first_seen, l.last_seen, l.hits, COUNT(r.article), l.first_article
+                FROM links l LEFT JOIN link_refs r ON r.key = l.key
+                GROUP BY l.key ORDER BY l.first_seen, l.rowid
+            """).fetchall()
+        for link, key, appid, path, first_seen, last_seen, hits, articles, first_article in rows:
+            yield {
+                'link': link, 'key': key, 'appid': appid or '', 'path': path or '',
+                'first_seen': first_seen, 'last_seen': last_seen,
+                'hits': hits, 'articles': articles, 'first_article': first_article or ''
+            }
+
+    def export(self, path):
+        """导出去重后的链接表（.jsonl为JSON Lines，其他扩展名为CSV），返回链接数"""
+        import json
+        count = 0
+        if _sink_format(path) == 'jsonl':
+            with open(path, 'w', encoding='utf-8') as f:
+                for entry in self.iter_links():
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                    count += 1
+            return count
+        
+        import csv
+        with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow([
+                '小程序链接', '规范化链接', 'AppID', '页面路径', '首次发现', '最后发现', '出现次数', '来源文章数', '首个来源文章'
+            ])
+            for entry in self.iter_links():
+                writer.writerow([
+                    entry['link'], entry['key'], entry['appid'], entry['path'],
+                    datetime.fromtimestamp(entry['first_seen']).strftime('%Y-%m-%d %H:%M'),
+                    datetime.fromtimestamp(entry['last_seen']).strftime('%Y-%m-%d %H:%M'),
+                    entry['hits'], entry['articles'], entry['first_article']
+                ])
+                count += 1
+        return count
+
+    def stats(self):
+        """索引统计：链接数、AppID数和累计出现次数"""
+        with self._lock:
+            conn = self._connect()
+            links, appids, hits = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT appid), COALESCE(SUM(hits), 0) FROM links"
+            ).fetchone()
+            return {'links': links, 'appids': appids, 'hits': hits}
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+# ====================== 结果输出类 ======================
+class ResultSink:
+    """结果输出基类：逐条写入、边抓边落盘，中断时已写入的部分不会丢失 (◍•ᴗ•◍)"""
+    def __init__(self, path, append=False, flush_every=1):
+        self.path = path
+        self.append = append  # 追加到已有文件（断点续抓时使用）
+        self.flush_every = flush_every  # 每写入多少条落盘一次
+        self.count = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._open()
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _write(self, record):
+        raise NotImplementedError
+
+    def _flush(self):
+        raise NotImplementedError
+
+    def _close(self):
+        raise NotImplementedError
+
+    def write(self, record):
+        """写入一条结果（线程安全）"""
+        with self._lock:
+            self._write(record)
+            self.count += 1
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._flush()
+                self._pending = 0
+
+    def flush(self):
+        """立即落盘"""
+        with self._lock:
+            self._flush()
+            self._pending = 0
+
+    def close(self):
+        """落盘并关闭文件"""
+        with self._lock:
+            self._flush()
+            self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class CsvSink(ResultSink):
+    """CSV输出（Excel可直接打开）"""
+    ARTICLE_HEADERS = ['文章标题', '公众号', '发布时间', '文章链接', '小程序链接']
+    MINIPROGRAM_HEADERS = ['小程序名称', 'AppID', '描述', '访问链接']
+
+    def _open(self):
+        import csv
+        has_content = self.append and os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        self._file = open(self.path, 'a' if self.append else 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.writer(self._file)
+        self._header_written = has_content
+
+    def _write(self, record):
+        is_article = record['type'] == 'article'
+        if not self._header_written:
+            self._writer.writerow(self.ARTICLE_HEADERS if is_article else self.MINIPROGRAM_HEADERS)
+            self._header_written = True
+        if is_article:
+            mini_links = '\n'.join(record['mini_links']) if record['mini_links'] else ""
+            self._writer.writerow([
+                record['title'],
+                record['account'],
+                record['time'],
+                record['link'],
+                mini_links
+            ])
+        else:
+            self._writer.writerow([
+                record['name'],
+                record['appid'],
+                record['desc'],
+                record['link']
+            ])
+
+    def _flush(self):
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+class JsonlSink(ResultSink):
+    """JSON Lines输出（每行一条记录，保留完整的小程序链接列表）"""
+    def _open(self):
+        self._file = open(self.path, 'a' if self.append else 'w', encoding='utf-8')
+
+    def _write(self, record):
+        import json
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def _flush(self):
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+class SqliteSink(ResultSink):
+    """SQLite输出（适合大批量结果的后续查询）"""
+    def _open(self):
+        import sqlite3
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        if not self.append:
+            self._conn.execute("DROP TABLE IF EXISTS results")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                type TEXT, title TEXT, account TEXT, time TEXT, link TEXT,
+                mini_links TEXT, name TEXT, appid TEXT, desc TEXT
+            )
+        """)
+
+    def _write(self, record):
+        import json
+        self._conn.execute(
+            "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                record['type'], record.get('title'), record.get('account'), record.get('time'),
+                record.get('link'), json.dumps(record.get('mini_links', []), ensure_ascii=False),
+                record.get('name'), record.get('appid'), record.get('desc')
+            )
+        )
+
+    def _flush(self):
+        self._conn.commit()
+
+    def _close(self):
+        self._conn.close()
+
+class ParquetSink(ResultSink):
+    """Parquet输出（列式压缩，适合pandas/Spark等分析工具；需要pyarrow）
+
+    结果先在内存中攒成行组，每 flush_every 条写入一个行组；Parquet文件不支持追加。
+    """
+    FIELDS = ('type', 'title', 'account', 'time', 'link', 'mini_links', 'name', 'appid', 'desc')
+
+    def __init__(self, path, append=False, flush_every=10000):
+        if append:
+            raise ValueError("Parquet文件不支持追加写入")
+        super().__init__(path, append, flush_every)
+
+    def _open(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("导出Parquet需要安装pyarrow: pip install pyarrow")
+        self._pa = pa
+        self._schema = pa.schema([
+            (field, pa.list_(pa.string()) if field == 'mini_links' else pa.string())
+            for field in self.FIELDS
+        ])
+        self._writer = pq.ParquetWriter(self.path, self._schema, compression='zstd')
+        self._columns = {field: [] for field in self.FIELDS}
+
+    def _write(self, record):
+        for field, column in self._columns.items():
+            value = record.get(field)
+            column.append(list(value or []) if field == 'mini_links' else value)
+
+    def _flush(self):
+        if not self._columns['type']:
+            return
+        table = self._pa.Table.from_pydict(self._columns, schema=self._schema)
+        self._writer.write_table(table)
+        self._columns = {field: [] for field in self.FIELDS}
+
+    def _close(self):
+        self._writer.close()
+
+SINK_TYPES = {
+    'csv': CsvSink,
+    'jsonl': JsonlSink,
+    'sqlite': SqliteSink,
+    'parquet': ParquetSink
+}
+
+def _sink_format(path):
+    """按扩展名判断结果文件格式"""
+    ext = os.path.splitext(path)[1].lower()
+    return {
+        '.jsonl': 'jsonl', '.json': 'jsonl', '.db': 'sqlite', '.sqlite': 'sqlite', '.parquet': 'parquet'
+    }.get(ext, 'csv')
+
+def open_sink(path, fmt=None, append=False):
+    """按格式（默认按扩展名判断）打开结果输出"""
+    fmt = fmt or _sink_format(path)
+    if fmt not in SINK_TYPES:
+        raise ValueError(f"不支持的输出格式: {fmt}（可选: {', '.join(SINK_TYPES)}）")
+    return SINK_TYPES[fmt](path, append=append)
+
+def read_records(path, fmt=None):
+    """逐条读回结果文件中的记录（与各输出格式写入的字段一致）"""
+    import json
+    fmt = fmt or _sink_format(path)
+    if fmt == 'jsonl':
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif fmt == 'sqlite':
+        import sqlite3
+        conn = sqlite3.connect(path)
+        try:
+            for row in conn.execute(
+                "SELECT type, title, account, time, link, mini_links, name, appid, desc FROM results"
+            ):
+                if row[0] == 'article':
+                    yield {
+                        'type': 'article', 'title': row[1], 'link': row[4],
+                        'mini_links': json.loads(row[5] or '[]'), 'time': row[3], 'account': row[2]
+                    }
+                else:
+                    yield {'type': row[0], 'name': row[6], 'appid': row[7], 'desc': row[8], 'link': row[4]}
+        finally:
+            conn.close()
+    elif fmt == 'csv':
+        import csv
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            headers = next(reader, None)
+            is_article = headers == CsvSink.ARTICLE_HEADERS
+            for row in reader:
+                if is_article:
+                    yield {
+                        'type': 'article', 'title': row[0], 'link': row[3],
+                        'mini_links': row[4].split('\n') if row[4] else [], 'time': row[2], 'account': row[1]
+                    }
+                else:
+                    yield {'type': 'miniprogram', 'name': row[0], 'appid': row[1], 'desc': row[2], 'link': row[3]}
+    elif fmt == 'parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches():
+            for row in batch.to_pylist():
+                if row['type'] == 'article':
+                    yield {
+                        'type': 'article', 'title': row['title'], 'link': row['link'],
+                        'mini_links': row['mini_links'] or [], 'time': row['time'], 'account': row['account']
+                    }
+                else:
+                    yield {'type': row['type'], 'name': row['name'], 'appid': row['appid'],
+                           'desc': row['desc'], 'link': row['link']}
+    else:
+        raise ValueError(f"不支持的输入格式: {fmt}（可选: {', '.join(SINK_TYPES)}）")
+
+# ====================== 链接提取引擎 ======================
+class _LinkTokenizer(HTMLParser):
+    """流式HTML分词器：只收集<a href>与<script>文本，不构建DOM
+
+    与BeautifulSoup的html.parser后端使用同一个分词器，
+    因此识别出的标签、属性值（含实体解码）和脚本内容完全一致。
+    """
+    def __init__(self):
+        super().__init__()
+        self.hrefs = []
+        self.scripts = []
+        self._script = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            href = None
+            for name, value in attrs:
+                if name == 'href':  # 重复属性以最后一个为准
+                    href = value if value is not None else ''
+            if href is not None:
+                self.hrefs.append(href)
+        elif tag == 'script':
+            self._script = []
+
+    def handle_startendtag(self, tag, attrs):
+        # <script/> 自闭合时没有脚本内容
+        if tag == 'a':
+            self.handle_starttag(tag, attrs)
+
+    def handle_data(self, data):
+        if self._script is not None:
+            self._script.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == 'script' and self._script is not None:
+            if self._script:
+                self.scripts.append(''.join(self._script))
+            self._script = None
+
+class LinkMatcher:
+    """预编译的小程序链接匹配器 ✧
+
+    href只需判断是否含任一关键词，关键词合并为一个字面量交替正则；
+    脚本正则逐个预编译、逐个扫描：不同规则的匹配可能重叠（如整条链接和其中的 appid=...），
+    合并成一个命名分组交替的正则（bench-match 中的 alternation 行）每个位置只取第一个命中的分支，
+    会丢掉重叠的部分，规则里的编号反向引用也会错位；它省下的只是匹配阶段的一小部分，
+    相对整页分词的耗时可以忽略。
+    同样的规则只编译一次，各提取器共享。
+    """
+    DEFAULT_KEYWORDS = ('miniprogram', 'wxurl', 'weapp', 'appmsg')
+    DEFAULT_SCRIPT_PATTERNS = (
+        r'https?://[^\s"\']+?miniprogram[^\s"\']*',
+        r'https?://[^\s"\']+?weixin\.qq\.com/[^\s"\']+?appid[^\s"\']*'
+    )
+    _compiled = {}  # (关键词, 脚本正则) -> LinkMatcher
+    _lock = threading.Lock()
+
+    def __init__(self, keywords=None, script_patterns=None):
+        self.keywords = tuple(keywords) if keywords else self.DEFAULT_KEYWORDS
+        self.script_patterns = tuple(script_patterns) if script_patterns else self.DEFAULT_SCRIPT_PATTERNS
+        self._search_href = re.compile('|'.join(re.escape(k) for k in self.keywords)).search
+        self._script_finders = [re.compile(p).finditer for p in self.script_patterns]
+
+    @classmethod
+    def get(cls, keywords=None, script_patterns=None):
+        """按规则取共享的已编译匹配器"""
+        key = (tuple(keywords or ()), tuple(script_patterns or ()))
+        with cls._lock:
+            matcher = cls._compiled.get(key)
+            if matcher is None:
+                matcher = cls._compiled[key] = cls(keywords, script_patterns)
+            return matcher
+
+    @property
+    def spec(self):
+        """可序列化的规则（传给解析进程重建匹配器）"""
+        return self.keywords, self.script_patterns
+
+    def match_hrefs(self, hrefs):
+        """产出含关键词的href"""
+        search = self._search_href
+        return (href for href in hrefs if search(href))
+
+    def find_links(self, script):
+        """按规则顺序产出脚本中各正则匹配到的链接（不同规则的匹配可以重叠）"""
+        return (match.group(0) for finditer in self._script_finders for match in finditer(script))
+
+class LinkExtractor:
+    """小程序链接提取引擎（可切换后端） ✧
+
+    - stream: 标准库流式分词，不构建DOM（默认，不依赖第三方库，与bs4使用同一个分词器）
+    - lxml:   lxml解析（需安装lxml，通常最快，但畸形HTML上的容错规则与原实现不同）
+    - bs4:    BeautifulSoup html.parser（与原实现相同的解析方式）
+    """
+    BACKENDS = ('stream', 'lxml', 'bs4')
+
+    def __init__(self, backend='auto', matcher=None, rules=None):
+        if backend == 'auto':
+            backend = 'stream'
+        if backend not in self.BACKENDS:
+            raise ValueError(f"未知的提取引擎: {backend}（可选: {', '.join(self.BACKENDS)}）")
+        if backend not in self.available_backends():
+            logging.warning(f"提取引擎 {backend} 所需的库未安装，改用 stream")
+            backend = 'stream'
+        self.backend = backend
+        self._matcher = matcher or LinkMatcher.get()
+        self.rules = rules  # ExtractionRules：规则文件中的规则集优先，文件修改后由其后台线程热加载
+        if rules is not None:
+            rules.start_watcher()  # 现在就开始首次载入和耗时检查，不等到解析第一页时
+        self._parse = getattr(self, f"_parse_{backend}")
+
+    @property
+    def matcher(self):
+        """当前生效的匹配器（规则文件首次载入完成前为内置/配置的匹配器）"""
+        if self.rules is not None:
+            return self.rules.current() or self._matcher
+        return self._matcher
+
+    @staticmethod
+    def available_backends():
+        """当前环境可用的提取引擎"""
+        import importlib.util
+        backends = ['stream']
+        if importlib.util.find_spec('lxml') is not None:
+            backends.append('lxml')
+        if importlib.util.find_spec('bs4') is not None:
+            backends.append('bs4')
+        return backends
+
+    def extract(self, html):
+        """从文章HTML中提取小程序链接（按规范化链接去重，保留首次出现的写法）
+
+        与原实现（baseline_extract_links）有意不同的地方，均来自链接规范化：
+        - 同一链接的不同写法（参数顺序、http/https、#rd 等）按规范化链接合并，只保留第一个
+        - 链接中的 &amp; 实体和 \\/ 转义被还原
+        - weixin:// 等非http链接原样保留（原实现会在前面拼上 https://mp.weixin.qq.com）
+        不做这些处理、与原实现结果一致的提取见 extract_raw。
+        """
+        hrefs, script_links = self._matches(html)
+        mini_links = {}  # 规范化链接 -> 原始链接（按首次出现顺序）
+        for link in itertools.chain(hrefs, script_links):
+            mini_links.setdefault(canonicalize_url(link), _CANONICALIZER.resolve(link))
+        return list(mini_links.values())
+
+    def extract_raw(self, html):
+        """按原实现的方式提取：href只补全为绝对链接，脚本中的匹配原样保留
+
+        默认规则下得到的链接集合与 baseline_extract_links 相同，用于校验各提取引擎。
+        """
+        hrefs, script_links = self._matches(html)
+        mini_links = dict.fromkeys(self._absolute_href(href) for href in hrefs)
+        mini_links.update(dict.fromkeys(script_links))
+        return list(mini_links)
+
+    def _matches(self, html):
+        """分词并匹配，返回 (含关键词的href, 脚本中匹配到的链接)"""
+        hrefs, scripts = self._parse(html)
+        matcher = self.matcher
+        return matcher.match_hrefs(hrefs), (link for script in scripts for link in matcher.find_links(script))
+
+    @staticmethod
+    def _absolute_href(href):
+        """原实现补全href的方式"""
+        if href.startswith('//'):
+            return f"https:{href}"
+        if not href.startswith('http'):
+            return f"https://mp.weixin.qq.com{href}"
+        return href
+
+    @staticmethod
+    def _parse_stream(html):
+        tokenizer = _LinkTokenizer()
+        tokenizer.feed(html)
+        tokenizer.close()
+        return tokenizer.hrefs, tokenizer.scripts
+
+    @staticmethod
+    def _parse_lxml(html):
+        from lxml import etree, html as lxml_html
+        try:
+            parser = lxml_html.HTMLParser(encoding='utf-8')
+            doc = lxml_html.document_fromstring(html.encode('utf-8'), parser=parser)
+        except etree.ParserError:
+            return [], []
+        hrefs = [a.get('href') for a in doc.iter('a') if a.get('href') is not None]
+        scripts = [script.text for script in doc.iter('script') if script.text]
+        return hrefs, scripts
+
+    @staticmethod
+    def _parse_bs4(html):
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, 'html.parser')
+        hrefs = [link['href'] for link in soup.find_all('a', href=True)]
+        scripts = [str(script.string) for script in soup.find_all('script') if script.string]
+        return hrefs, scripts
+
+def baseline_extract_links(html):
+    """原实现（WeChatAPICrawler.extract_mini_links）的提取逻辑，原样保留作为对照基准"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    mini_links = set()
+    
+    # 提取<a>标签中的小程序链接
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        if any(key in href for key in ['miniprogram', 'wxurl', 'weapp', 'appmsg']):
+            if href.startswith('//'):
+                href = f"https:{href}"
+            elif not href.startswith('http'):
+                href = f"https://mp.weixin.qq.com{href}"
+            mini_links.add(href)
+    
+    # 提取脚本中的链接
+    script_tags = soup.find_all('script')
+    for script in script_tags:
+        if script.string:
+            patterns = [
+                r'https?://[^\s"\']+?miniprogram[^\s"\']*',
+                r'https?://[^\s"\']+?weixin\.qq\.com/[^\s"\']+?appid[^\s"\']*'
+            ]
+            for pattern in patterns:
+                matches = re.findall(pattern, str(script.string))
+                for match in matches:
+                    mini_links.add(match)
+    
+    return list(mini_links)
+
+_PARSE_EXTRACTORS = {}  # 解析进程内按引擎和规则缓存的提取器
+
+def parse_article_html(html, backend='auto', spec=None):
+    """提取一篇文章HTML中的小程序链接（供解析进程池调用）
+
+    必须是模块级函数，子进程才能按名称导入；提取器在每个进程内只创建一次。
+    spec为 LinkMatcher.spec（关键词, 脚本正则），为空时使用默认规则。
+    """
+    extractor = _PARSE_EXTRACTORS.get((backend, spec))
+    if extractor is None:
+        matcher = LinkMatcher.get(*spec) if spec else None
+        extractor = _PARSE_EXTRACTORS[(backend, spec)] = LinkExtractor(backend, matcher)
+    return extractor.extract(html)
+
+def load_corpus(corpus):
+    """读取语料：.html文件或目录列表"""
+    from pathlib import Path
+    files = []
+    for item in corpus:
+        path = Path(item)
+        files.extend(sorted(path.glob('*.htm*')) if path.is_dir() else [path])
+    pages = [f.read_text(encoding='utf-8', errors='replace') for f in files]
+    if not pages:
+        raise ValueError("语料为空，请提供保存的文章HTML文件或目录")
+    return pages
+
+def benchmark_extractors(corpus, backends=None, repeat=3):
+    """在保存的文章页面语料上比较各提取引擎的耗时与结果一致性
+
+    corpus为.html文件或目录列表；计时的是 extract（含链接规范化），一致性以原实现
+    （baseline_extract_links，需安装bs4）的结果为基准，统计 extract_raw 链接集合不同的页面数。
+    返回每个引擎一行：{'backend', 'pages', 'ms_per_page', 'mismatches'}；
+    安装了bs4时第一行是原实现本身（backend为'baseline'）。
+    """
+    pages = load_corpus(corpus)
+    
+    available = LinkExtractor.available_backends()
+    backends = [b for b in (backends or LinkExtractor.BACKENDS) if b in available]
+    reference = None
+    if 'bs4' in available:
+        reference = [set(baseline_extract_links(page)) for page in pages]
+    
+    rows = []
+    runs = [('baseline', baseline_extract_links, None)] if reference is not None else []
+    for backend in backends:
+        extractor = LinkExtractor(backend)
+        runs.append((backend, extractor.extract, extractor.extract_raw))
+    for backend, extract, extract_raw in runs:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for page in pages:
+                extract(page)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        mismatches = None
+        if reference is not None:
+            outputs = [extract_raw(page) for page in pages] if extract_raw else reference
+            mismatches = sum(1 for out, ref in zip(outputs, reference) if set(out) != ref)
+        rows.append({
+            'backend': backend,
+            'pages': len(pages),
+            'ms_per_page': best / len(pages) * 1000,
+            'mismatches': mismatches
+        })
+    return rows
+
+def benchmark_matchers(corpus, matcher=None, repeat=3):
+    """在保存的文章页面上校验 LinkMatcher 与逐关键词/逐正则匹配的结果一致，并记录耗时
+
+    页面只分词一次，只计匹配阶段的耗时；以逐个匹配的结果为基准统计不一致的页面数。
+    alternation 为各脚本正则合并成一个命名分组交替正则、每段脚本只扫描一次的做法，
+    仅作对照（重叠的匹配会丢失，见 LinkMatcher）；规则无法合并时不输出这一行。
+    耗时差别取决于页面和规则，结果只反映所给页面。
+    返回 per-pattern、alternation、matcher 各一行：{'matcher', 'pages', 'ms_per_page', 'mismatches'}
+    """
+    matcher = matcher or LinkMatcher.get()
+    parsed = [LinkExtractor._parse_stream(page) for page in load_corpus(corpus)]
+    keywords = matcher.keywords
+    patterns = [re.compile(p) for p in matcher.script_patterns]
+    try:
+        combined = re.compile('|'.join(f'(?P<p{i}>{p})' for i, p in enumerate(matcher.script_patterns)))
+    except re.error:
+        combined = None
+    
+    def per_pattern(hrefs, scripts):
+        links = {href for href in hrefs if any(key in href for key in keywords)}
+        for script in scripts:
+            for pattern in patterns:
+                links.update(m.group(0) for m in pattern.finditer(script))
+        return links
+    
+    def alternation(hrefs, scripts):
+        links = set(matcher.match_hrefs(hrefs))
+        for script in scripts:
+            links.update(m.group(0) for m in combined.finditer(script))
+        return links
+    
+    def with_matcher(hrefs, scripts):
+        links = set(matcher.match_hrefs(hrefs))
+        for script in scripts:
+            links.update(matcher.find_links(script))
+        return links
+    
+    candidates = [('per-pattern', per_pattern), ('alternation', alternation), ('matcher', with_matcher)]
+    if combined is None:
+        del candidates[1]
+    rows = []
+    reference = None
+    for name, match in candidates:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            outputs = [match(hrefs, scripts) for hrefs, scripts in parsed]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        if reference is None:
+            reference = outputs
+        rows.append({
+            'matcher': name,
+            'pages': len(parsed),
+            'ms_per_page': best / len(parsed) * 1000,
+            'mismatches': sum(1 for out, ref in zip(outputs, reference) if out != ref)
+        })
+    return rows
+
+# ====================== 提取规则集 ======================
+class ExtractionRules:
+    """小程序链接提取规则集（JSON/YAML规则文件，可热加载） ✧
+
+    规则文件示例（.json；.yaml/.yml 结构相同，需安装PyYAML）:
+        {
+          "schema": 1,
+          "version": "2024.06.01",
+          "keywords": ["miniprogram", "wxurl", "weapp", "appmsg"],
+          "script_patterns": [
+            {"name": "miniprogram", "pattern": "https?://[^\\s\"']+?miniprogram[^\\s\"']*"}
+          ],
+          "max_cost_ratio": 3.0
+        }
+
+    载入时编译并做耗时检查（见 check_cost），不通过的规则集被拒绝。
+    后台线程（LinkExtractor 创建时启动）载入规则文件，之后定期检查文件修改并重新载入，
+    耗时检查都交给该线程持有的同一个检查子进程；抓取线程取规则只是读一个属性，从不等待。
+    首次载入完成前、新规则无效或超出耗时上限时继续使用上一版（从未载入成功则用内置规则）；
+    需要从第一页起就用规则文件时，在抓取开始前调用 wait_ready。
+    """
+    SCHEMA = 1
+    DEFAULT_COST_RATIO = 3.0
+    CHECK_INTERVAL = 2.0  # 后台线程检查文件修改时间的间隔（秒）
+    COST_TIMEOUT = 10.0  # 样例页面耗时检查的时限（秒）
+    PATTERN_TIMEOUT = 2.0  # 单个脚本正则在构造的长输入上的时限（秒）
+    ADVERSARIAL_MIN_MS = 50.0  # 长输入耗时上限的下限（内置规则只需几毫秒）
+
+    def __init__(self, path, check_interval=CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self.version = None
+        self._matcher = None
+        self._mtime = -1  # 尚未检查过
+        self._ready = threading.Event()  # 首次载入已完成（无论成败）
+        self._stop = threading.Event()
+        self._watcher = None
+        self._checker = None  # 后台线程运行期间复用的耗时检查子进程
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def builtin_rules():
+        """内置规则（与 LinkMatcher 默认规则相同），可作为规则文件模板"""
+        return {
+            'schema': ExtractionRules.SCHEMA,
+            'version': 'builtin',
+            'keywords': list(LinkMatcher.DEFAULT_KEYWORDS),
+            'script_patterns': [{'name': f"pattern{i + 1}", 'pattern': p}
+                                for i, p in enumerate(LinkMatcher.DEFAULT_SCRIPT_PATTERNS)],
+            'max_cost_ratio': ExtractionRules.DEFAULT_COST_RATIO
+        }
+
+    def read(self):
+        """读取规则文件为字典"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        if self.path.lower().endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise Exception("YAML规则文件需要PyYAML，请运行 pip install pyyaml 或改用JSON")
+            rules = yaml.safe_load(text)
+        else:
+            import json
+            rules = json.loads(text)
+        if not isinstance(rules, dict):
+            raise Exception("规则文件顶层必须是对象")
+        return rules
+
+    @classmethod
+    def compile(cls, rules):
+        """校验并编译规则字典，返回 LinkMatcher"""
+        schema = rules.get('schema', cls.SCHEMA)
+        if schema != cls.SCHEMA:
+            raise Exception(f"不支持的规则格式版本: {schema}（当前支持 {cls.SCHEMA}）")
+        keywords = rules.get('keywords') or []
+        if not all(isinstance(k, str) and k for k in keywords):
+            raise Exception("keywords 必须是非空字符串列表")
+        patterns = []
+        for item in rules.get('script_patterns') or []:
+            pattern = item.get('pattern') if isinstance(item, dict) else item
+            name = item.get('name', pattern) if isinstance(item, dict) else pattern
+            try:
+                re.compile(pattern)
+            except (re.error, TypeError) as e:
+                raise Exception(f"脚本正则 {name} 无效: {str(e)}")
+            patterns.append(pattern)
+        if not keywords or not patterns:
+            raise Exception("规则集至少需要一个关键词和一个脚本正则")
+        return LinkMatcher.get(keywords, patterns)
+
+    @staticmethod
+    def sample_pages():
+        """耗时检查用的样例页面（按公众号文章的典型链接与脚本规模构造）"""
+        hrefs = []
+        for i in range(300):
+            if i % 10 == 0:
+                hrefs.append(f"/mp/waerrpage?appid=wx{i:016x}&type=weapp&path=pages%2Findex%3Fid%3D{i}")
+            else:
+                hrefs.append(f"https://mp.weixin.qq.com/s?__biz=MzA{i:05d}==&mid={i}&idx=1&sn={i:032x}&scene=21#wechat_redirect")
+        script = '\n'.join(
+            f'var item{i} = {{"url": "https://mp.weixin.qq.com/mp/{"miniprogram" if i % 8 == 0 else "appmsg"}'
+            f'?appid=wx{i:016x}&path=pages%2Fitem", "title": "第{i}条 标题文字", "cover": "https://mmbiz.qpic.cn/{i:040x}/0"}};'
+            for i in range(200)
+        )
+        return [(hrefs, [script])]
+
+    @staticmethod
+    def adversarial_inputs(length=4096):
+        """回溯检查用的长输入：同一字符的长串（可带链接前缀），结尾没有引号等结束符或跟一个无法匹配的字符"""
+        return [
+            prefix + char * length + tail
+            for prefix in ('', 'https://', 'https://mp.weixin.qq.com/')
+            for char in 'a0/%=&.-_ "\''
+            for tail in ('', '\x00')
+        ]
+
+    @staticmethod
+    def cost(matchers, pages, repeat=5):
+        """各匹配器在已分词页面上的单页匹配耗时（毫秒，交替测量、取多次中最快一次）"""
+        best = [None] * len(matchers)
+        for _ in range(repeat):
+            for i, matcher in enumerate(matchers):
+                start = time.perf_counter()
+                for hrefs, scripts in pages:
+                    for _ in matcher.match_hrefs(hrefs):
+                        pass
+                    for script in scripts:
+                        for _ in matcher.find_links(script):
+                            pass
+                elapsed = time.perf_counter() - start
+                best[i] = elapsed if best[i] is None else min(best[i], elapsed)
+        return [elapsed / len(pages) * 1000 for elapsed in best]
+
+    @classmethod
+    def check_cost(cls, matcher, max_ratio=DEFAULT_COST_RATIO, pages=None, timeout=COST_TIMEOUT,
+                   pattern_timeout=PATTERN_TIMEOUT, checker=None):
+        """检查规则集的匹配耗时，返回样例页面上的 (规则集ms, 内置规则ms, 倍数)；不通过时抛出异常
+
+        - 样例页面上的单页匹配耗时不超过内置规则的 max_ratio 倍
+        - 每个脚本正则在构造的长输入（见 adversarial_inputs）上逐个限时测量，超时或耗时超过
+          内置规则最慢正则的 max_ratio 倍（至少 ADVERSARIAL_MIN_MS）的正则被拒绝；
+          样例页面测不出回溯，(a+)+$ 这类正则只有在长串上才会失控
+
+        都在独立子进程中测量：灾难性回溯的正则会一直占住解释器，只能超时后结束子进程。
+        checker 为复用的检查子进程（见 _RuleCostChecker）；不传时临时启动一个，检查完即结束。
+        """
+        import multiprocessing
+        own_checker = checker is None
+        checker = checker or _RuleCostChecker()
+        try:
+            try:
+                cost, baseline = checker.run(_measure_rule_cost, (matcher.spec, pages), timeout)
+            except multiprocessing.TimeoutError:
+                raise Exception(f"规则集在样例页面上 {timeout:g} 秒内未完成匹配（正则可能存在灾难性回溯）")
+            ratio = cost / baseline if baseline else 1.0
+            if ratio > max_ratio:
+                raise Exception(f"规则集单页匹配耗时 {cost:.3f}ms，是内置规则的 {ratio:.1f} 倍（上限 {max_ratio:g} 倍）")
+            
+            builtin = checker.run(_measure_patterns, (LinkMatcher.DEFAULT_SCRIPT_PATTERNS,), timeout)
+            limit = max(max(builtin) * max_ratio, cls.ADVERSARIAL_MIN_MS)
+            for pattern in matcher.script_patterns:
+                try:
+                    elapsed, = checker.run(_measure_patterns, ((pattern,),), pattern_timeout)
+                except multiprocessing.TimeoutError:
+                    raise Exception(f"脚本正则 {pattern} 在构造的长输入上 {pattern_timeout:g} 秒内未完成匹配（存在灾难性回溯）")
+                if elapsed > limit:
+                    raise Exception(f"脚本正则 {pattern} 在构造的长输入上耗时 {elapsed:.0f}ms（上限 {limit:.0f}ms），存在过度回溯")
+        finally:
+            if own_checker:
+                checker.close()
+        return cost, baseline, ratio
+
+    def load(self):
+        """读取、编译并检查规则文件，成功后替换当前规则集"""
+        mtime = self._file_mtime()
+        rules = self.read()
+        matcher = self.compile(rules)
+        self.check_cost(matcher, float(rules.get('max_cost_ratio', self.DEFAULT_COST_RATIO)), checker=self._checker)
+        self._matcher = matcher
+        self._mtime = mtime
+        self.version = str(rules.get('version', ''))
+        logging.info(f"已载入提取规则 {self.path}（版本 {self.version or '-'}）")
+        return matcher
+
+    def current(self):
+        """取当前规则集（不检查文件、不等待）；首次载入完成前或从未载入成功时返回None"""
+        if self._watcher is None:
+            self.start_watcher()
+        return self._matcher
+
+    def wait_ready(self, timeout=None):
+        """启动后台线程并等待首次载入完成（无论成败），返回是否已完成"""
+        self.start_watcher()
+        return self._ready.wait(timeout)
+
+    def start_watcher(self):
+        """启动后台线程：立即载入规则文件，之后每 check_interval 秒检查一次文件修改"""
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch, name='rules-watcher', daemon=True)
+                self._watcher.start()
+
+    def stop_watcher(self):
+        """停止后台检查线程（当前规则集保持不变）"""
+        self._stop.set()
+
+    def _watch(self):
+        self._checker = _RuleCostChecker()
+        try:
+            while True:
+                try:
+                    self.refresh()
+                finally:
+                    self._ready.set()
+                if self._stop.wait(self.check_interval):
+                    return
+        finally:
+            checker, self._checker = self._checker, None
+            checker.close()
+
+    def refresh(self):
+        """文件有修改时重新载入（失败时保留当前规则集），返回当前规则集"""
+        mtime = self._file_mtime()
+        if mtime != self._mtime:
+            self._mtime = mtime  # 同一版文件只尝试载入一次，失败也不反复报错
+            try:
+                self.load()
+            except Exception as e:
+                fallback = '上一版' if self._matcher else '内置'
+                logging.warning(f"载入提取规则失败，继续使用{fallback}规则: {str(e)}")
+        return self._matcher
+
+    def _file_mtime(self):
+        """规则文件的修改时间，文件不存在时为None"""
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+class _RuleCostChecker:
+    """规则耗时检查用的子进程（spawn启动，首次使用时创建，之后一直复用）
+
+    每次检查都新开进程要付出数秒的解释器启动和导入开销；测量超时时子进程卡在失控的
+    正则里，只能结束它，下次使用时再重建。
+    """
+    def __init__(self):
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def run(self, func, args, timeout):
+        """在子进程中执行 func(*args)，超过 timeout 秒抛出 multiprocessing.TimeoutError"""
+        import multiprocessing
+        with self._lock:
+            if self._pool is None:
+                self._pool = multiprocessing.get_context('spawn').Pool(1)
+            try:
+                return self._pool.apply_async(func, args).get(timeout)
+            except multiprocessing.TimeoutError:
+                self._terminate()
+                raise
+
+    def _terminate(self):
+        """结束子进程（调用方需持有锁）"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def close(self):
+        """结束子进程"""
+        with self._lock:
+            self._terminate()
+
+def _measure_rule_cost(spec, pages=None):
+    """（在耗时检查子进程中运行）返回 (规则集单页ms, 内置规则单页ms)"""
+    pages = pages or ExtractionRules.sample_pages()
+    return ExtractionRules.cost([LinkMatcher.get(*spec), LinkMatcher.get()], pages)
+
+def _measure_patterns(patterns):
+    """（在耗时检查子进程中运行）各脚本正则扫描全部回溯检查输入的耗时（毫秒）"""
+    texts = ExtractionRules.adversarial_inputs()
+    costs = []
+    for pattern in patterns:
+        finditer = re.compile(pattern).finditer
+        start = time.perf_counter()
+        for text in texts:
+            for _ in finditer(text):
+                pass
+        costs.append((time.perf_counter() - start) * 1000)
+    return costs
+
+# ====================== 爬虫核心类 ======================
+class ArticleList(list):
+    """get_all_articles 的返回值：文章列表，complete表示列表是否完整获取
+
+    翻页中途失败（超过重试次数）时返回已获取的部分，complete为False；增量抓取在翻到
+    上次的高水位或列表末尾之前就达到页数上限时也不完整（中间还有没取到的新文章）。
+    这样的列表不能用来推进增量高水位，否则没取到的文章以后再也不会被抓取。
+    """
+    def __init__(self, articles=(), complete=False):
+        super().__init__(articles)
+        self.complete = complete
+
+class _SearchHedge:
+    """一次对冲搜索的共享状态
+
+    sent 在主接口拿到限速令牌、真正发出请求后置位，对冲计时从这时才开始（否则SEARCH限速
+    的排队时间也会被算进去，备用接口几乎每次都会被启动）；settled 在拿到结果后置位，
+    还在排队等令牌的备用请求随即放弃，不再发出。sent 由调用方传入（threading.Event 或 asyncio.Event）。
+    """
+    def __init__(self, sent):
+        self.sent = sent
+        self.settled = False
+
+    def before_send(self):
+        """每次发出请求前调用，返回False表示已有结果、放弃本次请求"""
+        if self.settled:
+            return False
+        self.sent.set()
+        return True
+
+class BaseWeChatCrawler:
+    """同步/异步爬虫共用的部分 ✧
+
+    这里只放不做网络请求的逻辑：请求参数、响应解析、文章列表翻页判断、缓存读写、
+    结果记录构建和续抓日志/高水位的提交；WeChatAPICrawler 和 AsyncWeChatAPICrawler
+    只各自实现请求与并发调度。
+    """
+    RATE_LIMIT_RET = 200013  # 微信接口频率限制错误码
+    PARSE_INLINE_CHARS = 16 * 1024  # 小于此长度的页面直接解析，省去进程间传输
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36',
+        'Referer': 'https://mp.weixin.qq.com/',
+        'Accept-Language': 'zh-CN,zh;q=0.9',
+        'X-Requested-With': 'XMLHttpRequest'
+    }
+    # 依次尝试提取Token的页面
+    TOKEN_PAGES = [
+        "https://mp.weixin.qq.com/cgi-bin/home",
+        "https://mp.weixin.qq.com/cgi-bin/menu?t=menu/list&token=&lang=zh_CN",
+        "https://mp.weixin.qq.com/"
+    ]
+    SEARCH_PAGE_SIZE = 10  # 搜索接口每页条数
+    SEARCH_MAX_RESULTS = 50  # 分页搜索默认最多取回的结果数
+    # 公众号搜索接口（前者失败时使用后者）
+    SEARCH_BIZ_URLS = [
+        "https://mp.weixin.qq.com/cgi-bin/searchbiz",
+        "https://mp.weixin.qq.com/api/searchbiz"
+    ]
+    APPMSG_URL = "https://mp.weixin.qq.com/cgi-bin/appmsg"
+    SEARCH_MINI_URL = "https://mp.weixin.qq.com/wxa-api/search/wxaapp"
+
+    def __init__(self, config, rate_limiter=None):
+        self.metrics = CrawlMetrics()  # 请求耗时、下载量、解析耗时等抓取指标
+        self.headers = dict(self.HEADERS)
+        self.config = config  # 验证配置
+        self.cookies = {}
+        self.token = None
+        self.rate_limiter = rate_limiter or RateLimiter()  # 所有请求共享的请求预算（按接口类别）
+        self._executor_lock = threading.Lock()
+        self.max_retries = 3  # 限流/失败后的最大重试次数
+        self.search_hedge_delay = 1.0  # 搜索接口超过此秒数未返回时同时请求备用接口（None表示依次尝试）
+        self._search_url = None  # 本会话中上次返回结果的搜索接口
+        self.cache = None  # 文章页面磁盘缓存（默认不使用，由 set_cache 开启）
+        self.state_store = CrawlStateStore()  # 各账号已抓取文章的高水位
+        self.journal = None  # 断点续抓日志（None表示不记录）
+        self.extractor = LinkExtractor(  # 小程序链接提取引擎
+            config.extractor_backend, LinkMatcher.get(config.get_link_keywords_list()), config.load_rules()
+        )
+        self.parse_workers = 0  # HTML解析进程数（0表示不使用进程池）
+        self._parse_pool = None
+        self._parse_pool_ok = False  # 解析进程池是否成功返回过结果
+
+    def set_parse_workers(self, workers):
+        """设置HTML解析进程数（0表示不使用进程池）
+
+        解析和正则扫描是CPU密集的，在线程里执行会被GIL串行化；
+        交给进程池后，下载仍由本进程完成，解析可以用满多个核。
+        """
+        self.parse_workers = max(0, int(workers))
+        with self._executor_lock:
+            old_pool, self._parse_pool = self._parse_pool, None
+        if old_pool is not None:
+            old_pool.shutdown(wait=False)  # 已提交的解析任务仍会完成
+
+    def _get_parse_pool(self):
+        """获取解析进程池（首次使用时创建，未启用时返回None）"""
+        with self._executor_lock:
+            if self._parse_pool is None and self.parse_workers > 0:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                # spawn启动：子进程不会继承本进程正在运行的线程持有的锁
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=self.parse_workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._parse_pool
+
+    def _parse_pool_for(self, html):
+        """大页面使用的解析进程池（小页面或未启用进程池时返回None，直接解析）"""
+        return self._get_parse_pool() if len(html) >= self.PARSE_INLINE_CHARS else None
+
+    def _parse_pool_failed(self, pool, error):
+        """解析进程池损坏或已关闭时调用（本篇由调用方改在本进程内解析）
+
+        进程池用过之后才损坏（子进程被杀）时重建；从未成功返回过结果时多半是子进程根本无法启动
+        （如主模块缺少 if __name__ == '__main__' 保护、打包后缺少freeze_support），重建也无济于事，
+        本次运行不再使用进程池，并按错误级别记录，而不是每篇都悄悄回退。
+        """
+        self.metrics.parse_fallback()
+        reason = ' '.join(str(error).split()) or type(error).__name__
+        with self._executor_lock:
+            if self._parse_pool is pool:
+                self._parse_pool = None
+            if not self._parse_pool_ok:
+                self.parse_workers = 0
+        pool.shutdown(wait=False)
+        if self._parse_pool_ok:
+            logging.warning(f"解析进程池不可用，本篇在本进程内解析，之后重建进程池: {reason}")
+        else:
+            logging.error(f"解析进程池无法启动，本次运行改为在本进程内解析: {reason}")
+
+    def set_cache(self, path=None, max_bytes=None, ttl=None):
+        """设置文章缓存位置与参数（path为None时关闭缓存；默认位置见 ArticleCache.default_path）"""
+        if self.cache is not None:
+            self.cache.close()
+        if path is None:
+            self.cache = None
+            return
+        self.cache = ArticleCache(path)
+        if max_bytes is not None:
+            self.cache.max_bytes = max_bytes
+        if ttl is not None:
+            self.cache.ttl = ttl
+
+    def get_current_rates(self):
+        """获取各接口类别当前的自适应速率（请求/秒）"""
+        return self.rate_limiter.current_rates()
+
+    def validate_cookie_format(self, cookies):
+        """基于自定义规则验证Cookie格式"""
+        core_fields = self.config.get_core_fields_list()
+        session_fields = self.config.get_session_fields_list()
+        
+        # 验证核心字段
+        missing_core = [f for f in core_fields if f not in cookies]
+        if missing_core:
+            return False, f"缺少核心字段: {', '.join(missing_core)}（参考微信开放平台文档）"
+        
+        # 验证会话字段（至少存在一个）
+        has_session = any(f in cookies for f in session_fields)
+        if not has_session:
+            return False, f"缺少会话字段（至少需要一个）: {', '.join(session_fields)}"
+            
+        return True, "Cookie格式验证通过 ✧◝(⁰▿⁰)◜✧"
+
+    def _accept_cookies(self, cookies):
+        """解析并校验Cookie字符串，通过后存入 self.cookies，返回 (是否通过, 提示信息)"""
+        cookie_dict = {k.strip(): v.strip() for item in cookies.split(';') 
+                      for k, v in [item.split('=', 1)] if '=' in item}
+        
+        format_valid, format_msg = self.validate_cookie_format(cookie_dict)
+        if format_valid:
+            self.cookies = cookie_dict
+        return format_valid, format_msg
+
+    def _match_token(self, response):
+        """从Token页面的响应中提取Token：取到或Cookie失效时返回 (是否有效, 提示信息)，否则返回None"""
+        if "loginpage" in response.url:
+            return False, "Cookie无效或已过期，需重新登录"
+        
+        # 使用自定义正则提取Token
+        token_match = re.search(self.config.token_pattern, response.text)
+        if token_match:
+            self.token = token_match.group(1)
+            return True, f"Token自动提取成功: {self.token} ✨"
+        return None
+
+    @staticmethod
+    def _lookup_login(cookies, token, store):
+        """查询保存的登录态，返回 (Cookie, 手动指定的Token, 保存的Token, 保存的Token是否仍在有效期内)"""
+        cached_token, fresh = None, False
+        if store is not None:
+            cookies, cached_token, fresh = store.lookup(cookies)
+            if token and token == cached_token:
+                token = None  # 之前保存的Token按有效期处理，过期后重新验证
+            fresh = fresh and not token
+        return cookies, token, cached_token, fresh
+
+    def _require_token(self):
+        """Token未设置时抛出异常"""
+        if not self.token:
+            raise Exception("Token未设置，请先验证登录态")
+
+    @staticmethod
+    def search_biz_params(token, keyword, account_type='all', begin=0, count=10):
+        """公众号搜索接口的请求参数"""
+        # 账号类型映射（基于微信API文档）
+        type_map = {
+            'all': 0,       # 全部
+            'official': 1,  # 公众号
+            'service': 2,   # 服务号
+            'subscription': 3  # 订阅号
+        }
+        return {
+            'action': 'search_biz',
+            'token': token,
+            'lang': 'zh_CN',
+            'f': 'json',
+            'ajax': '1',
+            'query': keyword,
+            'begin': str(begin),
+            'count': str(count),
+            'type': type_map.get(account_type, 0)
+        }
+
+    @staticmethod
+    def search_mini_params(token, keyword, page=1, num=10):
+        """小程序搜索接口的请求参数（page从1开始）"""
+        return {
+            'action': 'search',
+            'token': token,
+            'lang': 'zh_CN',
+            'keyword': keyword,
+            'page': page,
+            'num': num
+        }
+
+    @staticmethod
+    def appmsg_params(token, fakeid, page):
+        """历史文章列表接口的请求参数（每页10篇，page从0开始）"""
+        return {
+            'action': 'list_ex',
+            'begin': str(page * 10),
+            'count': '10',
+            'fakeid': fakeid,
+            'type': '9',
+            'token': token,
+            'lang': 'zh_CN',
+            'f': 'json',
+            'ajax': '1'
+        }
+
+    def _ordered_search_urls(self):
+        """搜索接口列表（本会话中上次成功的排在最前）"""
+        if self._search_url in self.SEARCH_BIZ_URLS:
+            return [self._search_url] + [url for url in self.SEARCH_BIZ_URLS if url != self._search_url]
+        return list(self.SEARCH_BIZ_URLS)
+
+    def _api_error(self, data, required=False):
+        """接口返回的错误 (错误码, 错误信息)，成功时返回None
+
+        required为True时响应缺少 base_resp 也按失败处理（小程序搜索接口）。
+        """
+        base_resp = data.get('base_resp')
+        if base_resp is None and not required:
+            return None
+        ret = (base_resp or {}).get('ret', -1)
+        if ret == 0:
+            return None
+        self.metrics.api_error(ret)
+        return ret, (base_resp or {}).get('err_msg', '未知错误')
+
+    def _parse_search_biz(self, data):
+        """解析公众号搜索接口的响应，返回账号列表；触发频率限制时返回None（调用方退避后重试）"""
+        error = self._api_error(data)
+        if error:
+            ret, err_msg = error
+            if ret == self.RATE_LIMIT_RET:  # 频率限制：降速退避后重试
+                self.rate_limiter.report_rate_limited(RateLimiter.SEARCH)
+                return None
+            raise Exception(f"搜索失败: {err_msg}")
+        return data.get('list') or []
+
+    def _parse_miniprograms(self, data):
+        """解析小程序搜索接口的响应，返回小程序列表"""
+        error = self._api_error(data, required=True)
+        if error:
+            raise Exception(f"小程序搜索失败: {error[1]}")
+        return data.get('app_list', [])
+
+    def _start_listing(self, fakeid, incremental):
+        """开始获取文章列表，返回 (高水位, 已有文章, 下一页页码, 是否已翻完)（断点续抓时接着日志中的进度）"""
+        self._require_token()
+        mark = self.state_store.get(fakeid) if incremental else None
+        articles, page, finished, complete = self.journal.get_listing(fakeid) if self.journal else ([], 0, False, False)
+        if page and not finished:
+            logging.info(f"从第 {page+1} 页继续获取文章列表 (已有 {len(articles)} 篇)")
+        return mark, ArticleList(articles, complete), page, finished
+
+    def _listing_page(self, fakeid, page, data, mark, articles, max_pages, failures):
+        """处理一页文章列表响应，新文章追加到articles
+
+        返回True表示列表已翻完，False表示继续下一页，None表示触发频率限制、应重试当前页。
+        翻完时设置 articles.complete：翻到列表末尾或上次的高水位才算完整；
+        增量抓取在此之前达到max_pages时不完整，非增量抓取的范围本来就由max_pages限定。
+        """
+        error = self._api_error(data)
+        if error:
+            ret, err_msg = error
+            if ret == self.RATE_LIMIT_RET and failures < self.max_retries:
+                # 频率限制：降速退避后重试当前页
+                self.rate_limiter.report_rate_limited(RateLimiter.APPMSG)
+                return None
+            raise Exception(f"获取文章失败: {err_msg}")
+        
+        current_articles = data.get('app_msg_list', [])
+        if not current_articles:
+            articles.complete = True
+            if self.journal:
+                self.journal.record_page(fakeid, page, [], finished=True, complete=True)
+            return True
+        
+        new_articles = [a for a in current_articles if not self.state_store.is_seen(mark, a)]
+        articles.extend(new_articles)
+        logging.info(f"已获取第 {page+1} 页文章，共 {len(articles)} 篇")
+        
+        # 本页最后一篇已抓取过时，后面的页都是旧文章；只看第一篇旧文章不够，
+        # 置顶或顺序调整的旧文章可能出现在新文章前面
+        reached_mark = self.state_store.is_seen(mark, current_articles[-1])
+        complete = reached_mark or not data.get('has_more', 0) or (mark is None and page + 1 >= max_pages)
+        last_page = complete or page + 1 >= max_pages
+        if last_page:
+            articles.complete = complete
+            if not complete:
+                logging.warning(f"已达到最大页数 {max_pages}，仍未翻到上次抓取的位置，暂不推进增量高水位")
+        if self.journal:
+            self.journal.record_page(fakeid, page, new_articles, last_page, complete)
+        return last_page
+
+    def _listing_retry_delay(self, page, failures, error):
+        """列表页请求失败后的退避秒数（failures为本页已失败次数）；第一页失败直接抛出，超过重试次数返回None"""
+        logging.error(f"获取第 {page+1} 页文章失败: {str(error)}")
+        if page == 0:
+            raise error
+        if failures > self.max_retries:
+            return None
+        return AdaptiveThrottle.backoff_delay(failures)
+
+    def commit_crawl_state(self, fakeid, articles):
+        """文章处理完成后推进该账号的高水位，供下次增量抓取使用"""
+        try:
+            self.state_store.update(fakeid, articles)
+        except OSError as e:
+            logging.warning(f"保存增量状态失败: {str(e)}")
+
+    def _cached_article(self, article_url):
+        """查询文章缓存，返回 (缓存项, 未过期时的缓存HTML, 条件请求头)"""
+        entry = self.cache.get(article_url) if self.cache else None
+        if entry and entry['fresh']:
+            self.metrics.cache_result('hit')
+            return entry, entry['text'], None
+        
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return entry, None, headers
+
+    def _store_article(self, article_url, entry, response):
+        """处理文章页响应（304时沿用缓存），写入缓存并返回HTML"""
+        if response.status_code == 304 and entry:
+            self.metrics.cache_result('revalidated')
+            self.cache.touch(article_url)
+            return entry['text']
+        if self.cache:
+            self.metrics.cache_result('miss')
+        
+        # 只缓存正常的文章页（跳过404和验证码页）
+        if self.cache and response.status_code == 200 and 'captcha' not in response.url:
+            self.cache.put(
+                article_url, response.text,
+                response.headers.get('ETag'), response.headers.get('Last-Modified')
+            )
+        return response.text
+
+    @staticmethod
+    def _article_record(account_name, article, mini_links):
+        """构建一篇文章的结果记录"""
+        return {
+            'type': 'article',
+            'title': article.get('title', '无标题'),
+            'link': article['link'],
+            'mini_links': mini_links,
+            'time': datetime.fromtimestamp(article['update_time']).strftime('%Y-%m-%d %H:%M'),
+            'account': account_name
+        }
+
+    def finish_account(self, fakeid, articles, count, total, failed=()):
+        """账号处理结束时调用，返回账号是否已完成（count为已处理的文章数，含failed中提取失败的文章）
+
+        只有文章列表完整获取、全部处理完且每篇都提取成功时才推进高水位并把账号记入断点续抓日志；
+        否则下次增量抓取或续抓会重新处理这些文章。
+        """
+        if count < total:
+            return False  # 中途停止，下次重新抓取
+        if failed:
+            logging.warning(f"{len(failed)} 篇文章提取失败，暂不推进增量高水位，下次抓取时重试")
+            return False
+        if not getattr(articles, 'complete', True):
+            logging.warning("文章列表未完整获取，暂不推进增量高水位")
+            return False
+        self.commit_crawl_state(fakeid, articles)
+        if self.journal:
+            self.journal.record_account(fakeid)
+        return True
+
+    @staticmethod
+    def load_batch_targets(path):
+        """读取批量任务文件
+
+        每行一个公众号关键词；以 fakeid: 开头的行直接按fakeid抓取（可在其后空格加显示名称）；
+        空行和#开头的注释行忽略。
+        """
+        targets = []
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                if line.lower().startswith('fakeid:'):
+                    value, _, name = line[7:].strip().partition(' ')
+                    targets.append({'kind': 'fakeid', 'value': value, 'name': name.strip() or value})
+                else:
+                    targets.append({'kind': 'keyword', 'value': line})
+        return targets
+
+    def _known_target(self, target):
+        """不用搜索即可确定的批量任务账号（fakeid任务项或日志中已解析过的关键词），否则返回None"""
+        if target['kind'] == 'fakeid':
+            return {'fakeid': target['value'], 'nickname': target['name']}
+        return self.journal.get_target(target['value']) if self.journal else None
+
+    def _searched_target(self, target, accounts):
+        """关键词任务项取搜索结果第一个账号（记入日志，续抓时不再重复搜索），找不到返回None"""
+        if accounts and self.journal:
+            self.journal.record_target(target['value'], accounts[0])
+        return accounts[0] if accounts else None
+
+    @staticmethod
+    def _batch_summary(target, progress_callback=None):
+        """批量任务中单个账号的汇总，返回 (汇总, report函数)；每次report都会回调progress_callback"""
+        summary = {
+            'target': target['value'], 'account': None, 'status': 'pending',
+            'done': 0, 'total': 0, 'error': None
+        }
+
+        def report(**changes):
+            summary.update(changes)
+            if progress_callback:
+                progress_callback(dict(summary))
+
+        return summary, report
+
+class WeChatAPICrawler(BaseWeChatCrawler):
+    """微信API爬虫核心 ✧థ౪థ✧"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self._session = None  # requests会话（首次请求时创建，推迟导入requests）
+        self._adapter = None  # 当前挂载的连接池适配器
+        self.connection_stats = ConnectionStats()  # 连接复用统计
+        self.request_delay = (1.5, 2.5)  # 防Ban延迟
+        self.max_workers = 4  # 文章并发抓取数
+        self._executor = None  # 文章抓取共享线程池（批量模式下各账号共用）
+        self._search_executor = None
+
+    @property
+    def session(self):
+        """HTTP会话（首次使用时创建）"""
+        if self._session is None:
+            import requests
+            session = requests.Session()
+            self._mount_adapter(session)
+            self._session = session
+        return self._session
+
+    def _mount_adapter(self, session):
+        """按当前并发数挂载连接池适配器（https和http共用同一个）"""
+        adapter_class = _instrumented_adapter_class()
+        old_adapter = self._adapter
+        # 文章worker之外，搜索/文章列表请求和批量模式的账号线程也会占用连接
+        pool_size = self.max_workers + 4
+        self._adapter = adapter_class(
+            self.connection_stats,
+            pool_connections=4,  # 缓存连接池的主机数（mp.weixin.qq.com等）
+            pool_maxsize=pool_size,
+            max_retries=build_retry_policy(self.max_retries)
+        )
+        session.mount('https://', self._adapter)
+        session.mount('http://', self._adapter)
+        if old_adapter is not None:
+            old_adapter.close()  # 只关闭空闲连接，进行中的请求结束后其连接随之关闭
+
+    def get_connection_stats(self):
+        """获取连接复用统计（复用率、新建连接数、空闲连接数等）"""
+        stats = self.connection_stats.snapshot()
+        stats['idle_connections'] = self._adapter.idle_connections() if self._adapter else 0
+        stats['pool_maxsize'] = self._adapter._pool_maxsize if self._adapter else 0
+        return stats
+
+    def set_request_delay(self, delay):
+        """设置请求延迟（只作用于文章列表和文章页，搜索接口保持独立的保守配置）"""
+        self.request_delay = (delay, delay + 1)
+        for endpoint in (RateLimiter.APPMSG, RateLimiter.ARTICLE):
+            self.rate_limiter.configure(endpoint, rate=1 / delay, jitter=1.0)
+
+    def set_max_workers(self, workers):
+        """设置文章并发抓取数"""
+        self.max_workers = max(1, int(workers))
+        with self._executor_lock:
+            # 正在使用旧线程池的任务会继续完成，新任务使用新的线程池
+            self._executor = None
+        if self._session is not None and self._adapter is not None and \
+                self._adapter._pool_maxsize < self.max_workers + 4:
+            # 连接池小于并发数时worker会反复新建连接，换用更大的连接池
+            self._mount_adapter(self._session)
+
+    def _get_executor(self):
+        """获取文章抓取共享线程池（首次使用时创建）"""
+        with self._executor_lock:
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='article'
+                )
+            return self._executor
+
+    def parse_html(self, html):
+        """提取HTML中的小程序链接（启用进程池时大页面交给解析进程）"""
+        pool = self._parse_pool_for(html)
+        if pool is None:
+            return self.extractor.extract(html)
+        try:
+            links = pool.submit(parse_article_html, html, self.extractor.backend, self.extractor.matcher.spec).result()
+        except RuntimeError as e:
+            # 进程池损坏（BrokenProcessPool）或已关闭
+            self._parse_pool_failed(pool, e)
+            return self.extractor.extract(html)
+        self._parse_pool_ok = True
+        return links
+
+    def _request_with_delay(self, url, params=None, method='GET', data=None, endpoint=None, headers=None,
+                            before_send=None):
+        """带延迟的API请求（endpoint为限速类别，默认按URL判断；headers为额外请求头）
+
+        before_send 在每次拿到令牌、发出请求前调用，返回False时不再发出请求并返回None。
+        """
+        import requests
+        endpoint = endpoint or RateLimiter.classify(url)
+        request_headers = {**self.headers, **headers} if headers else self.headers
+        
+        for attempt in range(self.max_retries + 1):
+            self.metrics.observe_wait(endpoint, self.rate_limiter.acquire(endpoint))
+            if before_send is not None and not before_send():
+                return None
+            start = time.perf_counter()
+            try:
+                if method == 'GET':
+                    response = self.session.get(
+                        url, 
+                        params=params, 
+                        headers=request_headers, 
+                        timeout=self.config.api_timeout
+                    )
+                else:
+                    response = self.session.post(
+                        url, 
+                        params=params, 
+                        data=data, 
+                        headers=request_headers, 
+                        timeout=self.config.api_timeout
+                    )
+            except requests.exceptions.RequestException as e:
+                self.metrics.observe_request(endpoint, time.perf_counter() - start, 'error')
+                raise Exception(f"网络请求失败: {str(e)}")
+            self.metrics.observe_request(
+                endpoint, time.perf_counter() - start, response.status_code, len(response.content)
+            )
+            
+            # 触发限流：降速退避后重试（退避期间共享此类别的worker一起暂停）
+            if response.status_code == 429:
+                self.rate_limiter.report_rate_limited(endpoint)
+                continue
+            
+            self.rate_limiter.report_success(endpoint)
+            
+            if response.status_code not in [200, 304, 404]:
+                error_map = {
+                    401: "未授权访问（Cookie无效）",
+                    403: "访问被拒绝（权限不足）",
+                    500: "服务器错误（API异常）"
+                }
+                error_msg = error_map.get(response.status_code, f"HTTP错误 {response.status_code}")
+                raise Exception(f"API请求失败: {error_msg}")
+            
+            return response
+        
+        raise RateLimitError("API请求失败: 请求过于频繁（触发限流）")
+
+    def set_cookies_and_token(self, cookies, token=None):
+        """设置并验证登录态"""
+        format_valid, format_msg = self._accept_cookies(cookies)
+        if not format_valid:
+            return False, format_msg
+        self.session.cookies.update(self.cookies)
+        
+        # 手动设置Token
+        if token:
+            self.token = token
+            return True, "Token已手动设置 ✔️"
+        
+        # 自动提取Token（使用自定义正则）
+        try:
+            for page in self.TOKEN_PAGES:
+                result = self._match_token(self._request_with_delay(page, endpoint=RateLimiter.TOKEN))
+                if result:
+                    return result
+            
+            return False, f"无法匹配Token（正则: {self.config.token_pattern}）"
+        except Exception as e:
+            return False, f"Token提取失败: {str(e)}"
+
+    def login(self, cookies=None, token=None, store=None):
+        """验证并设置登录态，返回 (是否有效, 提示信息)
+
+        传入 store 时：保存的Token仍在有效期内则直接复用，不发请求；否则只请求一次
+        cgi-bin/home 完成校验和Token提取，并把结果写回 store。
+        """
+        cookies, token, cached_token, fresh = self._lookup_login(cookies, token, store)
+        if not cookies:
+            return False, "未找到登录态，请先获取Cookie"
+        if fresh:
+            valid, msg = self.set_cookies_and_token(cookies, cached_token)
+            return valid, "已复用保存的登录态 ✔️" if valid else msg
+        
+        # 未指定Token时 set_cookies_and_token 首个请求就是 cgi-bin/home，Cookie有效即可取到Token
+        valid, msg = self.set_cookies_and_token(cookies, token)
+        if valid and store is not None:
+            store.save(cookies, self.token, validated=not token)  # 手动指定的Token未经验证
+        return valid, msg
+
+    def search_public_accounts(self, keyword, account_type='all'):
+        """搜索公众号（支持类型筛选）
+
+        优先请求本会话中上次成功的接口；它发出后超过 search_hedge_delay 秒未返回或失败时
+        同时请求备用接口，取先返回的非空结果。search_hedge_delay 为None时依次尝试各接口。
+        """
+        self._require_token()
+        from concurrent.futures import FIRST_COMPLETED, wait
+        params = self.search_biz_params(self.token, keyword, account_type)
+        urls = self._ordered_search_urls()
+        if self.search_hedge_delay is None:
+            for url in urls:
+                accounts = self._search_biz_or_empty(url, params)
+                if accounts:
+                    self._search_url = url
+                    return accounts
+            return []
+        
+        executor = self._get_search_executor()
+        hedge = _SearchHedge(threading.Event())
+        pending = {executor.submit(self._search_biz_or_empty, urls[0], params, hedge): urls[0]}
+        backups = iter(urls[1:])
+        timeout = self.search_hedge_delay
+        try:
+            hedge.sent.wait()  # 主接口排队等令牌的时间不计入对冲延迟
+            while pending:
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = pending.pop(future)
+                    accounts = future.result()
+                    if accounts:
+                        self._search_url = url
+                        return accounts
+                # 主接口超时未返回或没有结果：启动下一个备用接口
+                for url in itertools.islice(backups, 1):
+                    pending[executor.submit(self._search_biz_or_empty, url, params, hedge)] = url
+                timeout = None if not done else self.search_hedge_delay
+        finally:
+            hedge.settled = True  # 已在运行的备用请求拿到令牌后不再发出
+            for future in pending:
+                future.cancel()
+        return []
+
+    def _get_search_executor(self):
+        """获取搜索对冲请求使用的线程池（首次使用时创建）"""
+        with self._executor_lock:
+            if self._search_executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='search')
+            return self._search_executor
+
+    def _search_biz_or_empty(self, url, params, hedge=None):
+        """请求一个搜索接口，返回账号列表（失败或被对冲取消时返回空列表）"""
+        before_send = hedge.before_send if hedge else None
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = self._request_with_delay(
+                        url, params=params, endpoint=RateLimiter.SEARCH, before_send=before_send
+                    )
+                    if response is None:
+                        break
+                    accounts = self._parse_search_biz(response.json())
+                    if accounts is None:
+                        continue
+                    return accounts
+                except Exception as e:
+                    logging.warning(f"搜索接口 {url} 失败: {str(e)}")
+                break
+            return []
+        finally:
+            if hedge:
+                hedge.sent.set()  # 没发出请求就结束时也不能让调用方一直等
+
+    def search_miniprograms(self, keyword, page=1, num=10):
+        """搜索小程序（page从1开始）"""
+        self._require_token()
+        params = self.search_mini_params(self.token, keyword, page, num)
+        try:
+            response = self._request_with_delay(self.SEARCH_MINI_URL, params=params, endpoint=RateLimiter.SEARCH)
+            return self._parse_miniprograms(response.json())
+        except Exception as e:
+            logging.error(f"小程序搜索失败: {str(e)}")
+            raise
+
+    def iter_public_accounts(self, keyword, account_type='all', max_results=None, prefetch=2):
+        """逐页搜索公众号（惰性生成器），最多产出 max_results 个账号"""
+        def fetch_page(page):
+            if page == 0:
+                return self.search_public_accounts(keyword, account_type)
+            # 第一页已确定可用的接口，后续页直接请求它
+            params = self.search_biz_params(self.token, keyword, account_type, begin=page * self.SEARCH_PAGE_SIZE)
+            return self._search_biz_or_empty(self._ordered_search_urls()[0], params)
+        return self._iter_search_pages(fetch_page, max_results, prefetch)
+
+    def iter_miniprograms(self, keyword, max_results=None, prefetch=2):
+        """逐页搜索小程序（惰性生成器），最多产出 max_results 个小程序"""
+        return self._iter_search_pages(lambda page: self.search_miniprograms(keyword, page + 1), max_results, prefetch)
+
+    def _iter_search_pages(self, fetch_page, max_results=None, prefetch=2):
+        """按页惰性产出搜索结果 ✧
+
+        fetch_page(page) 返回第page页（从0开始）的结果列表。第一页在当前线程请求，
+        之后最多 prefetch 页并发预取（请求频率仍受SEARCH限速器约束）；
+        遇到不满一页的结果或达到 max_results（默认 SEARCH_MAX_RESULTS）时停止。
+        """
+        max_results = max_results or self.SEARCH_MAX_RESULTS
+        max_pages = -(-max_results // self.SEARCH_PAGE_SIZE)
+        count = 0
+        items = fetch_page(0)
+        executor = self._get_search_executor()
+        pending = deque()
+        next_page = 1
+        try:
+            while True:
+                for item in items[:max_results - count]:
+                    yield item
+                count += min(len(items), max_results - count)
+                if len(items) < self.SEARCH_PAGE_SIZE or count >= max_results:
+                    return
+                
+                while next_page < max_pages and len(pending) < max(1, prefetch):
+                    pending.append((next_page, executor.submit(fetch_page, next_page)))
+                    next_page += 1
+                if not pending:
+                    return
+                page, future = pending.popleft()
+                try:
+                    items = future.result()
+                except Exception as e:
+                    logging.warning(f"搜索第 {page+1} 页失败，停止翻页: {str(e)}")
+                    return
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def get_all_articles(self, fakeid, max_pages=10, incremental=False):
+        """获取公众号全部文章（incremental为True时只获取上次抓取之后的新文章）
+
+        返回 ArticleList；翻页中途失败时返回已获取的部分；列表不完整时complete为False（见 ArticleList）。
+        """
+        mark, articles, page, finished = self._start_listing(fakeid, incremental)
+        failures = 0  # 当前页连续失败次数
+        
+        while not finished and page < max_pages:
+            params = self.appmsg_params(self.token, fakeid, page)
+            try:
+                response = self._request_with_delay(self.APPMSG_URL, params=params, endpoint=RateLimiter.APPMSG)
+                finished = self._listing_page(fakeid, page, response.json(), mark, articles, max_pages, failures)
+                if finished is None:
+                    failures += 1
+                    continue
+                page += 1
+                failures = 0
+            except Exception as e:
+                failures += 1
+                delay = self._listing_retry_delay(page, failures, e)
+                if delay is None:
+                    logging.warning(f"文章列表只获取到第 {page} 页，本次结果不完整")
+                    break
+                time.sleep(delay)
+        return articles
+
+    def _fetch_article_html(self, article_url):
+        """获取文章HTML（优先使用缓存，过期后条件请求重新验证）"""
+        entry, text, headers = self._cached_article(article_url)
+        if text is not None:
+            return text
+        response = self._request_with_delay(article_url, endpoint=RateLimiter.ARTICLE, headers=headers)
+        return self._store_article(article_url, entry, response)
+
+    def extract_mini_links(self, article_url):
+        """提取文章中的小程序链接（抓取或解析失败时返回None，与没有链接的空列表区分）"""
+        try:
+            html = self._fetch_article_html(article_url)
+            start = time.perf_counter()
+            links = self.parse_html(html)
+            self.metrics.observe_parse(time.perf_counter() - start)
+            return links
+        except Exception as e:
+            logging.warning(f"提取小程序链接失败: {str(e)}")
+            return None
+
+    def _imap_ordered(self, func, items, stop_event=None):
+        """用线程池并发执行func，按输入顺序逐个产出 (item, 结果)
+
+        同时在途的任务不超过 max_workers 的两倍，输入可以是惰性迭代器，
+        因此无论输入多长内存占用都保持不变。
+        """
+        items = iter(items)
+        pending = deque()
+        executor = self._get_executor()
+        try:
+            # 预先提交一个窗口的任务，后续每取走一个结果补交一个
+            for item in itertools.islice(items, self.max_workers * 2):
+                pending.append((item, executor.submit(func, item)))
+            
+            while pending:
+                if stop_event is not None and stop_event.is_set():
+                    break
+                item, future = pending.popleft()
+                result = future.result()
+                for next_item in itertools.islice(items, 1):
+                    pending.append((next_item, executor.submit(func, next_item)))
+                yield item, result
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def iter_mini_links(self, article_urls, stop_event=None):
+        """并发抓取文章，按文章原顺序逐个产出小程序链接 ✧
+
+        同时在途的请求数不超过 max_workers，速率由共享令牌桶控制，
+        因此下载互相重叠但对服务端的请求频率不变。
+        """
+        for _, mini_links in self._imap_ordered(self.extract_mini_links, article_urls, stop_event):
+            yield mini_links
+
+    def _extract_article_links(self, article):
+        """提取单篇文章（历史文章列表中的一项）的小程序链接"""
+        return self.extract_mini_links(article['link'])
+
+    def iter_article_records(self, account_name, articles, stop_event=None, failed=None):
+        """抓取→解析→提取流水线，按文章顺序逐条产出结果记录
+
+        调用方处理完一条记录（取下一条）后，该文章才记入断点续抓日志；
+        提取失败的文章不产出记录也不记入日志（续抓时重新处理），failed为列表时追加到其中。
+        """
+        for article, mini_links in self._imap_ordered(self._extract_article_links, articles, stop_event):
+            if mini_links is None:
+                if failed is not None:
+                    failed.append(article)
+                continue
+            yield self._article_record(account_name, article, mini_links)
+            if self.journal:
+                self.journal.record_article(article['link'])
+
+    def extract_mini_links_batch(self, article_urls):
+        """并发提取多篇文章的小程序链接（结果顺序与输入一致，失败的文章为None）"""
+        return list(self.iter_mini_links(article_urls))
+
+    def crawl_account(self, account, max_pages=5, incremental=False, record_callback=None,
+                      progress_callback=None, stop_event=None):
+        """无交互地抓取单个账号的文章，逐条回调结果记录，返回处理的文章数
+
+        设置了断点续抓日志时跳过已完成的账号和文章。
+        """
+        if self.journal and self.journal.is_account_done(account['fakeid']):
+            return 0
+        articles = self.get_all_articles(account['fakeid'], max_pages, incremental)
+        todo = self.journal.pending(articles) if self.journal else articles
+        total = len(todo)
+        count = 0
+        failed = []
+        for record in self.iter_article_records(account['nickname'], todo, stop_event, failed):
+            count += 1
+            if record_callback:
+                record_callback(record)
+            if progress_callback:
+                progress_callback(count + len(failed), total)
+        self.finish_account(account['fakeid'], articles, count + len(failed), total, failed)
+        return count
+
+    def resolve_batch_target(self, target, account_type='all'):
+        """把批量任务项解析为账号（关键词取搜索结果第一个），找不到返回None"""
+        account = self._known_target(target)
+        if account:
+            return account
+        return self._searched_target(target, self.search_public_accounts(target['value'], account_type))
+
+    def run_batch(self, targets, record_callback, account_type='all', max_pages=5, incremental=False,
+                  account_workers=2, progress_callback=None, stop_event=None):
+        """批量抓取多个账号 (๑•̀ㅂ•́)و✧
+
+        account_workers 个账号同时进行，所有账号的文章请求共用同一个线程池和限速器；
+        每个账号状态变化时调用 progress_callback(summary)，返回各账号的汇总列表。
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        stop_event = stop_event or threading.Event()
+
+        def run_one(target):
+            summary, report = self._batch_summary(target, progress_callback)
+            if stop_event.is_set():
+                report(status='skipped')
+                return summary
+            try:
+                report(status='searching')
+                account = self.resolve_batch_target(target, account_type)
+                if not account:
+                    report(status='not_found')
+                    return summary
+                report(status='running', account=account['nickname'])
+                count = self.crawl_account(
+                    account, max_pages, incremental, record_callback,
+                    lambda done, total: report(done=done, total=total), stop_event
+                )
+                report(status='stopped' if stop_event.is_set() else 'done', done=count)
+            except Exception as e:
+                report(status='failed', error=str(e))
+            return summary
+
+        with ThreadPoolExecutor(max_workers=max(1, account_workers), thread_name_prefix='account') as pool:
+            futures = [pool.submit(run_one, target) for target in targets]
+            try:
+                return [future.result() for future in futures]
+            except KeyboardInterrupt:
+                stop_event.set()
+                raise
+
+# ====================== 异步爬虫类 ======================
+class _AsyncResponse:
+    """异步请求的响应（接口与requests.Response常用部分一致）"""
+    def __init__(self, status_code, text, headers, url):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+        self.url = url
+
+    def json(self):
+        import json
+        return json.loads(self.text)
+
+class AsyncWeChatAPICrawler(BaseWeChatCrawler):
+    """基于aiohttp的异步爬虫 ✧(≖ ◡ ≖✿)
+
+    请求参数、响应解析、结果记录和续抓/增量状态的处理都来自 BaseWeChatCrawler，
+    与 WeChatAPICrawler 完全一致，这里只实现请求和并发调度；所有请求共用一个
+    RateLimiter，因此在途请求再多，对服务端的请求频率也不变，只是不再需要
+    每个请求占一个线程。缓存、续抓日志和增量状态的磁盘读写与HTML解析都放到
+    线程池（或解析进程池）中执行，事件循环只负责网络请求。使用方式:
+
+        async with AsyncWeChatAPICrawler(config) as crawler:
+            await crawler.set_cookies_and_token(cookie, token)
+            accounts = await crawler.search_public_accounts("关键词")
+    """
+
+    RETRY_STATUSES = (500, 502, 503, 504)  # 与同步版urllib3重试策略（build_retry_policy）一致
+
+    def __init__(self, config, max_concurrency=50, rate_limiter=None):
+        super().__init__(config, rate_limiter)
+        self.max_concurrency = max_concurrency  # 同时在途的文章请求数
+        self._session = None
+
+    @staticmethod
+    async def _blocking(func, *args):
+        """在线程池中执行同步的磁盘读写或解析，不阻塞事件循环"""
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """创建aiohttp会话（连接池上限与并发数一致）"""
+        import aiohttp
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.config.api_timeout)
+            )
+            if self.cookies:
+                self._session.cookie_jar.update_cookies(self.cookies)
+
+    async def close(self):
+        """关闭会话和解析进程池"""
+        self.set_parse_workers(0)
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(self, url, params=None, method='GET', data=None, endpoint=None, headers=None,
+                       before_send=None):
+        """带限速的API请求，状态码处理（及before_send）与同步版一致"""
+        await self.open()
+        endpoint = endpoint or RateLimiter.classify(url)
+        request_headers = {**self.headers, **headers} if headers else self.headers
+        
+        for attempt in range(self.max_retries + 1):
+            self.metrics.observe_wait(endpoint, await self.rate_limiter.acquire_async(endpoint))
+            if before_send is not None and not before_send():
+                return None
+            response = await self._send(method, url, params, data, request_headers, endpoint)
+            
+            if response.status_code == 429:
+                self.rate_limiter.report_rate_limited(endpoint)
+                continue
+            
+            self.rate_limiter.report_success(endpoint)
+            
+            if response.status_code not in [200, 304, 404]:
+                error_map = {
+                    401: "未授权访问（Cookie无效）",
+                    403: "访问被拒绝（权限不足）",
+                    500: "服务器错误（API异常）"
+                }
+                error_msg = error_map.get(response.status_code, f"HTTP错误 {response.status_code}")
+                raise Exception(f"API请求失败: {error_msg}")
+            
+            return response
+        
+        raise RateLimitError("API请求失败: 请求过于频繁（触发限流）")
+
+    async def _send(self, method, url, params, data, headers, endpoint):
+        """发送一次请求；GET遇到连接错误、超时或5xx时退避重试（同步版由urllib3完成）"""
+        import asyncio
+        import aiohttp
+        for retry in range(self.max_retries + 1):
+            if retry:
+                await asyncio.sleep(AdaptiveThrottle.backoff_delay(retry, cap=30.0))
+            can_retry = method == 'GET' and retry < self.max_retries
+            start = time.perf_counter()
+            try:
+                async with self._session.request(method, url, params=params, data=data, headers=headers) as resp:
+                    body = await resp.read()
+                    text = await resp.text(errors='replace')  # 复用已读取的响应体
+                    response = _AsyncResponse(resp.status, text, resp.headers, str(resp.url))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # asyncio.TimeoutError 在3.11之前不是内置 TimeoutError 的别名
+                self.metrics.observe_request(endpoint, time.perf_counter() - start, 'error')
+                if can_retry and isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+                    continue
+                raise Exception(f"网络请求失败: {str(e) or type(e).__name__}")
+            self.metrics.observe_request(endpoint, time.perf_counter() - start, response.status_code, len(body))
+            if response.status_code in self.RETRY_STATUSES and can_retry:
+                continue
+            return response
+
+    async def set_cookies_and_token(self, cookies, token=None):
+        """设置并验证登录态"""
+        format_valid, format_msg = self._accept_cookies(cookies)
+        if not format_valid:
+            return False, format_msg
+        if self._session is not None:
+            self._session.cookie_jar.update_cookies(self.cookies)
+        
+        if token:
+            self.token = token
+            return True, "Token已手动设置 ✔️"
+        
+        try:
+            for page in self.TOKEN_PAGES:
+                result = self._match_token(await self._request(page, endpoint=RateLimiter.TOKEN))
+                if result:
+                    return result
+            
+            return False, f"无法匹配Token（正则: {self.config.token_pattern}）"
+        except Exception as e:
+            return False, f"Token提取失败: {str(e)}"
+
+    async def login(self, cookies=None, token=None, store=None):
+        """验证并设置登录态（与同步版login一致：有效期内的Token直接复用）"""
+        cookies, token, cached_token, fresh = self._lookup_login(cookies, token, store)
+        if not cookies:
+            return False, "未找到登录态，请先获取Cookie"
+        if fresh:
+            valid, msg = await self.set_cookies_and_token(cookies, cached_token)
+            return valid, "已复用保存的登录态 ✔️" if valid else msg
+        
+        valid, msg = await self.set_cookies_and_token(cookies, token)
+        if valid and store is not None:
+            store.save(cookies, self.token, validated=not token)
+        return valid, msg
+
+    async def search_public_accounts(self, keyword, account_type='all'):
+        """搜索公众号（接口选择与对冲策略同 WeChatAPICrawler.search_public_accounts）"""
+        import asyncio
+        self._require_token()
+        params = self.search_biz_params(self.token, keyword, account_type)
+        urls = self._ordered_search_urls()
+        if self.search_hedge_delay is None:
+            for url in urls:
+                accounts = await self._search_biz_or_empty(url, params)
+                if accounts:
+                    self._search_url = url
+                    return accounts
+            return []
+        
+        hedge = _SearchHedge(asyncio.Event())
+        pending = {asyncio.ensure_future(self._search_biz_or_empty(urls[0], params, hedge)): urls[0]}
+        backups = iter(urls[1:])
+        timeout = self.search_hedge_delay
+        try:
+            await hedge.sent.wait()  # 主接口排队等令牌的时间不计入对冲延迟
+            while pending:
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    url = pending.pop(task)
+                    accounts = task.result()
+                    if accounts:
+                        self._search_url = url
+                        return accounts
+                for url in itertools.islice(backups, 1):
+                    pending[asyncio.ensure_future(self._search_biz_or_empty(url, params, hedge))] = url
+                timeout = None if not done else self.search_hedge_delay
+        finally:
+            hedge.settled = True
+            for task in pending:
+                task.cancel()
+        return []
+
+    async def _search_biz_or_empty(self, url, params, hedge=None):
+        """请求一个搜索接口，返回账号列表（失败或被对冲取消时返回空列表）"""
+        before_send = hedge.before_send if hedge else None
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = await self._request(
+                        url, params=params, endpoint=RateLimiter.SEARCH, before_send=before_send
+                    )
+                    if response is None:
+                        break
+                    accounts = self._parse_search_biz(response.json())
+                    if accounts is None:
+                        continue
+                    return accounts
+                except Exception as e:
+                    logging.warning(f"搜索接口 {url} 失败: {str(e)}")
+                break
+            return []
+        finally:
+            if hedge:
+                hedge.sent.set()
+
+    async def search_miniprograms(self, keyword, page=1, num=10):
+        """搜索小程序（page从1开始）"""
+        self._require_token()
+        params = self.search_mini_params(self.token, keyword, page, num)
+        response = await self._request(self.SEARCH_MINI_URL, params=params, endpoint=RateLimiter.SEARCH)
+        return self._parse_miniprograms(response.json())
+
+    async def get_all_articles(self, fakeid, max_pages=10, incremental=False):
+        """获取公众号全部文章（返回 ArticleList，与同步版get_all_articles一致）"""
+        import asyncio
+        mark, articles, page, finished = await self._blocking(self._start_listing, fakeid, incremental)
+        failures = 0
+        
+        while not finished and page < max_pages:
+            params = self.appmsg_params(self.token, fakeid, page)
+            try:
+                response = await self._request(self.APPMSG_URL, params=params, endpoint=RateLimiter.APPMSG)
+                finished = await self._blocking(
+                    self._listing_page, fakeid, page, response.json(), mark, articles, max_pages, failures
+                )
+                if finished is None:
+                    failures += 1
+                    continue
+                page += 1
+                failures = 0
+            except Exception as e:
+                failures += 1
+                delay = self._listing_retry_delay(page, failures, e)
+                if delay is None:
+                    logging.warning(f"文章列表只获取到第 {page} 页，本次结果不完整")
+                    break
+                await asyncio.sleep(delay)
+        return articles
+
+    async def _fetch_article_html(self, article_url):
+        """获取文章HTML（优先使用缓存，过期后条件请求重新验证；缓存读写在线程池中执行）"""
+        if self.cache is None:
+            entry, text, headers = None, None, None
+        else:
+            entry, text, headers = await self._blocking(self._cached_article, article_url)
+        if text is not None:
+            return text
+        response = await self._request(article_url, endpoint=RateLimiter.ARTICLE, headers=headers)
+        if self.cache is None:
+            return response.text
+        return await self._blocking(self._store_article, article_url, entry, response)
+
+    async def parse_html(self, html):
+        """提取HTML中的小程序链接（大页面交给解析进程池，其余在线程池中解析，不阻塞事件循环）"""
+        pool = self._parse_pool_for(html)
+        if pool is None:
+            return await self._blocking(self.extractor.extract, html)
+        import asyncio
+        loop = asyncio.get_running_loop()
+        try:
+            links = await loop.run_in_executor(
+                pool, parse_article_html, html, self.extractor.backend, self.extractor.matcher.spec
+            )
+        except RuntimeError as e:
+            # 进程池损坏（BrokenProcessPool）或已关闭
+            self._parse_pool_failed(pool, e)
+            return await self._blocking(self.extractor.extract, html)
+        self._parse_pool_ok = True
+        return links
+
+    async def extract_mini_links(self, article_url):
+        """提取文章中的小程序链接（失败时返回None）"""
+        try:
+            html = await self._fetch_article_html(article_url)
+            start = time.perf_counter()
+            links = await self.parse_html(html)
+            self.metrics.observe_parse(time.perf_counter() - start)
+            return links
+        except Exception as e:
+            logging.warning(f"提取小程序链接失败: {str(e)}")
+            return None
+
+    async def iter_article_records(self, account_name, articles, failed=None):
+        """并发抓取文章，按文章顺序逐条产出结果记录（异步生成器）
+
+        同时在途的请求不超过 max_concurrency，请求频率由共享的RateLimiter控制；
+        提取失败的文章不产出记录也不记入日志，failed为列表时追加到其中。
+        """
+        import asyncio
+        articles = iter(articles)
+        pending = deque()
+        try:
+            for article in itertools.islice(articles, self.max_concurrency):
+                pending.append((article, asyncio.ensure_future(self.extract_mini_links(article['link']))))
+            
+            while pending:
+                article, task = pending.popleft()
+                mini_links = await task
+                for next_article in itertools.islice(articles, 1):
+                    pending.append((next_article, asyncio.ensure_future(self.extract_mini_links(next_article['link']))))
+                if mini_links is None:
+                    if failed is not None:
+                        failed.append(article)
+                    continue
+                yield self._article_record(account_name, article, mini_links)
+                if self.journal:
+                    await self._blocking(self.journal.record_article, article['link'])
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def crawl_account(self, account, max_pages=5, incremental=False, record_callback=None,
+                            progress_callback=None):
+        """抓取单个账号的文章，逐条回调结果记录，返回处理的文章数（跳过日志中已完成的部分）"""
+        if self.journal and self.journal.is_account_done(account['fakeid']):
+            return 0
+        articles = await self.get_all_articles(account['fakeid'], max_pages, incremental)
+        todo = self.journal.pending(articles) if self.journal else articles
+        total = len(todo)
+        count = 0
+        failed = []
+        async for record in self.iter_article_records(account['nickname'], todo, failed):
+            count += 1
+            if record_callback:
+                record_callback(record)
+            if progress_callback:
+                progress_callback(count + len(failed), total)
+        await self._blocking(self.finish_account, account['fakeid'], articles, count + len(failed), total, failed)
+        return count
+
+    async def resolve_batch_target(self, target, account_type='all'):
+        """把批量任务项解析为账号（关键词取搜索结果第一个），找不到返回None"""
+        account = self._known_target(target)
+        if account:
+            return account
+        accounts = await self.search_public_accounts(target['value'], account_type)
+        return await self._blocking(self._searched_target, target, accounts)
+
+    async def run_batch(self, targets, record_callback, account_type='all', max_pages=5, incremental=False,
+                        account_workers=2, progress_callback=None):
+        """批量抓取多个账号，返回各账号的汇总列表（与同步版run_batch一致）"""
+        import asyncio
+        semaphore = asyncio.Semaphore(max(1, account_workers))
+
+        async def run_one(target):
+            summary, report = self._batch_summary(target, progress_callback)
+            async with semaphore:
+                try:
+                    report(status='searching')
+                    account = await self.resolve_batch_target(target, account_type)
+                    if not account:
+                        report(status='not_found')
+                        return summary
+                    report(status='running', account=account['nickname'])
+                    count = await self.crawl_account(
+                        account, max_pages, incremental, record_callback,
+                        lambda done, total: report(done=done, total=total)
+                    )
+                    report(status='done', done=count)
+                except asyncio.CancelledError:
+                    report(status='stopped')
+                    raise
+                except Exception as e:
+                    report(status='failed', error=str(e))
+            return summary
+
+        return await asyncio.gather(*(run_one(target) for target in targets))
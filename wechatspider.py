@@ -1,1199 +1,1551 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-
-"""
-🌸 微信开放平台接口提取工具 by p1r07 🌸 
-✧*｡٩(ˊᗜˋ*)و✧*｡
-
-作者：p1r07
-版本：6.0.0 (命令行版)
-更新：2025-08-25
-依托文档：https://developers.weixin.qq.com/doc/oplatform/developers/dev/api/
-
-✨ 功能亮点：
-✓ 自定义验证字段配置（适配微信API变更）
-✓ 自动/手动双模式获取登录态
-✓ 服务号/订阅号/小程序全类型支持
-✓ 灵活的字段验证规则配置
-✓ 简洁高效的命令行操作体验
-"""
-
-import os
-import sys
-import csv
-import re
-import time
-import random
-import logging
-import requests
-from pathlib import Path
-from bs4 import BeautifulSoup
-from datetime import datetime
-
-# ====================== 日志配置 ======================
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[logging.FileHandler('wechat_api_crawler.log'), logging.StreamHandler()]
-)
-
-# ====================== 二次元样式与图标 ======================
-class AnimeStyle:
-    """超萌二次元风格配置 ✧(◍˃̶ᗜ˂̶◍)✩"""
-    # 图标集合
-    ICONS = {
-        "success": "✅",
-        "error": "❌",
-        "info": "ℹ️",
-        "warning": "⚠️",
-        "search": "🔍",
-        "file": "📄",
-        "config": "⚙️",
-        "cookie": "🍪",
-        "token": "🔑",
-        "article": "📝",
-        "mini": "📱",
-        "export": "💾",
-        "clear": "🧹",
-        "exit": "🚪",
-        "about": "ℹ️"
-    }
-    
-    @staticmethod
-    def print_title():
-        """打印标题"""
-        print("\n" + "=" * 60)
-        print(f"🌸 微信开放平台接口提取工具 by p1r07 🌸".center(60))
-        print(f"✧*｡٩(ˊᗜˋ*)و✧*｡ 版本: 6.0.0 (命令行版)".center(60))
-        print("=" * 60 + "\n")
-    
-    @staticmethod
-    def print_menu():
-        """打印主菜单"""
-        menu = f"""
-{AnimeStyle.ICONS['info']}  请选择操作 (输入数字1-9):
-1.  {AnimeStyle.ICONS['cookie']}  获取/输入微信Cookie
-2.  {AnimeStyle.ICONS['token']}  验证登录态
-3.  {AnimeStyle.ICONS['search']}  搜索公众号文章
-4.  {AnimeStyle.ICONS['mini']}   搜索小程序
-5.  {AnimeStyle.ICONS['export']}  导出结果到CSV
-6.  {AnimeStyle.ICONS['clear']}   清空当前结果
-7.  {AnimeStyle.ICONS['config']}  配置验证规则
-8.  {AnimeStyle.ICONS['about']}   关于本工具
-9.  {AnimeStyle.ICONS['exit']}    退出工具
-        """
-        print(menu)
-        print("-" * 60)
-
-# ====================== 配置管理类 ======================
-class ValidationConfig:
-    """验证规则配置管理 (◍•ᴗ•◍)"""
-    def __init__(self):
-        # 默认验证字段（基于微信开放平台文档）
-        self.default_core_fields = "wxuin, mm_lang"  # 核心用户标识字段
-        self.default_session_fields = "wxsid, slave_sid, sessionid"  # 会话字段
-        self.default_token_pattern = r'token=(\d+)'  # Token提取正则
-        self.default_api_timeout = 15  # API超时时间（秒）
-        
-        # 当前配置
-        self.core_fields = self.default_core_fields
-        self.session_fields = self.default_session_fields
-        self.token_pattern = self.default_token_pattern
-        self.api_timeout = self.default_api_timeout
-        self.config_file = "wechat_api_config.ini"
-        
-        # 尝试加载配置文件
-        self.load_config()
-
-    def get_core_fields_list(self):
-        """获取核心字段列表"""
-        return [f.strip() for f in self.core_fields.split(',') if f.strip()]
-
-    def get_session_fields_list(self):
-        """获取会话字段列表"""
-        return [f.strip() for f in self.session_fields.split(',') if f.strip()]
-
-    def reset_to_default(self):
-        """重置为默认配置"""
-        self.core_fields = self.default_core_fields
-        self.session_fields = self.default_session_fields
-        self.token_pattern = self.default_token_pattern
-        self.api_timeout = self.default_api_timeout
-        self.save_config()
-        return "配置已重置为默认值 ✧*｡٩(ˊᗜˋ*)و✧*｡"
-
-    def save_config(self):
-        """保存配置到文件"""
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                f.write(f"core_fields={self.core_fields}\n")
-                f.write(f"session_fields={self.session_fields}\n")
-                f.write(f"token_pattern={self.token_pattern}\n")
-                f.write(f"api_timeout={self.api_timeout}\n")
-            return f"{AnimeStyle.ICONS['success']} 配置已保存到 {self.config_file}"
-        except Exception as e:
-            return f"{AnimeStyle.ICONS['error']} 保存配置失败: {str(e)}"
-
-    def load_config(self):
-        """从文件加载配置"""
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if '=' in line and not line.startswith('#'):
-                            key, value = line.split('=', 1)
-                            if key == 'core_fields':
-                                self.core_fields = value
-                            elif key == 'session_fields':
-                                self.session_fields = value
-                            elif key == 'token_pattern':
-                                self.token_pattern = value
-                            elif key == 'api_timeout':
-                                self.api_timeout = int(value)
-                return f"{AnimeStyle.ICONS['success']} 已加载配置文件"
-            return f"{AnimeStyle.ICONS['info']} 未找到配置文件，使用默认配置"
-        except Exception as e:
-            return f"{AnimeStyle.ICONS['warning']} 加载配置失败: {str(e)}，使用默认配置"
-
-    def print_config(self):
-        """打印当前配置"""
-        print("\n" + "-" * 50)
-        print(f"{AnimeStyle.ICONS['config']} 当前验证规则配置:")
-        print(f"1. 核心用户字段 (必填): {self.core_fields}")
-        print(f"2. 会话字段 (至少一个): {self.session_fields}")
-        print(f"3. Token提取正则: {self.token_pattern}")
-        print(f"4. API超时时间: {self.api_timeout}秒")
-        print("-" * 50 + "\n")
-
-    def configure_interactive(self):
-        """交互式配置"""
-        self.print_config()
-        
-        print(f"{AnimeStyle.ICONS['info']} 按回车保留当前值，输入新值进行修改")
-        
-        # 核心字段配置
-        core_fields = input(f"核心用户字段 [{self.core_fields}]: ").strip()
-        if core_fields:
-            self.core_fields = core_fields
-            
-        # 会话字段配置
-        session_fields = input(f"会话字段 [{self.session_fields}]: ").strip()
-        if session_fields:
-            self.session_fields = session_fields
-            
-        # Token正则配置
-        token_pattern = input(f"Token提取正则 [{self.token_pattern}]: ").strip()
-        if token_pattern:
-            self.token_pattern = token_pattern
-            
-        # 超时配置
-        try:
-            timeout = input(f"API超时时间 [{self.api_timeout}]: ").strip()
-            if timeout:
-                self.api_timeout = int(timeout)
-        except ValueError:
-            print(f"{AnimeStyle.ICONS['warning']} 无效的超时时间，保持原值")
-            
-        return self.save_config()
-
-# ====================== Cookie自动获取类 ======================
-class WeChatCookieAutoGetter:
-    """微信Cookie自动获取器 (๑＞ڡ＜)☆"""
-    
-    @staticmethod
-    def get_wechat_cookies(source=0):
-        """从指定来源获取Cookie"""
-        try:
-            methods = [
-                WeChatCookieAutoGetter._get_from_chrome,
-                WeChatCookieAutoGetter._get_from_edge,
-                WeChatCookieAutoGetter._get_from_wechat_app
-            ]
-            
-            if 1 <= source <= len(methods):
-                # 使用指定的方法
-                cookies = methods[source-1]()
-                if cookies and WeChatCookieAutoGetter._validate_cookie_basic(cookies):
-                    logging.info("成功获取微信Cookie")
-                    return cookies
-                return None
-            else:
-                # 尝试所有方法
-                for method in methods:
-                    cookies = method()
-                    if cookies and WeChatCookieAutoGetter._validate_cookie_basic(cookies):
-                        logging.info("成功获取微信Cookie")
-                        return cookies
-            
-            logging.warning("所有获取Cookie的方法都失败了")
-            return None
-            
-        except Exception as e:
-            logging.error(f"获取Cookie时出错: {str(e)}")
-            return None
-    
-    @staticmethod
-    def _validate_cookie_basic(cookie_str):
-        """基础Cookie格式验证"""
-        return cookie_str and '=' in cookie_str and ';' in cookie_str
-    
-    @staticmethod
-    def _cookie_str_to_dict(cookie_str):
-        """Cookie字符串转字典"""
-        cookies = {}
-        for item in cookie_str.split(';'):
-            item = item.strip()
-            if '=' in item:
-                key, value = item.split('=', 1)
-                cookies[key.strip()] = value.strip()
-        return cookies
-    
-    @staticmethod
-    def _dict_to_cookie_str(cookie_dict):
-        """Cookie字典转字符串"""
-        return '; '.join([f"{k}={v}" for k, v in cookie_dict.items()])
-    
-    @staticmethod
-    def _get_from_chrome():
-        """从Chrome浏览器获取Cookie"""
-        try:
-            # 尝试导入必要的库
-            try:
-                import win32crypt
-                import json
-                import base64
-                from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-            except ImportError:
-                logging.warning("缺少Chrome Cookie获取所需的库")
-                return None
-                
-            appdata = os.getenv('LOCALAPPDATA')
-            chrome_cookie_path = Path(appdata) / "Google" / "Chrome" / "User Data" / "Default" / "Cookies"
-            if not chrome_cookie_path.exists():
-                return None
-                
-            # 获取加密密钥
-            local_state_path = Path(appdata) / "Google" / "Chrome" / "User Data" / "Local State"
-            with open(local_state_path, 'r', encoding='utf-8') as f:
-                local_state = json.load(f)
-            
-            encrypted_key = base64.b64decode(local_state["os_crypt"]["encrypted_key"])
-            encrypted_key = encrypted_key[5:]
-            key = win32crypt.CryptUnprotectData(encrypted_key, None, None, None, 0)[1]
-            
-            # 查询微信相关Cookie
-            import sqlite3
-            conn = sqlite3.connect(str(chrome_cookie_path))
-            cursor = conn.cursor()
-            cursor.execute("SELECT name, encrypted_value FROM cookies WHERE host_key LIKE '%mp.weixin.qq.com%'")
-            
-            cookies = {}
-            for name, encrypted_value in cursor.fetchall():
-                if not encrypted_value:
-                    continue
-                    
-                try:
-                    nonce = encrypted_value[3:15]
-                    ciphertext = encrypted_value[15:]
-                    aesgcm = AESGCM(key)
-                    decrypted = aesgcm.decrypt(nonce, ciphertext, None)
-                    cookies[name] = decrypted.decode('utf-8')
-                except:
-                    continue
-            
-            conn.close()
-            return WeChatCookieAutoGetter._dict_to_cookie_str(cookies) if cookies else None
-            
-        except Exception as e:
-            logging.warning(f"Chrome Cookie获取失败: {str(e)}")
-            return None
-    
-    @staticmethod
-    def _get_from_edge():
-        """从Edge浏览器获取Cookie"""
-        try:
-            # 尝试导入必要的库
-            try:
-                import win32crypt
-                import json
-                import base64
-                from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-            except ImportError:
-                logging.warning("缺少Edge Cookie获取所需的库")
-                return None
-                
-            appdata = os.getenv('LOCALAPPDATA')
-            edge_cookie_path = Path(appdata) / "Microsoft" / "Edge" / "User Data" / "Default" / "Cookies"
-            if not edge_cookie_path.exists():
-                return None
-                
-            # 获取加密密钥
-            local_state_path = Path(appdata) / "Microsoft" / "Edge" / "User Data" / "Local State"
-            with open(local_state_path, 'r', encoding='utf-8') as f:
-                local_state = json.load(f)
-            
-            encrypted_key = base64.b64decode(local_state["os_crypt"]["encrypted_key"])
-            encrypted_key = encrypted_key[5:]
-            key = win32crypt.CryptUnprotectData(encrypted_key, None, None, None, 0)[1]
-            
-            # 查询微信相关Cookie
-            import sqlite3
-            conn = sqlite3.connect(str(edge_cookie_path))
-            cursor = conn.cursor()
-            cursor.execute("SELECT name, encrypted_value FROM cookies WHERE host_key LIKE '%mp.weixin.qq.com%'")
-            
-            cookies = {}
-            for name, encrypted_value in cursor.fetchall():
-                if not encrypted_value:
-                    continue
-                    
-                try:
-                    nonce = encrypted_value[3:15]
-                    ciphertext = encrypted_value[15:]
-                    aesgcm = AESGCM(key)
-                    decrypted = aesgcm.decrypt(nonce, ciphertext, None)
-                    cookies[name] = decrypted.decode('utf-8')
-                except:
-                    continue
-            
-            conn.close()
-            return WeChatCookieAutoGetter._dict_to_cookie_str(cookies) if cookies else None
-            
-        except Exception as e:
-            logging.warning(f"Edge Cookie获取失败: {str(e)}")
-            return None
-    
-    @staticmethod
-    def _get_from_wechat_app():
-        """从微信客户端获取Cookie"""
-        try:
-            appdata = os.getenv('APPDATA')
-            wechat_paths = [
-                Path(appdata) / "Tencent" / "WeChat" / "XPlugin" / "Plugins" / "WeChatBrowser" / "User Data" / "Default" / "Cookies",
-                Path(appdata) / "Tencent" / "WeChat" / "WeChat Files" / "All Users" / "Cookies"
-            ]
-            
-            for cookie_path in wechat_paths:
-                if cookie_path.exists():
-                    import sqlite3
-                    conn = sqlite3.connect(str(cookie_path))
-                    cursor = conn.cursor()
-                    cursor.execute("SELECT name, value FROM cookies WHERE host LIKE '%mp.weixin.qq.com%'")
-                    
-                    cookies = {}
-                    for name, value in cursor.fetchall():
-                        if name and value:
-                            cookies[name] = value
-                    
-                    conn.close()
-                    return WeChatCookieAutoGetter._dict_to_cookie_str(cookies) if cookies else None
-            
-            return None
-            
-        except Exception as e:
-            logging.warning(f"微信客户端Cookie获取失败: {str(e)}")
-            return None
-
-# ====================== 爬虫核心类 ======================
-class WeChatAPICrawler:
-    """微信API爬虫核心 ✧థ౪థ✧"""
-    def __init__(self, config: ValidationConfig):
-        self.session = requests.Session()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36',
-            'Referer': 'https://mp.weixin.qq.com/',
-            'Accept-Language': 'zh-CN,zh;q=0.9',
-            'X-Requested-With': 'XMLHttpRequest'
-        }
-        self.config = config  # 验证配置
-        self.cookies = {}
-        self.token = None
-        self.last_request_time = 0
-        self.request_delay = (1.5, 2.5)  # 防Ban延迟
-        self.results = []  # 存储爬取结果
-
-    def set_request_delay(self, delay):
-        """设置请求延迟"""
-        self.request_delay = (delay, delay + 1)
-
-    def _request_with_delay(self, url, params=None, method='GET', data=None):
-        """带延迟的API请求"""
-        delay = random.uniform(*self.request_delay)
-        elapsed = time.time() - self.last_request_time
-        if elapsed < delay:
-            time.sleep(delay - elapsed)
-        
-        try:
-            if method == 'GET':
-                response = self.session.get(
-                    url, 
-                    params=params, 
-                    headers=self.headers, 
-                    timeout=self.config.api_timeout
-                )
-            else:
-                response = self.session.post(
-                    url, 
-                    params=params, 
-                    data=data, 
-                    headers=self.headers, 
-                    timeout=self.config.api_timeout
-                )
-            
-            self.last_request_time = time.time()
-            
-            if response.status_code not in [200, 404]:
-                error_map = {
-                    401: "未授权访问（Cookie无效）",
-                    403: "访问被拒绝（权限不足）",
-                    429: "请求过于频繁（触发限流）",
-                    500: "服务器错误（API异常）"
-                }
-                error_msg = error_map.get(response.status_code, f"HTTP错误 {response.status_code}")
-                raise Exception(f"API请求失败: {error_msg}")
-            
-            return response
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"网络请求失败: {str(e)}")
-
-    def validate_cookie_format(self, cookies):
-        """基于自定义规则验证Cookie格式"""
-        core_fields = self.config.get_core_fields_list()
-        session_fields = self.config.get_session_fields_list()
-        
-        # 验证核心字段
-        missing_core = [f for f in core_fields if f not in cookies]
-        if missing_core:
-            return False, f"缺少核心字段: {', '.join(missing_core)}（参考微信开放平台文档）"
-        
-        # 验证会话字段（至少存在一个）
-        has_session = any(f in cookies for f in session_fields)
-        if not has_session:
-            return False, f"缺少会话字段（至少需要一个）: {', '.join(session_fields)}"
-            
-        return True, "Cookie格式验证通过 ✧◝(⁰▿⁰)◜✧"
-
-    def set_cookies_and_token(self, cookies, token=None):
-        """设置并验证登录态"""
-        # 解析Cookie
-        cookie_dict = {k.strip(): v.strip() for item in cookies.split(';') 
-                      for k, v in [item.split('=', 1)] if '=' in item}
-        
-        # 格式验证
-        format_valid, format_msg = self.validate_cookie_format(cookie_dict)
-        if not format_valid:
-            return False, format_msg
-        
-        self.cookies = cookie_dict
-        self.session.cookies.update(cookie_dict)
-        
-        # 手动设置Token
-        if token:
-            self.token = token
-            return True, "Token已手动设置 ✔️"
-        
-        # 自动提取Token（使用自定义正则）
-        try:
-            token_pages = [
-                "https://mp.weixin.qq.com/cgi-bin/home",
-                "https://mp.weixin.qq.com/cgi-bin/menu?t=menu/list&token=&lang=zh_CN",
-                "https://mp.weixin.qq.com/"
-            ]
-            
-            for page in token_pages:
-                response = self._request_with_delay(page)
-                if "loginpage" in response.url:
-                    return False, "Cookie无效或已过期，需重新登录"
-                
-                # 使用自定义正则提取Token
-                token_match = re.search(self.config.token_pattern, response.text)
-                if token_match:
-                    self.token = token_match.group(1)
-                    return True, f"Token自动提取成功: {self.token} ✨"
-            
-            return False, f"无法匹配Token（正则: {self.config.token_pattern}）"
-        except Exception as e:
-            return False, f"Token提取失败: {str(e)}"
-
-    def search_public_accounts(self, keyword, account_type='all'):
-        """搜索公众号（支持类型筛选）"""
-        if not self.token:
-            raise Exception("Token未设置，请先验证登录态")
-        
-        # 账号类型映射（基于微信API文档）
-        type_map = {
-            'all': 0,       # 全部
-            'official': 1,  # 公众号
-            'service': 2,   # 服务号
-            'subscription': 3  # 订阅号
-        }
-        search_type = type_map.get(account_type, 0)
-            
-        search_urls = [
-            "https://mp.weixin.qq.com/cgi-bin/searchbiz",
-            "https://mp.weixin.qq.com/api/searchbiz"
-        ]
-        
-        params = {
-            'action': 'search_biz',
-            'token': self.token,
-            'lang': 'zh_CN',
-            'f': 'json',
-            'ajax': '1',
-            'query': keyword,
-            'begin': '0',
-            'count': '10',
-            'type': search_type
-        }
-        
-        for url in search_urls:
-            try:
-                response = self._request_with_delay(url, params=params)
-                data = response.json()
-                
-                if 'base_resp' in data and data['base_resp']['ret'] != 0:
-                    err_msg = data['base_resp'].get('err_msg', '未知错误')
-                    if data['base_resp']['ret'] == 200013:  # 频率限制
-                        time.sleep(5)
-                        continue
-                    raise Exception(f"搜索失败: {err_msg}")
-                
-                if 'list' in data and len(data['list']) > 0:
-                    return data['list']
-            except Exception as e:
-                logging.warning(f"搜索接口 {url} 失败: {str(e)}")
-                continue
-        
-        return []
-    
-    def search_miniprograms(self, keyword):
-        """搜索小程序"""
-        if not self.token:
-            raise Exception("Token未设置，请先验证登录态")
-            
-        search_url = "https://mp.weixin.qq.com/wxa-api/search/wxaapp"
-        
-        params = {
-            'action': 'search',
-            'token': self.token,
-            'lang': 'zh_CN',
-            'keyword': keyword,
-            'page': 1,
-            'num': 10
-        }
-        
-        try:
-            response = self._request_with_delay(search_url, params=params)
-            data = response.json()
-            
-            if data.get('base_resp', {}).get('ret', -1) != 0:
-                err_msg = data.get('base_resp', {}).get('err_msg', '未知错误')
-                raise Exception(f"小程序搜索失败: {err_msg}")
-                
-            return data.get('app_list', [])
-        except Exception as e:
-            logging.error(f"小程序搜索失败: {str(e)}")
-            raise
-
-    def get_all_articles(self, fakeid, max_pages=10):
-        """获取公众号全部文章"""
-        if not self.token:
-            raise Exception("Token未设置，请先验证登录态")
-            
-        articles = []
-        url = "https://mp.weixin.qq.com/cgi-bin/appmsg"
-        page = 0
-        
-        while page < max_pages:
-            params = {
-                'action': 'list_ex',
-                'begin': str(page * 10),
-                'count': '10',
-                'fakeid': fakeid,
-                'type': '9',
-                'token': self.token,
-                'lang': 'zh_CN',
-                'f': 'json',
-                'ajax': '1'
-            }
-            
-            try:
-                response = self._request_with_delay(url, params=params)
-                data = response.json()
-                
-                if 'base_resp' in data and data['base_resp']['ret'] != 0:
-                    err_msg = data['base_resp'].get('err_msg', '未知错误')
-                    raise Exception(f"获取文章失败: {err_msg}")
-                
-                current_articles = data.get('app_msg_list', [])
-                if not current_articles:
-                    break
-                
-                articles.extend(current_articles)
-                print(f"{AnimeStyle.ICONS['info']} 已获取第 {page+1} 页文章，共 {len(articles)} 篇")
-                
-                if not data.get('has_more', 0):
-                    break
-                
-                page += 1
-            except Exception as e:
-                print(f"{AnimeStyle.ICONS['warning']} 获取第 {page+1} 页文章失败: {str(e)}")
-                if page == 0:
-                    raise
-                time.sleep(3)
-                continue
-        
-        return articles
-
-    def extract_mini_links(self, article_url):
-        """提取文章中的小程序链接"""
-        try:
-            response = self._request_with_delay(article_url)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            mini_links = set()
-            
-            # 提取<a>标签中的小程序链接
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if any(key in href for key in ['miniprogram', 'wxurl', 'weapp', 'appmsg']):
-                    if href.startswith('//'):
-                        href = f"https:{href}"
-                    elif not href.startswith('http'):
-                        href = f"https://mp.weixin.qq.com{href}"
-                    mini_links.add(href)
-            
-            # 提取脚本中的链接
-            script_tags = soup.find_all('script')
-            for script in script_tags:
-                if script.string:
-                    patterns = [
-                        r'https?://[^\s"\']+?miniprogram[^\s"\']*',
-                        r'https?://[^\s"\']+?weixin\.qq\.com/[^\s"\']+?appid[^\s"\']*'
-                    ]
-                    for pattern in patterns:
-                        matches = re.findall(pattern, str(script.string))
-                        for match in matches:
-                            mini_links.add(match)
-            
-            return list(mini_links)
-        except Exception as e:
-            print(f"{AnimeStyle.ICONS['warning']} 提取小程序链接失败: {str(e)}")
-            return []
-
-    def search_account_articles(self, keyword, account_type='all', max_pages=5):
-        """搜索公众号文章并提取小程序链接"""
-        print(f"{AnimeStyle.ICONS['search']} 正在搜索关键词为「{keyword}」的{self._get_account_type_name(account_type)}...")
-        accounts = self.search_public_accounts(keyword, account_type)
-        
-        if not accounts:
-            return False, f"未找到关键词为「{keyword}」的账号 (╥_╥)"
-
-        # 显示找到的账号并让用户选择
-        print(f"\n{AnimeStyle.ICONS['success']} 找到以下账号:")
-        for i, account in enumerate(accounts[:5], 1):
-            print(f"{i}. {account['nickname']} - {account.get('alias', '无别名')}")
-        
-        try:
-            choice = input("\n请选择要查看的账号 (1-5，默认1): ").strip()
-            index = int(choice) - 1 if choice else 0
-            if index < 0 or index >= min(5, len(accounts)):
-                index = 0
-        except ValueError:
-            index = 0
-            
-        target_account = accounts[index]
-        print(f"\n{AnimeStyle.ICONS['info']} 已选择账号: {target_account['nickname']} ✧*｡٩(ˊᗜˋ*)و✧*｡")
-        
-        print(f"{AnimeStyle.ICONS['article']} 正在获取历史文章... (最多{max_pages}页)")
-        articles = self.get_all_articles(target_account['fakeid'], max_pages)
-        
-        if not articles:
-            return False, "该账号没有可获取的文章 (╯︵╰)"
-
-        results = []
-        total = len(articles)
-        print(f"\n{AnimeStyle.ICONS['info']} 开始提取小程序链接 ({total}篇文章):")
-        
-        for i, article in enumerate(articles):
-            print(f"\n{AnimeStyle.ICONS['article']} 处理文章 {i+1}/{total}:")
-            title = article.get('title', '无标题')
-            print(f"标题: {title}")
-            
-            mini_links = self.crawler.extract_mini_links(article['link'])
-            publish_time = datetime.fromtimestamp(article['update_time']).strftime('%Y-%m-%d %H:%M')
-            
-            print(f"发布时间: {publish_time}")
-            print(f"文章链接: {article['link']}")
-            
-            if mini_links:
-                print(f"{AnimeStyle.ICONS['mini']} 找到 {len(mini_links)} 个小程序链接:")
-                for link in mini_links:
-                    print(f"- {link}")
-            else:
-                print(f"{AnimeStyle.ICONS['info']} 未找到小程序链接")
-            
-            results.append({
-                'type': 'article',
-                'title': title,
-                'link': article['link'],
-                'mini_links': mini_links,
-                'time': publish_time,
-                'account': target_account['nickname']
-            })
-        
-        self.results = results
-        return True, f"处理完成！共分析 {len(results)} 篇文章"
-
-    def search_mini_programs(self, keyword):
-        """搜索小程序并保存结果"""
-        print(f"{AnimeStyle.ICONS['mini']} 正在搜索关键词为「{keyword}」的小程序...")
-        miniprograms = self.search_miniprograms(keyword)
-        
-        if not miniprograms:
-            return False, f"未找到关键词为「{keyword}」的小程序 (╥_╥)"
-
-        results = []
-        total = len(miniprograms)
-        print(f"\n{AnimeStyle.ICONS['success']} 找到 {total} 个小程序:")
-        
-        for i, mini in enumerate(miniprograms):
-            name = mini.get('nickname', '无名小程序')
-            appid = mini.get('appid', '')
-            desc = mini.get('desc', '无描述')
-            link = f"weixin://dl/business/?t={mini.get('username', '')}"
-            
-            print(f"\n{i+1}. {name}")
-            print(f"   AppID: {appid}")
-            print(f"   描述: {desc}")
-            print(f"   访问链接: {link}")
-            
-            results.append({
-                'type': 'miniprogram',
-                'name': name,
-                'appid': appid,
-                'desc': desc,
-                'link': link
-            })
-        
-        self.results = results
-        return True, f"搜索完成！共找到 {len(results)} 个小程序"
-
-    def _get_account_type_name(self, account_type):
-        """获取账号类型名称"""
-        type_names = {
-            'all': '所有账号',
-            'official': '公众号',
-            'service': '服务号',
-            'subscription': '订阅号'
-        }
-        return type_names.get(account_type, '账号')
-
-    def export_results(self, filename=None):
-        """导出结果到CSV"""
-        if not self.results:
-            return False, "没有结果可导出 (╥_╥)"
-            
-        if not filename:
-            filename = f"wechat_api_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        if not filename.endswith('.csv'):
-            filename += '.csv'
-            
-        try:
-            with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.writer(f)
-                
-                # 写入表头
-                if self.results[0]['type'] == 'article':
-                    writer.writerow(['文章标题', '公众号', '发布时间', '文章链接', '小程序链接'])
-                else:
-                    writer.writerow(['小程序名称', 'AppID', '描述', '访问链接'])
-                
-                # 写入数据
-                for item in self.results:
-                    if item['type'] == 'article':
-                        mini_links = '\n'.join(item['mini_links']) if item['mini_links'] else ""
-                        writer.writerow([
-                            item['title'],
-                            item['account'],
-                            item['time'],
-                            item['link'],
-                            mini_links
-                        ])
-                    else:
-                        writer.writerow([
-                            item['name'],
-                            item['appid'],
-                            item['desc'],
-                            item['link']
-                        ])
-            
-            return True, f"数据已成功导出到 {filename} {AnimeStyle.ICONS['success']}"
-        except Exception as e:
-            return False, f"导出失败: {str(e)} {AnimeStyle.ICONS['error']}"
-
-    def clear_results(self):
-        """清空结果"""
-        self.results = []
-        return "已清空当前结果 {AnimeStyle.ICONS['clear']}"
-
-# ====================== 主程序类 ======================
-class WeChatAPICLI:
-    """命令行交互主类 (✧ω✧)"""
-    def __init__(self):
-        self.config = ValidationConfig()
-        self.crawler = WeChatAPICrawler(self.config)
-        self.cookie = ""
-        self.token = ""
-        self.init_message()
-
-    def init_message(self):
-        """初始化消息"""
-        print(f"{AnimeStyle.ICONS['info']} {self.config.load_config()}")
-        print(f"{AnimeStyle.ICONS['info']} 提示：请先获取并验证Cookie，然后再进行搜索操作")
-
-    def run(self):
-        """运行主循环"""
-        while True:
-            AnimeStyle.print_title()
-            
-            # 显示当前状态
-            self.print_status()
-            
-            # 显示菜单
-            AnimeStyle.print_menu()
-            
-            # 获取用户选择
-            try:
-                choice = input("请输入操作编号: ").strip()
-                
-                # 根据选择执行相应功能
-                if choice == '1':
-                    self.handle_get_cookie()
-                elif choice == '2':
-                    self.handle_verify_auth()
-                elif choice == '3':
-                    self.handle_search_accounts()
-                elif choice == '4':
-                    self.handle_search_miniprograms()
-                elif choice == '5':
-                    self.handle_export()
-                elif choice == '6':
-                    self.handle_clear()
-                elif choice == '7':
-                    self.handle_config()
-                elif choice == '8':
-                    self.handle_about()
-                elif choice == '9':
-                    print(f"\n{AnimeStyle.ICONS['exit']} 感谢使用微信开放平台接口提取工具，再见！")
-                    print("✧*｡٩(ˊᗜˋ*)و✧*｡\n")
-                    break
-                else:
-                    print(f"{AnimeStyle.ICONS['warning']} 无效的选择，请输入1-9之间的数字")
-            
-            except KeyboardInterrupt:
-                print(f"\n{AnimeStyle.ICONS['warning']} 检测到中断，返回主菜单")
-            except Exception as e:
-                print(f"{AnimeStyle.ICONS['error']} 操作出错: {str(e)}")
-            
-            # 等待用户按回车继续
-            input("\n按回车键继续...")
-            self.clear_screen()
-
-    def print_status(self):
-        """打印当前状态"""
-        status = []
-        status.append(f"{AnimeStyle.ICONS['cookie']} Cookie状态: {'已设置' if self.cookie else '未设置'}")
-        status.append(f"{AnimeStyle.ICONS['token']} Token状态: {'已获取' if self.crawler.token else '未获取'}")
-        status.append(f"{AnimeStyle.ICONS['file']} 结果数量: {len(self.crawler.results)}")
-        print(" | ".join(status))
-        print("-" * 60)
-
-    def clear_screen(self):
-        """清屏"""
-        if sys.platform.startswith('win32'):
-            os.system('cls')
-        else:
-            os.system('clear')
-
-    def handle_get_cookie(self):
-        """处理获取Cookie"""
-        print(f"\n{AnimeStyle.ICONS['cookie']} 获取/输入微信Cookie")
-        print("-" * 50)
-        
-        print("请选择Cookie来源:")
-        print("1. 手动输入")
-        print("2. 自动获取(Chrome浏览器)")
-        print("3. 自动获取(Edge浏览器)")
-        print("4. 自动获取(微信客户端)")
-        
-        try:
-            source = input("请选择 (1-4，默认1): ").strip()
-            source = int(source) if source else 1
-            
-            if source == 1:
-                # 手动输入
-                cookie = input("\n请输入微信Cookie: ").strip()
-                if cookie:
-                    self.cookie = cookie
-                    print(f"{AnimeStyle.ICONS['success']} Cookie已保存")
-                    
-                    # 询问是否输入Token
-                    token = input("是否手动输入Token? (y/n，默认n): ").strip().lower()
-                    if token == 'y':
-                        self.token = input("请输入Token: ").strip()
-                        print(f"{AnimeStyle.ICONS['info']} Token已保存")
-                    else:
-                        self.token = ""
-                        
-            else:
-                # 自动获取
-                print(f"\n{AnimeStyle.ICONS['info']} 正在从来源{source}获取Cookie... 这可能需要几秒钟")
-                print(f"{AnimeStyle.ICONS['info']} 请确保已登录微信网页版或客户端")
-                
-                cookies = WeChatCookieAutoGetter.get_wechat_cookies(source)
-                
-                if cookies:
-                    self.cookie = cookies
-                    print(f"\n{AnimeStyle.ICONS['success']} Cookie获取成功！")
-                    
-                    # 尝试自动提取Token
-                    try:
-                        print(f"{AnimeStyle.ICONS['info']} 尝试自动提取Token...")
-                        cookie_dict = WeChatCookieAutoGetter._cookie_str_to_dict(cookies)
-                        self.crawler.session.cookies.update(cookie_dict)
-                        response = self.crawler._request_with_delay("https://mp.weixin.qq.com/cgi-bin/home")
-                        token_match = re.search(self.config.token_pattern, response.text)
-                        
-                        if token_match:
-                            self.token = token_match.group(1)
-                            print(f"{AnimeStyle.ICONS['success']} Token自动提取成功: {self.token}")
-                        else:
-                            print(f"{AnimeStyle.ICONS['warning']} 无法自动提取Token，请手动输入或验证时自动提取")
-                            self.token = ""
-                    except Exception as e:
-                        print(f"{AnimeStyle.ICONS['warning']} Token提取失败: {str(e)}")
-                        self.token = ""
-                else:
-                    print(f"{AnimeStyle.ICONS['error']} 无法获取有效的Cookie")
-                    print(f"{AnimeStyle.ICONS['info']} 请尝试手动输入Cookie")
-                    
-        except ValueError:
-            print(f"{AnimeStyle.ICONS['error']} 无效的输入")
-        except Exception as e:
-            print(f"{AnimeStyle.ICONS['error']} 操作出错: {str(e)}")
-
-    def handle_verify_auth(self):
-        """处理验证登录态"""
-        if not self.cookie:
-            print(f"{AnimeStyle.ICONS['warning']} 请先获取或输入Cookie")
-            return
-        
-        try:
-            print(f"\n{AnimeStyle.ICONS['token']} 正在验证登录态...")
-            valid, msg = self.crawler.set_cookies_and_token(self.cookie, self.token)
-            
-            if valid:
-                print(f"{AnimeStyle.ICONS['success']} {msg}")
-                if self.crawler.token and not self.token:
-                    self.token = self.crawler.token
-                    print(f"自动提取的Token: {self.token}")
-            else:
-                print(f"{AnimeStyle.ICONS['error']} 验证失败: {msg}")
-                
-        except Exception as e:
-            print(f"{AnimeStyle.ICONS['error']} 验证出错: {str(e)}")
-
-    def handle_search_accounts(self):
-        """处理搜索公众号文章"""
-        if not self.crawler.token or not self.crawler.cookies:
-            print(f"{AnimeStyle.ICONS['warning']} 请先验证登录态！")
-            return
-        
-        try:
-            keyword = input("\n请输入公众号关键词: ").strip()
-            if not keyword:
-                print(f"{AnimeStyle.ICONS['warning']} 关键词不能为空")
-                return
-            
-            print("\n请选择账号类型:")
-            print("1. 全部")
-            print("2. 公众号")
-            print("3. 服务号")
-            print("4. 订阅号")
-            
-            type_choice = input("请选择 (1-4，默认1): ").strip()
-            type_map = {
-                '1': 'all',
-                '2': 'official',
-                '3': 'service',
-                '4': 'subscription'
-            }
-            account_type = type_map.get(type_choice, 'all')
-            
-            try:
-                max_pages = input("请输入最大页数 (1-20，默认5): ").strip()
-                max_pages = int(max_pages) if max_pages else 5
-                if max_pages < 1 or max_pages > 20:
-                    max_pages = 5
-            except ValueError:
-                max_pages = 5
-                
-            try:
-                delay = input("请输入请求延迟(秒) (1-5，默认2): ").strip()
-                delay = int(delay) if delay else 2
-                if delay < 1 or delay > 5:
-                    delay = 2
-            except ValueError:
-                delay = 2
-                
-            self.crawler.set_request_delay(delay)
-            
-            # 执行搜索
-            success, msg = self.crawler.search_account_articles(keyword, account_type, max_pages)
-            if success:
-                print(f"\n{AnimeStyle.ICONS['success']} {msg}")
-            else:
-                print(f"\n{AnimeStyle.ICONS['error']} {msg}")
-                
-        except Exception as e:
-            print(f"{AnimeStyle.ICONS['error']} 搜索出错: {str(e)}")
-
-    def handle_search_miniprograms(self):
-        """处理搜索小程序"""
-        if not self.crawler.token or not self.crawler.cookies:
-            print(f"{AnimeStyle.ICONS['warning']} 请先验证登录态！")
-            return
-        
-        try:
-            keyword = input("\n请输入小程序关键词: ").strip()
-            if not keyword:
-                print(f"{AnimeStyle.ICONS['warning']} 关键词不能为空")
-                return
-            
-            try:
-                delay = input("请输入请求延迟(秒) (1-5，默认2): ").strip()
-                delay = int(delay) if delay else 2
-                if delay < 1 or delay > 5:
-                    delay = 2
-            except ValueError:
-                delay = 2
-                
-            self.crawler.set_request_delay(delay)
-            
-            # 执行搜索
-            success, msg = self.crawler.search_mini_programs(keyword)
-            if success:
-                print(f"\n{AnimeStyle.ICONS['success']} {msg}")
-            else:
-                print(f"\n{AnimeStyle.ICONS['error']} {msg}")
-                
-        except Exception as e:
-            print(f"{AnimeStyle.ICONS['error']} 搜索出错: {str(e)}")
-
-    def handle_export(self):
-        """处理导出结果"""
-        try:
-            filename = input("\n请输入导出文件名 (默认自动生成): ").strip()
-            success, msg = self.crawler.export_results(filename if filename else None)
-            print(msg)
-        except Exception as e:
-            print(f"{AnimeStyle.ICONS['error']} 导出出错: {str(e)}")
-
-    def handle_clear(self):
-        """处理清空结果"""
-        confirm = input(f"\n确定要清空当前结果吗? (y/n): ").strip().lower()
-        if confirm == 'y':
-            msg = self.crawler.clear_results()
-            print(msg)
-        else:
-            print(f"{AnimeStyle.ICONS['info']} 已取消清空操作")
-
-    def handle_config(self):
-        """处理配置验证规则"""
-        print(f"\n{AnimeStyle.ICONS['config']} 验证规则配置")
-        print("-" * 50)
-        print("1. 查看当前配置")
-        print("2. 修改配置")
-        print("3. 重置为默认配置")
-        print("4. 返回主菜单")
-        
-        choice = input("请选择 (1-4): ").strip()
-        
-        if choice == '1':
-            self.config.print_config()
-        elif choice == '2':
-            msg = self.config.configure_interactive()
-            print(msg)
-            # 更新爬虫配置
-            self.crawler = WeChatAPICrawler(self.config)
-        elif choice == '3':
-            confirm = input("确定要重置为默认配置吗? (y/n): ").strip().lower()
-            if confirm == 'y':
-                msg = self.config.reset_to_default()
-                print(msg)
-                # 更新爬虫配置
-                self.crawler = WeChatAPICrawler(self.config)
-            else:
-                print(f"{AnimeStyle.ICONS['info']} 已取消重置操作")
-        elif choice == '4':
-            print(f"{AnimeStyle.ICONS['info']} 返回主菜单")
-        else:
-            print(f"{AnimeStyle.ICONS['warning']} 无效的选择")
-
-    def handle_about(self):
-        """处理关于信息"""
-        about_text = f"""
-{AnimeStyle.ICONS['about']} 微信开放平台接口提取工具 v6.0.0 (命令行版)
-
-作者: p1r07
-更新: 2025-08-25
-依托文档: https://developers.weixin.qq.com/doc/oplatform/developers/dev/api/
-
-✨ 功能亮点:
-✓ 自定义验证字段配置（适配微信API变更）
-✓ 自动/手动双模式获取登录态
-✓ 服务号/订阅号/小程序全类型支持
-✓ 灵活的字段验证规则配置
-✓ 简洁高效的命令行操作体验
-
-使用提示:
-- 请先获取并验证Cookie，然后再进行搜索
-- 当微信API接口变更时，可通过配置功能适配新规则
-- 导出的结果以CSV格式保存，可使用Excel等工具打开
-
-✧*｡٩(ˊᗜˋ*)و✧*｡ 二次元风格工具 by p1r07
-        """
-        print(about_text)
-
-# ====================== 主程序入口 ======================
-def main():
-    """主函数 (✧ω✧)"""
-    try:
-        # 检查必要的库
-        import requests
-        import bs4
-    except ImportError as e:
-        print(f"{AnimeStyle.ICONS['error']} 缺少依赖库: {e} (╥_╥)")
-        print(f"{AnimeStyle.ICONS['info']} 正在尝试自动安装... (◍•ᴗ•◍)")
-        try:
-            import pip
-            pip.main(['install', 'requests', 'beautifulsoup4', 'cryptography'])
-            # Windows系统需要pywin32
-            if sys.platform.startswith('win32'):
-                pip.main(['install', 'pywin32'])
-        except:
-            print(f"{AnimeStyle.ICONS['error']} 自动安装失败，请手动运行:")
-            print("pip install requests beautifulsoup4 cryptography")
-            if sys.platform.startswith('win32'):
-                print("pip install pywin32")
-            return
-    
-    # 运行命令行界面
-    cli = WeChatAPICLI()
-    cli.run()
-
-if __name__ == '__main__':
-    main()
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🌸 微信开放平台接口提取工具 by p1r07 🌸 
+✧*｡٩(ˊᗜˋ*)و✧*｡
+
+作者：p1r07
+版本：6.0.0 (命令行版)
+更新：2025-08-25
+依托文档：https://developers.weixin.qq.com/doc/oplatform/developers/dev/api/
+
+✨ 功能亮点：
+✓ 自定义验证字段配置（适配微信API变更）
+✓ 自动/手动双模式获取登录态
+✓ 服务号/订阅号/小程序全类型支持
+✓ 灵活的字段验证规则配置
+✓ 简洁高效的命令行操作体验
+✓ 无界面子命令模式（适合定时任务，python wechatspider.py -h 查看）
+"""
+
+import os
+import sys
+import logging
+import functools
+from datetime import datetime
+
+import wechat_core
+from wechat_core import (
+    WeChatCookieAutoGetter, SessionStore, RateLimiter, CrawlMetrics, PrometheusExporter, JsonMetricsDumper,
+    CrawlJournal, LinkIndex, SINK_TYPES, open_sink, read_records, LinkExtractor, LinkMatcher,
+    benchmark_extractors, benchmark_matchers, load_corpus, ExtractionRules, AsyncWeChatAPICrawler, ArticleCache
+)
+
+# ====================== 日志配置 ======================
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(message)s',
+    handlers=[logging.FileHandler('wechat_api_crawler.log'), logging.StreamHandler()]
+)
+
+# ====================== 二次元样式与图标 ======================
+class AnimeStyle:
+    """超萌二次元风格配置 ✧(◍˃̶ᗜ˂̶◍)✩"""
+    # 图标集合
+    ICONS = {
+        "success": "✅",
+        "error": "❌",
+        "info": "ℹ️",
+        "warning": "⚠️",
+        "search": "🔍",
+        "file": "📄",
+        "config": "⚙️",
+        "cookie": "🍪",
+        "token": "🔑",
+        "article": "📝",
+        "mini": "📱",
+        "export": "💾",
+        "clear": "🧹",
+        "exit": "🚪",
+        "about": "ℹ️"
+    }
+    
+    @staticmethod
+    def print_title():
+        """打印标题"""
+        print("\n" + "=" * 60)
+        print(f"🌸 微信开放平台接口提取工具 by p1r07 🌸".center(60))
+        print(f"✧*｡٩(ˊᗜˋ*)و✧*｡ 版本: 6.0.0 (命令行版)".center(60))
+        print("=" * 60 + "\n")
+    
+    @staticmethod
+    def print_menu():
+        """打印主菜单"""
+        menu = f"""
+{AnimeStyle.ICONS['info']}  请选择操作 (输入数字1-9):
+1.  {AnimeStyle.ICONS['cookie']}  获取/输入微信Cookie
+2.  {AnimeStyle.ICONS['token']}  验证登录态
+3.  {AnimeStyle.ICONS['search']}  搜索公众号文章
+4.  {AnimeStyle.ICONS['mini']}   搜索小程序
+5.  {AnimeStyle.ICONS['export']}  导出结果到CSV
+6.  {AnimeStyle.ICONS['clear']}   清空当前结果
+7.  {AnimeStyle.ICONS['config']}  配置验证规则
+8.  {AnimeStyle.ICONS['about']}   关于本工具
+9.  {AnimeStyle.ICONS['exit']}    退出工具
+        """
+        print(menu)
+        print("-" * 60)
+
+# ====================== 配置管理类 ======================
+class ValidationConfig:
+    """验证规则配置管理 (◍•ᴗ•◍)"""
+    def __init__(self):
+        # 默认验证字段（基于微信开放平台文档）
+        self.default_core_fields = "wxuin, mm_lang"  # 核心用户标识字段
+        self.default_session_fields = "wxsid, slave_sid, sessionid"  # 会话字段
+        self.default_token_pattern = r'token=(\d+)'  # Token提取正则
+        self.default_api_timeout = 15  # API超时时间（秒）
+        self.default_extractor_backend = "auto"  # 链接提取引擎（auto/stream/lxml/bs4）
+        self.default_link_keywords = "miniprogram, wxurl, weapp, appmsg"  # 小程序链接关键词
+        self.default_rules_file = ""  # 提取规则文件（JSON/YAML，为空时使用上面的关键词和内置正则）
+        
+        # 当前配置
+        self.core_fields = self.default_core_fields
+        self.session_fields = self.default_session_fields
+        self.token_pattern = self.default_token_pattern
+        self.api_timeout = self.default_api_timeout
+        self.extractor_backend = self.default_extractor_backend
+        self.link_keywords = self.default_link_keywords
+        self.rules_file = self.default_rules_file
+        self.config_file = "wechat_api_config.ini"
+        
+        # 尝试加载配置文件
+        self.load_config()
+
+    def get_core_fields_list(self):
+        """获取核心字段列表"""
+        return [f.strip() for f in self.core_fields.split(',') if f.strip()]
+
+    def get_session_fields_list(self):
+        """获取会话字段列表"""
+        return [f.strip() for f in self.session_fields.split(',') if f.strip()]
+
+    def get_link_keywords_list(self):
+        """获取小程序链接关键词列表"""
+        return [k.strip() for k in self.link_keywords.split(',') if k.strip()]
+
+    def load_rules(self):
+        """按配置打开提取规则文件（未配置时返回None）"""
+        return ExtractionRules(self.rules_file) if self.rules_file else None
+
+    def reset_to_default(self):
+        """重置为默认配置"""
+        self.core_fields = self.default_core_fields
+        self.session_fields = self.default_session_fields
+        self.token_pattern = self.default_token_pattern
+        self.api_timeout = self.default_api_timeout
+        self.extractor_backend = self.default_extractor_backend
+        self.link_keywords = self.default_link_keywords
+        self.rules_file = self.default_rules_file
+        self.save_config()
+        return "配置已重置为默认值 ✧*｡٩(ˊᗜˋ*)و✧*｡"
+
+    def save_config(self):
+        """保存配置到文件"""
+        try:
+            with open(self.config_file, 'w', encoding='utf-8') as f:
+                f.write(f"core_fields={self.core_fields}\n")
+                f.write(f"session_fields={self.session_fields}\n")
+                f.write(f"token_pattern={self.token_pattern}\n")
+                f.write(f"api_timeout={self.api_timeout}\n")
+                f.write(f"extractor_backend={self.extractor_backend}\n")
+                f.write(f"link_keywords={self.link_keywords}\n")
+                f.write(f"rules_file={self.rules_file}\n")
+            return f"{AnimeStyle.ICONS['success']} 配置已保存到 {self.config_file}"
+        except Exception as e:
+            return f"{AnimeStyle.ICONS['error']} 保存配置失败: {str(e)}"
+
+    def load_config(self):
+        """从文件加载配置"""
+        try:
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if '=' in line and not line.startswith('#'):
+                            key, value = line.split('=', 1)
+                            if key == 'core_fields':
+                                self.core_fields = value
+                            elif key == 'session_fields':
+                                self.session_fields = value
+                            elif key == 'token_pattern':
+                                self.token_pattern = value
+                            elif key == 'api_timeout':
+                                self.api_timeout = int(value)
+                            elif key == 'extractor_backend':
+                                self.extractor_backend = value
+                            elif key == 'link_keywords':
+                                self.link_keywords = value
+                            elif key == 'rules_file':
+                                self.rules_file = value
+                return f"{AnimeStyle.ICONS['success']} 已加载配置文件"
+            return f"{AnimeStyle.ICONS['info']} 未找到配置文件，使用默认配置"
+        except Exception as e:
+            return f"{AnimeStyle.ICONS['warning']} 加载配置失败: {str(e)}，使用默认配置"
+
+    def print_config(self):
+        """打印当前配置"""
+        print("\n" + "-" * 50)
+        print(f"{AnimeStyle.ICONS['config']} 当前验证规则配置:")
+        print(f"1. 核心用户字段 (必填): {self.core_fields}")
+        print(f"2. 会话字段 (至少一个): {self.session_fields}")
+        print(f"3. Token提取正则: {self.token_pattern}")
+        print(f"4. API超时时间: {self.api_timeout}秒")
+        print(f"5. 链接提取引擎: {self.extractor_backend}")
+        print(f"6. 小程序链接关键词: {self.link_keywords}")
+        print(f"7. 提取规则文件: {self.rules_file or '未使用（内置规则）'}")
+        print("-" * 50 + "\n")
+
+    def configure_interactive(self):
+        """交互式配置"""
+        self.print_config()
+        
+        print(f"{AnimeStyle.ICONS['info']} 按回车保留当前值，输入新值进行修改")
+        
+        # 核心字段配置
+        core_fields = input(f"核心用户字段 [{self.core_fields}]: ").strip()
+        if core_fields:
+            self.core_fields = core_fields
+            
+        # 会话字段配置
+        session_fields = input(f"会话字段 [{self.session_fields}]: ").strip()
+        if session_fields:
+            self.session_fields = session_fields
+            
+        # Token正则配置
+        token_pattern = input(f"Token提取正则 [{self.token_pattern}]: ").strip()
+        if token_pattern:
+            self.token_pattern = token_pattern
+            
+        # 超时配置
+        try:
+            timeout = input(f"API超时时间 [{self.api_timeout}]: ").strip()
+            if timeout:
+                self.api_timeout = int(timeout)
+        except ValueError:
+            print(f"{AnimeStyle.ICONS['warning']} 无效的超时时间，保持原值")
+            
+        # 提取引擎配置
+        backends = ', '.join(['auto'] + LinkExtractor.available_backends())
+        backend = input(f"链接提取引擎 ({backends}) [{self.extractor_backend}]: ").strip()
+        if backend:
+            if backend == 'auto' or backend in LinkExtractor.available_backends():
+                self.extractor_backend = backend
+            else:
+                print(f"{AnimeStyle.ICONS['warning']} 当前环境不支持该引擎，保持原值")
+        
+        # 链接关键词配置
+        link_keywords = input(f"小程序链接关键词 [{self.link_keywords}]: ").strip()
+        if link_keywords:
+            self.link_keywords = link_keywords
+        
+        # 规则文件配置（输入 - 清空）
+        rules_file = input(f"提取规则文件 (JSON/YAML，- 表示不使用) [{self.rules_file}]: ").strip()
+        if rules_file == '-':
+            self.rules_file = ""
+        elif rules_file:
+            try:
+                ExtractionRules(rules_file).load()
+                self.rules_file = rules_file
+            except Exception as e:
+                print(f"{AnimeStyle.ICONS['warning']} 规则文件无效，保持原值: {str(e)}")
+            
+        return self.save_config()
+
+# ====================== 爬虫核心类 ======================
+class WeChatAPICrawler(wechat_core.WeChatAPICrawler):
+    """命令行版爬虫：在共享核心上增加交互式搜索流程和结果导出 ✧థ౪థ✧"""
+    def __init__(self, config: ValidationConfig):
+        super().__init__(config)
+        self.results = []  # 存储爬取结果
+
+    def search_account_articles(self, keyword, account_type='all', max_pages=5, incremental=False, sink=None):
+        """搜索公众号文章并提取小程序链接
+
+        incremental为True时只处理新文章；传入sink时结果逐条写入sink而不在内存中累积。
+        """
+        print(f"{AnimeStyle.ICONS['search']} 正在搜索关键词为「{keyword}」的{self._get_account_type_name(account_type)}...")
+        accounts = self.search_public_accounts(keyword, account_type)
+        
+        if not accounts:
+            return False, f"未找到关键词为「{keyword}」的账号 (╥_╥)"
+
+        # 显示找到的账号并让用户选择
+        print(f"\n{AnimeStyle.ICONS['success']} 找到以下账号:")
+        for i, account in enumerate(accounts[:5], 1):
+            print(f"{i}. {account['nickname']} - {account.get('alias', '无别名')}")
+        
+        try:
+            choice = input("\n请选择要查看的账号 (1-5，默认1): ").strip()
+            index = int(choice) - 1 if choice else 0
+            if index < 0 or index >= min(5, len(accounts)):
+                index = 0
+        except ValueError:
+            index = 0
+            
+        target_account = accounts[index]
+        print(f"\n{AnimeStyle.ICONS['info']} 已选择账号: {target_account['nickname']} ✧*｡٩(ˊᗜˋ*)و✧*｡")
+        
+        mode = "增量模式，只获取新文章" if incremental else f"最多{max_pages}页"
+        print(f"{AnimeStyle.ICONS['article']} 正在获取历史文章... ({mode})")
+        articles = self.get_all_articles(target_account['fakeid'], max_pages, incremental)
+        
+        if not articles:
+            if incremental:
+                return True, "该账号没有新文章 (◍•ᴗ•◍)"
+            return False, "该账号没有可获取的文章 (╯︵╰)"
+
+        todo = self.journal.pending(articles) if self.journal else articles
+        if len(todo) < len(articles):
+            print(f"{AnimeStyle.ICONS['info']} 跳过上次已完成的 {len(articles) - len(todo)} 篇文章")
+        results = []
+        count = 0
+        total = len(todo)
+        failed = []
+        print(f"\n{AnimeStyle.ICONS['info']} 开始提取小程序链接 ({total}篇文章，并发数: {self.max_workers}):")
+        
+        for record in self.iter_article_records(target_account['nickname'], todo, failed=failed):
+            count += 1
+            print(f"\n{AnimeStyle.ICONS['article']} 处理文章 {count + len(failed)}/{total}:")
+            print(f"标题: {record['title']}")
+            print(f"发布时间: {record['time']}")
+            print(f"文章链接: {record['link']}")
+            
+            if record['mini_links']:
+                print(f"{AnimeStyle.ICONS['mini']} 找到 {len(record['mini_links'])} 个小程序链接:")
+                for link in record['mini_links']:
+                    print(f"- {link}")
+            else:
+                print(f"{AnimeStyle.ICONS['info']} 未找到小程序链接")
+            
+            if sink is not None:
+                sink.write(record)
+            else:
+                results.append(record)
+        
+        finished = self.finish_account(target_account['fakeid'], articles, count + len(failed), total, failed)
+        if failed:
+            print(f"{AnimeStyle.ICONS['warning']} {len(failed)} 篇文章提取失败，下次抓取时会重新处理")
+        elif not finished:
+            print(f"{AnimeStyle.ICONS['warning']} 文章列表未能完整获取，下次抓取时会重新处理")
+        self.results = results
+        if sink is not None:
+            return True, f"处理完成！共分析 {count} 篇文章，结果已写入 {sink.path}"
+        return True, f"处理完成！共分析 {count} 篇文章"
+
+    def search_mini_programs(self, keyword, max_results=None):
+        """搜索小程序并保存结果（自动翻页，最多 max_results 个）"""
+        print(f"{AnimeStyle.ICONS['mini']} 正在搜索关键词为「{keyword}」的小程序...")
+        miniprograms = list(self.iter_miniprograms(keyword, max_results))
+        
+        if not miniprograms:
+            return False, f"未找到关键词为「{keyword}」的小程序 (╥_╥)"
+
+        results = []
+        total = len(miniprograms)
+        print(f"\n{AnimeStyle.ICONS['success']} 找到 {total} 个小程序:")
+        
+        for i, mini in enumerate(miniprograms):
+            name = mini.get('nickname', '无名小程序')
+            appid = mini.get('appid', '')
+            desc = mini.get('desc', '无描述')
+            link = f"weixin://dl/business/?t={mini.get('username', '')}"
+            
+            print(f"\n{i+1}. {name}")
+            print(f"   AppID: {appid}")
+            print(f"   描述: {desc}")
+            print(f"   访问链接: {link}")
+            
+            results.append({
+                'type': 'miniprogram',
+                'name': name,
+                'appid': appid,
+                'desc': desc,
+                'link': link
+            })
+        
+        self.results = results
+        return True, f"搜索完成！共找到 {len(results)} 个小程序"
+
+    def _get_account_type_name(self, account_type):
+        """获取账号类型名称"""
+        type_names = {
+            'all': '所有账号',
+            'official': '公众号',
+            'service': '服务号',
+            'subscription': '订阅号'
+        }
+        return type_names.get(account_type, '账号')
+
+    def export_results(self, filename=None):
+        """导出结果（按扩展名选择CSV/JSONL/SQLite/Parquet，默认CSV）"""
+        if not self.results:
+            return False, "没有结果可导出 (╥_╥)"
+            
+        if not filename:
+            filename = f"wechat_api_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        
+        if not filename.endswith(('.csv', '.jsonl', '.json', '.db', '.sqlite', '.parquet')):
+            filename += '.csv'
+            
+        try:
+            with open_sink(filename) as sink:
+                for item in self.results:
+                    sink.write(item)
+            
+            return True, f"数据已成功导出到 {filename} {AnimeStyle.ICONS['success']}"
+        except Exception as e:
+            return False, f"导出失败: {str(e)} {AnimeStyle.ICONS['error']}"
+
+    def clear_results(self):
+        """清空结果"""
+        self.results = []
+        return "已清空当前结果 {AnimeStyle.ICONS['clear']}"
+
+# ====================== 主程序类 ======================
+class WeChatAPICLI:
+    """命令行交互主类 (✧ω✧)"""
+    def __init__(self):
+        self.config = ValidationConfig()
+        self.crawler = self._new_crawler()
+        self.session_store = SessionStore()  # 上次验证通过的登录态
+        self.cookie = ""
+        self.token = ""
+        self.init_message()
+
+    def init_message(self):
+        """初始化消息"""
+        print(f"{AnimeStyle.ICONS['info']} {self.config.load_config()}")
+        if not self.restore_session():
+            print(f"{AnimeStyle.ICONS['info']} 提示：请先获取并验证Cookie，然后再进行搜索操作")
+
+    def restore_session(self):
+        """载入保存的登录态：有效期内的直接可用（不发请求），过期的只预填Cookie等待验证"""
+        cookie, _, fresh = self.session_store.lookup()
+        if not cookie:
+            return False
+        self.cookie = cookie
+        if fresh:
+            valid, msg = self.crawler.login(store=self.session_store)
+            if valid:
+                self.token = self.crawler.token
+                print(f"{AnimeStyle.ICONS['success']} {msg}")
+                return True
+        print(f"{AnimeStyle.ICONS['info']} 已载入上次保存的Cookie，请先验证登录态 (菜单2)")
+        return True
+
+    def run(self):
+        """运行主循环"""
+        while True:
+            AnimeStyle.print_title()
+            
+            # 显示当前状态
+            self.print_status()
+            
+            # 显示菜单
+            AnimeStyle.print_menu()
+            
+            # 获取用户选择
+            try:
+                choice = input("请输入操作编号: ").strip()
+                
+                # 根据选择执行相应功能
+                if choice == '1':
+                    self.handle_get_cookie()
+                elif choice == '2':
+                    self.handle_verify_auth()
+                elif choice == '3':
+                    self.handle_search_accounts()
+                elif choice == '4':
+                    self.handle_search_miniprograms()
+                elif choice == '5':
+                    self.handle_export()
+                elif choice == '6':
+                    self.handle_clear()
+                elif choice == '7':
+                    self.handle_config()
+                elif choice == '8':
+                    self.handle_about()
+                elif choice == '9':
+                    print(f"\n{AnimeStyle.ICONS['exit']} 感谢使用微信开放平台接口提取工具，再见！")
+                    print("✧*｡٩(ˊᗜˋ*)و✧*｡\n")
+                    break
+                else:
+                    print(f"{AnimeStyle.ICONS['warning']} 无效的选择，请输入1-9之间的数字")
+            
+            except KeyboardInterrupt:
+                print(f"\n{AnimeStyle.ICONS['warning']} 检测到中断，返回主菜单")
+            except Exception as e:
+                print(f"{AnimeStyle.ICONS['error']} 操作出错: {str(e)}")
+            
+            # 等待用户按回车继续
+            input("\n按回车键继续...")
+            self.clear_screen()
+
+    def print_status(self):
+        """打印当前状态"""
+        status = []
+        status.append(f"{AnimeStyle.ICONS['cookie']} Cookie状态: {'已设置' if self.cookie else '未设置'}")
+        status.append(f"{AnimeStyle.ICONS['token']} Token状态: {'已获取' if self.crawler.token else '未获取'}")
+        status.append(f"{AnimeStyle.ICONS['file']} 结果数量: {len(self.crawler.results)}")
+        stats = self.crawler.get_connection_stats()
+        if stats['requests']:
+            status.append(f"🔗 连接复用率: {stats['reuse_ratio']:.0%} ({stats['new_connections']}个连接/{stats['requests']}次请求)")
+        print(" | ".join(status))
+        print("-" * 60)
+
+    def clear_screen(self):
+        """清屏"""
+        if sys.platform.startswith('win32'):
+            os.system('cls')
+        else:
+            os.system('clear')
+
+    def handle_get_cookie(self):
+        """处理获取Cookie"""
+        print(f"\n{AnimeStyle.ICONS['cookie']} 获取/输入微信Cookie")
+        print("-" * 50)
+        
+        print("请选择Cookie来源:")
+        print("1. 手动输入")
+        print("2. 自动获取(Chrome浏览器)")
+        print("3. 自动获取(Edge浏览器)")
+        print("4. 自动获取(微信客户端)")
+        
+        try:
+            source = input("请选择 (1-4，默认1): ").strip()
+            source = int(source) if source else 1
+            
+            if source == 1:
+                # 手动输入
+                cookie = input("\n请输入微信Cookie: ").strip()
+                if cookie:
+                    self.cookie = cookie
+                    print(f"{AnimeStyle.ICONS['success']} Cookie已保存")
+                    
+                    # 询问是否输入Token
+                    token = input("是否手动输入Token? (y/n，默认n): ").strip().lower()
+                    if token == 'y':
+                        self.token = input("请输入Token: ").strip()
+                        print(f"{AnimeStyle.ICONS['info']} Token已保存")
+                    else:
+                        self.token = ""
+                        
+            else:
+                # 自动获取
+                print(f"\n{AnimeStyle.ICONS['info']} 正在从来源{source}获取Cookie... 这可能需要几秒钟")
+                print(f"{AnimeStyle.ICONS['info']} 请确保已登录微信网页版或客户端")
+                
+                cookies = WeChatCookieAutoGetter.get_wechat_cookies(source - 1)  # 菜单2-4对应来源1-3
+                
+                if cookies:
+                    self.cookie = cookies
+                    self.token = ""
+                    print(f"\n{AnimeStyle.ICONS['success']} Cookie获取成功！")
+                    print(f"{AnimeStyle.ICONS['info']} Token将在验证登录态时自动提取 (菜单2)")
+                else:
+                    print(f"{AnimeStyle.ICONS['error']} 无法获取有效的Cookie")
+                    print(f"{AnimeStyle.ICONS['info']} 请尝试手动输入Cookie")
+                    
+        except ValueError:
+            print(f"{AnimeStyle.ICONS['error']} 无效的输入")
+        except Exception as e:
+            print(f"{AnimeStyle.ICONS['error']} 操作出错: {str(e)}")
+
+    def handle_verify_auth(self):
+        """处理验证登录态"""
+        if not self.cookie:
+            print(f"{AnimeStyle.ICONS['warning']} 请先获取或输入Cookie")
+            return
+        
+        try:
+            print(f"\n{AnimeStyle.ICONS['token']} 正在验证登录态...")
+            valid, msg = self.crawler.login(self.cookie, self.token or None, self.session_store)
+            
+            if valid:
+                print(f"{AnimeStyle.ICONS['success']} {msg}")
+                if self.crawler.token and not self.token:
+                    self.token = self.crawler.token
+                    print(f"自动提取的Token: {self.token}")
+            else:
+                print(f"{AnimeStyle.ICONS['error']} 验证失败: {msg}")
+                
+        except Exception as e:
+            print(f"{AnimeStyle.ICONS['error']} 验证出错: {str(e)}")
+
+    def handle_search_accounts(self):
+        """处理搜索公众号文章"""
+        if not self.crawler.token or not self.crawler.cookies:
+            print(f"{AnimeStyle.ICONS['warning']} 请先验证登录态！")
+            return
+        
+        try:
+            keyword = input("\n请输入公众号关键词 (输入 @文件路径 批量抓取多个账号): ").strip()
+            if not keyword:
+                print(f"{AnimeStyle.ICONS['warning']} 关键词不能为空")
+                return
+            
+            targets = None
+            if keyword.startswith('@'):
+                targets = self.crawler.load_batch_targets(keyword[1:].strip())
+                if not targets:
+                    print(f"{AnimeStyle.ICONS['warning']} 批量文件中没有可抓取的账号")
+                    return
+                print(f"{AnimeStyle.ICONS['info']} 已读取 {len(targets)} 个批量任务")
+            
+            print("\n请选择账号类型:")
+            print("1. 全部")
+            print("2. 公众号")
+            print("3. 服务号")
+            print("4. 订阅号")
+            
+            type_choice = input("请选择 (1-4，默认1): ").strip()
+            type_map = {
+                '1': 'all',
+                '2': 'official',
+                '3': 'service',
+                '4': 'subscription'
+            }
+            account_type = type_map.get(type_choice, 'all')
+            
+            try:
+                max_pages = input("请输入最大页数 (1-20，默认5): ").strip()
+                max_pages = int(max_pages) if max_pages else 5
+                if max_pages < 1 or max_pages > 20:
+                    max_pages = 5
+            except ValueError:
+                max_pages = 5
+                
+            try:
+                delay = input("请输入请求延迟(秒) (1-5，默认2): ").strip()
+                delay = int(delay) if delay else 2
+                if delay < 1 or delay > 5:
+                    delay = 2
+            except ValueError:
+                delay = 2
+                
+            self.crawler.set_request_delay(delay)
+            
+            try:
+                workers = input("请输入并发数 (1-16，默认4): ").strip()
+                workers = int(workers) if workers else 4
+                if workers < 1 or workers > 16:
+                    workers = 4
+            except ValueError:
+                workers = 4
+                
+            self.crawler.set_max_workers(workers)
+            
+            incremental = input("是否只抓取上次之后的新文章(增量模式)? (y/n，默认n): ").strip().lower() == 'y'
+            
+            if targets is not None:
+                self.handle_batch(targets, account_type, max_pages, incremental)
+                return
+            
+            output = input("边抓取边保存到文件 (.csv/.jsonl/.db/.parquet，留空则保存在内存中稍后导出): ").strip()
+            
+            # 执行搜索
+            if output:
+                resume = self._start_journal(output)
+                success = False
+                try:
+                    with open_sink(output, append=resume) as sink:
+                        success, msg = self.crawler.search_account_articles(
+                            keyword, account_type, max_pages, incremental, sink
+                        )
+                finally:
+                    self._finish_journal(success)
+            else:
+                success, msg = self.crawler.search_account_articles(keyword, account_type, max_pages, incremental)
+            if success:
+                print(f"\n{AnimeStyle.ICONS['success']} {msg}")
+            else:
+                print(f"\n{AnimeStyle.ICONS['error']} {msg}")
+                
+        except Exception as e:
+            print(f"{AnimeStyle.ICONS['error']} 搜索出错: {str(e)}")
+
+    def handle_batch(self, targets, account_type, max_pages, incremental):
+        """处理批量抓取多个账号"""
+        default_output = f"wechat_batch_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        output = input(f"结果保存文件 (.csv/.jsonl/.db/.parquet，默认{default_output}): ").strip() or default_output
+        
+        try:
+            account_workers = input("同时抓取的账号数 (1-8，默认2): ").strip()
+            account_workers = int(account_workers) if account_workers else 2
+            if account_workers < 1 or account_workers > 8:
+                account_workers = 2
+        except ValueError:
+            account_workers = 2
+        
+        total = len(targets)
+        finished = []
+
+        def on_progress(summary):
+            name = summary['account'] or summary['target']
+            if summary['status'] == 'running' and summary['total'] and summary['done'] < summary['total']:
+                return
+            if summary['status'] in ('done', 'stopped', 'failed', 'not_found', 'skipped'):
+                finished.append(summary)
+            status_text = {
+                'searching': f"{AnimeStyle.ICONS['search']} 正在搜索",
+                'running': f"{AnimeStyle.ICONS['article']} 开始抓取",
+                'done': f"{AnimeStyle.ICONS['success']} 完成 {summary['done']} 篇",
+                'stopped': f"{AnimeStyle.ICONS['warning']} 已停止 ({summary['done']}/{summary['total']})",
+                'failed': f"{AnimeStyle.ICONS['error']} 失败: {summary['error']}",
+                'not_found': f"{AnimeStyle.ICONS['warning']} 未找到账号",
+                'skipped': f"{AnimeStyle.ICONS['info']} 已跳过"
+            }.get(summary['status'], summary['status'])
+            print(f"[{len(finished)}/{total}] {name}: {status_text}")
+        
+        resume = self._start_journal(output)
+        summaries = []
+        try:
+            with open_sink(output, append=resume) as sink:
+                summaries = self.crawler.run_batch(
+                    targets, sink.write, account_type, max_pages, incremental,
+                    account_workers, on_progress
+                )
+        finally:
+            self._finish_journal(_batch_finished(summaries) and summaries)
+        
+        done = sum(1 for item in summaries if item['status'] == 'done')
+        articles = sum(item['done'] for item in summaries)
+        print(f"\n{AnimeStyle.ICONS['success']} 批量抓取完成！成功 {done}/{total} 个账号，共 {articles} 篇文章")
+        print(f"{AnimeStyle.ICONS['file']} 结果已写入 {output}")
+
+    def _start_journal(self, output):
+        """为结果文件打开断点续抓日志；发现上次未完成的任务时询问是否继续，返回是否续抓"""
+        journal_path = output + CrawlJournal.SUFFIX
+        resume = False
+        if os.path.exists(journal_path) and os.path.exists(output):
+            choice = input(f"检测到上次未完成的任务 ({journal_path})，是否从中断处继续? (y/n，默认y): ")
+            resume = choice.strip().lower() != 'n'
+        self.crawler.journal = CrawlJournal(journal_path, resume)
+        return resume
+
+    def _finish_journal(self, finished):
+        """关闭断点续抓日志（任务全部完成时删除日志）"""
+        if self.crawler.journal is not None:
+            self.crawler.journal.close(finished=bool(finished))
+            self.crawler.journal = None
+
+    def handle_search_miniprograms(self):
+        """处理搜索小程序"""
+        if not self.crawler.token or not self.crawler.cookies:
+            print(f"{AnimeStyle.ICONS['warning']} 请先验证登录态！")
+            return
+        
+        try:
+            keyword = input("\n请输入小程序关键词: ").strip()
+            if not keyword:
+                print(f"{AnimeStyle.ICONS['warning']} 关键词不能为空")
+                return
+            
+            try:
+                delay = input("请输入请求延迟(秒) (1-5，默认2): ").strip()
+                delay = int(delay) if delay else 2
+                if delay < 1 or delay > 5:
+                    delay = 2
+            except ValueError:
+                delay = 2
+                
+            self.crawler.set_request_delay(delay)
+            
+            default_max = self.crawler.SEARCH_MAX_RESULTS
+            try:
+                max_results = input(f"最多获取多少个结果 (10-500，默认{default_max}): ").strip()
+                max_results = int(max_results) if max_results else default_max
+                if max_results < 10 or max_results > 500:
+                    max_results = default_max
+            except ValueError:
+                max_results = default_max
+            
+            # 执行搜索
+            success, msg = self.crawler.search_mini_programs(keyword, max_results)
+            if success:
+                print(f"\n{AnimeStyle.ICONS['success']} {msg}")
+            else:
+                print(f"\n{AnimeStyle.ICONS['error']} {msg}")
+                
+        except Exception as e:
+            print(f"{AnimeStyle.ICONS['error']} 搜索出错: {str(e)}")
+
+    def handle_export(self):
+        """处理导出结果"""
+        try:
+            filename = input("\n请输入导出文件名 (.csv/.jsonl/.db/.parquet，默认自动生成CSV): ").strip()
+            success, msg = self.crawler.export_results(filename if filename else None)
+            print(msg)
+        except Exception as e:
+            print(f"{AnimeStyle.ICONS['error']} 导出出错: {str(e)}")
+
+    def handle_clear(self):
+        """处理清空结果"""
+        confirm = input(f"\n确定要清空当前结果吗? (y/n): ").strip().lower()
+        if confirm == 'y':
+            msg = self.crawler.clear_results()
+            print(msg)
+        else:
+            print(f"{AnimeStyle.ICONS['info']} 已取消清空操作")
+
+    def handle_config(self):
+        """处理配置验证规则"""
+        print(f"\n{AnimeStyle.ICONS['config']} 验证规则配置")
+        print("-" * 50)
+        print("1. 查看当前配置")
+        print("2. 修改配置")
+        print("3. 重置为默认配置")
+        print("4. 返回主菜单")
+        
+        choice = input("请选择 (1-4): ").strip()
+        
+        if choice == '1':
+            self.config.print_config()
+        elif choice == '2':
+            msg = self.config.configure_interactive()
+            print(msg)
+            # 更新爬虫配置
+            self.crawler = self._new_crawler()
+        elif choice == '3':
+            confirm = input("确定要重置为默认配置吗? (y/n): ").strip().lower()
+            if confirm == 'y':
+                msg = self.config.reset_to_default()
+                print(msg)
+                # 更新爬虫配置
+                self.crawler = self._new_crawler()
+            else:
+                print(f"{AnimeStyle.ICONS['info']} 已取消重置操作")
+        elif choice == '4':
+            print(f"{AnimeStyle.ICONS['info']} 返回主菜单")
+        else:
+            print(f"{AnimeStyle.ICONS['warning']} 无效的选择")
+
+    def _new_crawler(self):
+        """按当前配置创建爬虫（交互模式使用用户缓存目录下的文章缓存）"""
+        crawler = WeChatAPICrawler(self.config)
+        crawler.set_cache(ArticleCache.default_path())
+        return crawler
+
+    def handle_about(self):
+        """处理关于信息"""
+        about_text = f"""
+{AnimeStyle.ICONS['about']} 微信开放平台接口提取工具 v6.0.0 (命令行版)
+
+作者: p1r07
+更新: 2025-08-25
+依托文档: https://developers.weixin.qq.com/doc/oplatform/developers/dev/api/
+
+✨ 功能亮点:
+✓ 自定义验证字段配置（适配微信API变更）
+✓ 自动/手动双模式获取登录态
+✓ 服务号/订阅号/小程序全类型支持
+✓ 灵活的字段验证规则配置
+✓ 简洁高效的命令行操作体验
+
+使用提示:
+- 请先获取并验证Cookie，然后再进行搜索
+- 当微信API接口变更时，可通过配置功能适配新规则
+- 导出的结果以CSV格式保存，可使用Excel等工具打开
+
+✧*｡٩(ˊᗜˋ*)و✧*｡ 二次元风格工具 by p1r07
+        """
+        print(about_text)
+
+# ====================== 无界面命令行 ======================
+DEFAULT_SESSION_FILE = SessionStore.DEFAULT_PATH
+DEFAULT_IMPORT_BUDGET_MS = 60  # 无界面模式的导入耗时上限（不含requests/bs4等按需导入的库）
+
+def _hedge_delay_arg(value):
+    """--search-hedge 的取值：秒数，或 off 表示不对冲（依次尝试各搜索接口）"""
+    import argparse
+    if value.strip().lower() in ('off', 'none'):
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"应为秒数或 off: {value}")
+    if delay < 0:
+        raise argparse.ArgumentTypeError(f"不能为负数: {value}")
+    return delay
+
+def build_arg_parser():
+    """构建无界面命令行参数（适合cron/调度器等无人值守场景）"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='wechatspider.py',
+        description="微信开放平台接口提取工具（无界面模式）；不带参数运行时进入交互菜单"
+    )
+    
+    # 各子命令共用的登录态与抓取参数
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--session', default=DEFAULT_SESSION_FILE, help=f"登录态文件 (默认{DEFAULT_SESSION_FILE})")
+    common.add_argument('--cookie', help="直接指定Cookie字符串（优先于登录态文件）")
+    common.add_argument('--token', help="直接指定Token")
+    common.add_argument('--session-ttl', type=int, default=SessionStore.DEFAULT_TTL,
+                        help=f"登录态验证后免验证复用的秒数，0表示每次都验证 (默认{SessionStore.DEFAULT_TTL})")
+    common.add_argument('--workers', type=int, default=4, help="文章并发抓取数 (默认4)")
+    common.add_argument('--parse-workers', type=int, default=0,
+                        help="HTML解析进程数，0表示在抓取线程内解析 (默认0；多核机器可设为核数)")
+    common.add_argument('--delay', type=float, help="文章请求间隔秒数（默认使用限速器配置）")
+    common.add_argument('--search-hedge', type=_hedge_delay_arg, default=1.0, metavar='SECONDS|off',
+                        help="公众号搜索主接口发出后超过此秒数未返回时同时请求备用接口；"
+                             "off表示不对冲，失败后才换备用接口 (默认1.0)")
+    common.add_argument('--cache', action='store_true',
+                        help=f"使用文章缓存 (默认不使用；位置 {ArticleCache.default_path()})")
+    common.add_argument('--cache-dir', help="文章缓存目录（指定时即使用缓存）")
+    common.add_argument('--extractor', choices=('auto',) + LinkExtractor.BACKENDS, help="链接提取引擎")
+    common.add_argument('--rules', help="提取规则文件 (.json/.yaml，修改后自动重新载入)")
+    common.add_argument('--metrics-port', type=int,
+                        help="在此端口提供Prometheus格式的抓取指标 (http://127.0.0.1:端口/metrics)")
+    common.add_argument('--metrics-json', help="定期把抓取指标写入此JSON文件")
+    common.add_argument('--metrics-interval', type=float, default=30.0, help="JSON指标的写入间隔秒数 (默认30)")
+    
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('-o', '--output', help="结果文件 (.csv/.jsonl/.db/.parquet，默认按时间自动命名的CSV)")
+    output.add_argument('--format', choices=tuple(SINK_TYPES), help="结果格式（默认按扩展名判断）")
+    output.add_argument('--append', action='store_true', help="追加到已有结果文件")
+    
+    dedup = argparse.ArgumentParser(add_help=False)
+    dedup.add_argument('--link-index', help="小程序链接去重索引文件 (SQLite，跨文章、账号和多次运行累积)")
+    dedup.add_argument('--new-links-only', action='store_true',
+                       help="结果中只保留索引里首次出现的链接，没有新链接的文章不输出（需配合--link-index）")
+    
+    type_choices = ('all', 'official', 'service', 'subscription')
+    sub = parser.add_subparsers(dest='command', metavar='COMMAND')
+    
+    p = sub.add_parser('auth', parents=[common], help="验证Cookie并保存登录态")
+    p.add_argument('--source', type=int, choices=(0, 1, 2, 3),
+                   help="自动获取Cookie的来源 (0=全部 1=Chrome 2=Edge 3=微信客户端)")
+    p.add_argument('--cookie-file', help="从文件读取Cookie")
+    p.set_defaults(func=_cmd_auth)
+    
+    p = sub.add_parser('search-accounts', parents=[common], help="搜索公众号，每行输出 fakeid 昵称 别名")
+    p.add_argument('keyword')
+    p.add_argument('--type', default='all', choices=type_choices, help="账号类型")
+    p.add_argument('--json', action='store_true', help="以JSON Lines输出完整搜索结果")
+    p.add_argument('--limit', type=int, default=WeChatAPICrawler.SEARCH_MAX_RESULTS,
+                   help=f"最多获取的结果数，自动翻页 (默认{WeChatAPICrawler.SEARCH_MAX_RESULTS})")
+    p.add_argument('--prefetch', type=int, default=2, help="并发预取的页数 (默认2)")
+    p.set_defaults(func=_cmd_search_accounts)
+    
+    p = sub.add_parser('search-mini', parents=[common, output], help="搜索小程序")
+    p.add_argument('keyword')
+    p.add_argument('--limit', type=int, default=WeChatAPICrawler.SEARCH_MAX_RESULTS,
+                   help=f"最多获取的结果数，自动翻页 (默认{WeChatAPICrawler.SEARCH_MAX_RESULTS})")
+    p.add_argument('--prefetch', type=int, default=2, help="并发预取的页数 (默认2)")
+    p.set_defaults(func=_cmd_search_mini)
+    
+    p = sub.add_parser('fetch-articles', parents=[common, output, dedup], help="抓取一个账号的文章并提取小程序链接")
+    target = p.add_mutually_exclusive_group(required=True)
+    target.add_argument('--fakeid', help="账号fakeid")
+    target.add_argument('--keyword', help="公众号关键词（取搜索结果第一个）")
+    p.add_argument('--name', help="账号显示名称（配合--fakeid使用）")
+    p.add_argument('--type', default='all', choices=type_choices, help="账号类型")
+    p.add_argument('--max-pages', type=int, default=5, help="最大页数 (默认5)")
+    p.add_argument('--incremental', action='store_true', help="只抓取上次之后的新文章")
+    p.add_argument('--async', dest='use_async', action='store_true',
+                   help="使用aiohttp异步后端（--workers为同时在途的文章请求数，可设到上百）")
+    p.add_argument('--resume', action='store_true',
+                   help="从上次中断处继续（需用 -o 指定上次的结果文件，结果追加写入）")
+    p.set_defaults(func=_cmd_fetch_articles)
+    
+    p = sub.add_parser('batch', parents=[common, output, dedup], help="按任务文件批量抓取多个账号")
+    p.add_argument('targets', help="任务文件：每行一个关键词或 fakeid:<id> [名称]")
+    p.add_argument('--type', default='all', choices=type_choices, help="账号类型")
+    p.add_argument('--max-pages', type=int, default=5, help="每个账号最大页数 (默认5)")
+    p.add_argument('--incremental', action='store_true', help="只抓取上次之后的新文章")
+    p.add_argument('--account-workers', type=int, default=2, help="同时抓取的账号数 (默认2)")
+    p.add_argument('--async', dest='use_async', action='store_true',
+                   help="使用aiohttp异步后端（--workers为同时在途的文章请求数，可设到上百）")
+    p.add_argument('--resume', action='store_true',
+                   help="从上次中断处继续，跳过已完成的账号和文章（需用 -o 指定上次的结果文件）")
+    p.set_defaults(func=_cmd_batch)
+    
+    p = sub.add_parser('extract', parents=[common, output, dedup], help="提取指定文章中的小程序链接")
+    p.add_argument('urls', nargs='*', help="文章链接")
+    p.add_argument('-i', '--input', help="文章链接列表文件，每行一个（- 表示标准输入）")
+    p.set_defaults(func=_cmd_extract)
+    
+    p = sub.add_parser('export', help="在CSV/JSONL/SQLite之间转换结果文件")
+    p.add_argument('input', help="已有结果文件")
+    p.add_argument('-o', '--output', required=True, help="目标文件")
+    p.add_argument('--format', choices=tuple(SINK_TYPES), help="目标格式（默认按扩展名判断）")
+    p.add_argument('--input-format', choices=tuple(SINK_TYPES), help="输入格式（默认按扩展名判断）")
+    p.set_defaults(func=_cmd_export)
+    
+    p = sub.add_parser('links', help="导出链接去重索引（每个小程序链接一行）")
+    p.add_argument('index', help="去重索引文件（--link-index 生成）")
+    p.add_argument('-o', '--output', required=True, help="目标文件 (.csv 或 .jsonl)")
+    p.set_defaults(func=_cmd_links)
+    
+    p = sub.add_parser('bench', help="在保存的文章页面上比较各链接提取引擎")
+    p.add_argument('corpus', nargs='+', help=".html文件或目录")
+    p.add_argument('--backends', nargs='+', choices=LinkExtractor.BACKENDS, help="参与比较的引擎")
+    p.add_argument('--repeat', type=int, default=3, help="重复次数，取最快一次 (默认3)")
+    p.set_defaults(func=_cmd_bench)
+    
+    p = sub.add_parser('bench-match', help="在保存的文章页面上校验匹配器与逐个匹配的结果一致并对比耗时")
+    p.add_argument('corpus', nargs='+', help=".html文件或目录")
+    p.add_argument('--keywords', help="小程序链接关键词，逗号分隔 (默认取配置)")
+    p.add_argument('--repeat', type=int, default=3, help="重复次数，取最快一次 (默认3)")
+    p.set_defaults(func=_cmd_bench_match)
+    
+    p = sub.add_parser('rules', help="校验提取规则文件并检查其单页匹配耗时")
+    p.add_argument('file', help="规则文件 (.json/.yaml)")
+    p.add_argument('--init', action='store_true', help="把内置规则写成JSON规则文件模板")
+    p.add_argument('--corpus', nargs='+', help="用保存的文章页面测耗时（默认用内置样例页面）")
+    p.set_defaults(func=_cmd_rules)
+    
+    p = sub.add_parser('importtime', help="用 -X importtime 测量模块导入耗时（启动性能回归检查）")
+    p.add_argument('--module', default='wechatspider', help="被测模块 (默认wechatspider)")
+    p.add_argument('--budget-ms', type=float, default=DEFAULT_IMPORT_BUDGET_MS,
+                   help=f"导入耗时上限，超出时返回非零退出码 (默认{DEFAULT_IMPORT_BUDGET_MS:g}ms)")
+    p.add_argument('--repeat', type=int, default=5, help="测量次数，取最快一次 (默认5)")
+    p.add_argument('--top', type=int, default=10, help="列出自身耗时最高的模块数 (默认10)")
+    p.set_defaults(func=_cmd_importtime)
+    
+    return parser
+
+def _session_store(args):
+    """按命令行参数打开登录态存储"""
+    return SessionStore(args.session, args.session_ttl)
+
+def _wait_for_rules(crawler):
+    """等规则文件首次载入和耗时检查完成再开始抓取（抓取中取规则不会等待，之前的页面会用内置规则）"""
+    if crawler.extractor.rules is not None:
+        crawler.extractor.rules.wait_ready()
+
+def _configure_cache(crawler, args):
+    """按 --cache/--cache-dir 开启文章缓存（无界面模式默认不使用缓存）"""
+    if args.cache_dir:
+        crawler.set_cache(os.path.join(args.cache_dir, ArticleCache.FILE_NAME))
+    elif args.cache:
+        crawler.set_cache(ArticleCache.default_path())
+
+def _headless_crawler(args, require_auth=True):
+    """按命令行参数创建爬虫；require_auth为True时载入登录态"""
+    missing = missing_dependencies()
+    if missing:
+        raise Exception(f"缺少依赖库: {', '.join(missing)}，请运行 pip install {' '.join(missing)}")
+    config = ValidationConfig()
+    if args.extractor:
+        config.extractor_backend = args.extractor
+    if args.rules:
+        config.rules_file = args.rules
+    crawler = WeChatAPICrawler(config)
+    crawler.metrics = args.metrics
+    crawler.set_max_workers(args.workers)
+    crawler.set_parse_workers(args.parse_workers)
+    crawler.search_hedge_delay = args.search_hedge
+    if args.delay:
+        crawler.set_request_delay(args.delay)
+    _configure_cache(crawler, args)
+    
+    if require_auth:
+        valid, msg = crawler.login(args.cookie, args.token, _session_store(args))
+        if not valid:
+            raise Exception(f"登录态无效: {msg}，请先运行 auth 子命令或通过 --cookie/--token 指定")
+        logging.info(msg)
+    _wait_for_rules(crawler)  # 规则检查与登录验证同时进行
+    return crawler
+
+async def _headless_async_crawler(args):
+    """按命令行参数创建异步爬虫并载入登录态（--workers为同时在途的请求数）"""
+    if 'aiohttp' in missing_dependencies(required_only=False):
+        raise Exception("异步后端需要aiohttp，请运行 pip install aiohttp")
+    config = ValidationConfig()
+    if args.extractor:
+        config.extractor_backend = args.extractor
+    if args.rules:
+        config.rules_file = args.rules
+    crawler = AsyncWeChatAPICrawler(config, max_concurrency=args.workers)
+    crawler.metrics = args.metrics
+    crawler.set_parse_workers(args.parse_workers)
+    crawler.search_hedge_delay = args.search_hedge
+    if args.delay:
+        for endpoint in (RateLimiter.APPMSG, RateLimiter.ARTICLE):
+            crawler.rate_limiter.configure(endpoint, rate=1 / args.delay, jitter=1.0)
+    _configure_cache(crawler, args)
+    
+    valid, msg = await crawler.login(args.cookie, args.token, _session_store(args))
+    if not valid:
+        await crawler.close()
+        raise Exception(f"登录态无效: {msg}，请先运行 auth 子命令或通过 --cookie/--token 指定")
+    logging.info(msg)
+    await crawler._blocking(_wait_for_rules, crawler)
+    return crawler
+
+def _output_path(args, prefix):
+    """子命令的结果文件（未指定时按时间自动命名）"""
+    return args.output or f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+
+def _open_output(args, prefix):
+    """打开子命令的结果输出"""
+    return open_sink(_output_path(args, prefix), args.format, args.append)
+
+def _open_journaled_output(args, prefix):
+    """打开结果输出及其断点续抓日志，返回 (sink, journal)
+
+    --resume 时读入上次的日志，结果追加到原文件；任务完成后由调用方关闭日志。
+    """
+    if args.resume and not args.output:
+        raise Exception("--resume 需要用 -o 指定上次的结果文件")
+    output = _output_path(args, prefix)
+    journal_path = output + CrawlJournal.SUFFIX
+    resume = args.resume and os.path.exists(journal_path)
+    if args.resume and not resume:
+        logging.warning(f"未找到断点续抓日志 {journal_path}，将从头开始")
+    sink = open_sink(output, args.format, args.append or resume)
+    return sink, CrawlJournal(journal_path, resume)
+
+def _batch_finished(summaries):
+    """批量任务是否全部完成（失败或中断的账号留待续抓）"""
+    return all(item['status'] in ('done', 'not_found') for item in summaries)
+
+def _record_writer(args, sink):
+    """结果写入函数，返回 (写入函数, 去重索引或None)
+
+    指定 --link-index 时每条结果先登记到索引；--new-links-only 时只写出首次出现的链接。
+    """
+    if not args.link_index:
+        if args.new_links_only:
+            raise Exception("--new-links-only 需要配合 --link-index 使用")
+        return sink.write, None
+    index = LinkIndex(args.link_index)
+
+    def write(record):
+        new_links = index.add_record(record)
+        if args.new_links_only:
+            if not new_links:
+                return
+            record = dict(record, mini_links=new_links)
+        sink.write(record)
+    return write, index
+
+def _close_link_index(index):
+    """任务结束时记录去重索引统计并关闭"""
+    if index is None:
+        return
+    stats = index.stats()
+    logging.info(f"链接去重索引: {stats['links']} 个不同链接（{stats['appids']} 个AppID），累计出现 {stats['hits']} 次")
+    index.close()
+
+def _start_metrics_exporters(args):
+    """按命令行参数启动指标导出器"""
+    exporters = []
+    if getattr(args, 'metrics_port', None) is not None:
+        exporters.append(PrometheusExporter(args.metrics, args.metrics_port).start())
+    if getattr(args, 'metrics_json', None):
+        exporters.append(JsonMetricsDumper(args.metrics, args.metrics_json, args.metrics_interval).start())
+    return exporters
+
+def _log_connection_stats(crawler):
+    """任务结束时记录连接复用情况"""
+    stats = crawler.get_connection_stats()
+    logging.info(
+        f"连接统计: 请求 {stats['requests']} 次，新建连接 {stats['new_connections']} 个，"
+        f"复用率 {stats['reuse_ratio']:.0%}，空闲连接 {stats['idle_connections']}/{stats['pool_maxsize']}"
+    )
+
+def _cmd_auth(args):
+    """验证Cookie并保存登录态"""
+    crawler = _headless_crawler(args, require_auth=False)
+    store = _session_store(args)
+    cookie = args.cookie
+    if args.cookie_file:
+        with open(args.cookie_file, 'r', encoding='utf-8') as f:
+            cookie = f.read().strip()
+    if not cookie and args.source is not None:
+        cookie = WeChatCookieAutoGetter.get_wechat_cookies(args.source)
+    if not cookie:
+        cookie = store.load().get('cookie')
+    if not cookie:
+        print(f"{AnimeStyle.ICONS['error']} 未获取到Cookie，请通过 --cookie/--cookie-file/--source 指定")
+        return 1
+    
+    valid, msg = crawler.set_cookies_and_token(cookie, args.token)
+    if not valid:
+        print(f"{AnimeStyle.ICONS['error']} 验证失败: {msg}")
+        return 1
+    store.save(cookie, crawler.token, validated=not args.token)
+    print(f"{AnimeStyle.ICONS['success']} {msg}，登录态已保存到 {args.session}")
+    return 0
+
+def _cmd_search_accounts(args):
+    """搜索公众号"""
+    import json
+    crawler = _headless_crawler(args)
+    count = 0
+    for account in crawler.iter_public_accounts(args.keyword, args.type, args.limit, args.prefetch):
+        count += 1
+        if args.json:
+            print(json.dumps(account, ensure_ascii=False), flush=True)
+        else:
+            print(f"{account.get('fakeid', '')}\t{account.get('nickname', '')}\t{account.get('alias', '')}", flush=True)
+    return 0 if count else 1
+
+def _cmd_search_mini(args):
+    """搜索小程序"""
+    crawler = _headless_crawler(args)
+    with _open_output(args, 'wechat_mini_results') as sink:
+        for mini in crawler.iter_miniprograms(args.keyword, args.limit, args.prefetch):
+            sink.write({
+                'type': 'miniprogram',
+                'name': mini.get('nickname', '无名小程序'),
+                'appid': mini.get('appid', ''),
+                'desc': mini.get('desc', '无描述'),
+                'link': f"weixin://dl/business/?t={mini.get('username', '')}"
+            })
+    print(f"{AnimeStyle.ICONS['success']} 共找到 {sink.count} 个小程序，已写入 {sink.path}")
+    return 0 if sink.count else 1
+
+def _cmd_fetch_articles(args):
+    """抓取单个账号的文章"""
+    if args.use_async:
+        import asyncio
+        return asyncio.run(_async_fetch_articles(args))
+    crawler = _headless_crawler(args)
+    if args.fakeid:
+        account = {'fakeid': args.fakeid, 'nickname': args.name or args.fakeid}
+    else:
+        account = crawler.resolve_batch_target({'kind': 'keyword', 'value': args.keyword}, args.type)
+        if not account:
+            print(f"{AnimeStyle.ICONS['error']} 未找到关键词为「{args.keyword}」的账号")
+            return 1
+    
+    sink, crawler.journal = _open_journaled_output(args, 'wechat_api_results')
+    write, index = _record_writer(args, sink)
+    finished = False
+    try:
+        with sink:
+            count = crawler.crawl_account(account, args.max_pages, args.incremental, write)
+        finished = True
+    finally:
+        crawler.journal.close(finished)
+        _close_link_index(index)
+    _log_connection_stats(crawler)
+    print(f"{AnimeStyle.ICONS['success']} {account['nickname']}: 共处理 {count} 篇文章，已写入 {sink.path}")
+    return 0
+
+async def _async_fetch_articles(args):
+    """fetch-articles 的异步后端实现"""
+    crawler = await _headless_async_crawler(args)
+    async with crawler:
+        if args.fakeid:
+            account = {'fakeid': args.fakeid, 'nickname': args.name or args.fakeid}
+        else:
+            account = await crawler.resolve_batch_target({'kind': 'keyword', 'value': args.keyword}, args.type)
+            if not account:
+                print(f"{AnimeStyle.ICONS['error']} 未找到关键词为「{args.keyword}」的账号")
+                return 1
+        
+        sink, crawler.journal = _open_journaled_output(args, 'wechat_api_results')
+        write, index = _record_writer(args, sink)
+        finished = False
+        try:
+            with sink:
+                count = await crawler.crawl_account(account, args.max_pages, args.incremental, write)
+            finished = True
+        finally:
+            crawler.journal.close(finished)
+            _close_link_index(index)
+    print(f"{AnimeStyle.ICONS['success']} {account['nickname']}: 共处理 {count} 篇文章，已写入 {sink.path}")
+    return 0
+
+def _log_batch_progress(summary):
+    """批量任务中账号结束时记录一行日志"""
+    if summary['status'] in ('done', 'stopped', 'failed', 'not_found', 'skipped'):
+        detail = summary['error'] if summary['status'] == 'failed' else f"{summary['done']} 篇"
+        logging.info(f"{summary['account'] or summary['target']}: {summary['status']} ({detail})")
+
+def _cmd_batch(args):
+    """按任务文件批量抓取"""
+    targets = WeChatAPICrawler.load_batch_targets(args.targets)
+    if not targets:
+        print(f"{AnimeStyle.ICONS['warning']} 批量文件中没有可抓取的账号")
+        return 1
+    
+    if args.use_async:
+        import asyncio
+        summaries, count, path = asyncio.run(_async_batch(args, targets))
+    else:
+        crawler = _headless_crawler(args)
+        sink, crawler.journal = _open_journaled_output(args, 'wechat_batch_results')
+        write, index = _record_writer(args, sink)
+        summaries = []
+        try:
+            with sink:
+                summaries = crawler.run_batch(
+                    targets, write, args.type, args.max_pages, args.incremental,
+                    args.account_workers, _log_batch_progress
+                )
+        finally:
+            crawler.journal.close(_batch_finished(summaries) and bool(summaries))
+            _close_link_index(index)
+        _log_connection_stats(crawler)
+        count, path = sink.count, sink.path
+    done = sum(1 for item in summaries if item['status'] == 'done')
+    print(f"{AnimeStyle.ICONS['success']} 成功 {done}/{len(targets)} 个账号，共 {count} 篇文章，已写入 {path}")
+    return 0 if done == len(targets) else 1
+
+async def _async_batch(args, targets):
+    """batch 的异步后端实现，返回 (各账号汇总, 文章数, 结果文件)"""
+    crawler = await _headless_async_crawler(args)
+    async with crawler:
+        sink, crawler.journal = _open_journaled_output(args, 'wechat_batch_results')
+        write, index = _record_writer(args, sink)
+        summaries = []
+        try:
+            with sink:
+                summaries = await crawler.run_batch(
+                    targets, write, args.type, args.max_pages, args.incremental,
+                    args.account_workers, _log_batch_progress
+                )
+        finally:
+            crawler.journal.close(_batch_finished(summaries) and bool(summaries))
+            _close_link_index(index)
+    return summaries, sink.count, sink.path
+
+def _cmd_extract(args):
+    """提取指定文章的小程序链接"""
+    urls = list(args.urls)
+    if args.input:
+        stream = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+        with stream:
+            urls.extend(line.strip() for line in stream if line.strip())
+    if not urls:
+        print(f"{AnimeStyle.ICONS['warning']} 请提供文章链接或 --input 链接列表文件")
+        return 1
+    
+    crawler = _headless_crawler(args, require_auth=False)
+    with _open_output(args, 'wechat_extract_results') as sink:
+        write, index = _record_writer(args, sink)
+        failed = 0
+        try:
+            for url, mini_links in zip(urls, crawler.iter_mini_links(urls)):
+                if mini_links is None:
+                    failed += 1
+                    continue
+                write({
+                    'type': 'article', 'title': '', 'link': url,
+                    'mini_links': mini_links, 'time': '', 'account': ''
+                })
+        finally:
+            _close_link_index(index)
+    _log_connection_stats(crawler)
+    print(f"{AnimeStyle.ICONS['success']} 已处理 {sink.count} 篇文章，已写入 {sink.path}")
+    if failed:
+        print(f"{AnimeStyle.ICONS['warning']} {failed} 篇文章提取失败（详见日志）")
+        return 1
+    return 0
+
+def _cmd_export(args):
+    """转换结果文件格式"""
+    with open_sink(args.output, args.format) as sink:
+        for record in read_records(args.input, args.input_format):
+            sink.write(record)
+    print(f"{AnimeStyle.ICONS['success']} 已导出 {sink.count} 条记录到 {args.output}")
+    return 0
+
+def _cmd_links(args):
+    """导出链接去重索引"""
+    if not os.path.exists(args.index):
+        print(f"{AnimeStyle.ICONS['error']} 去重索引不存在: {args.index}")
+        return 1
+    index = LinkIndex(args.index)
+    try:
+        count = index.export(args.output)
+    finally:
+        index.close()
+    print(f"{AnimeStyle.ICONS['success']} 已导出 {count} 个不同的小程序链接到 {args.output}")
+    return 0
+
+def _cmd_bench(args):
+    """比较各链接提取引擎"""
+    rows = benchmark_extractors(args.corpus, args.backends, args.repeat)
+    print(f"{'引擎':<10}{'页面数':>8}{'毫秒/页':>12}{'不一致':>8}")
+    for row in rows:
+        mismatches = '-' if row['mismatches'] is None else row['mismatches']
+        print(f"{row['backend']:<10}{row['pages']:>8}{row['ms_per_page']:>12.2f}{mismatches:>8}")
+    if any(row['mismatches'] for row in rows):
+        print(f"{AnimeStyle.ICONS['warning']} 有引擎提取的链接集合与原实现不一致")
+        return 1
+    if rows and rows[0]['mismatches'] is None:
+        print(f"{AnimeStyle.ICONS['info']} 未安装bs4，无法与原实现比较结果")
+    return 0
+
+def _cmd_bench_match(args):
+    """校验匹配器与逐个匹配的结果一致，并列出各匹配方式的耗时"""
+    config = ValidationConfig()
+    if args.keywords:
+        config.link_keywords = args.keywords
+    rows = benchmark_matchers(args.corpus, LinkMatcher.get(config.get_link_keywords_list()), args.repeat)
+    print(f"{'匹配方式':<14}{'页面数':>8}{'毫秒/页':>12}{'不一致':>8}")
+    for row in rows:
+        print(f"{row['matcher']:<14}{row['pages']:>8}{row['ms_per_page']:>12.3f}{row['mismatches']:>8}")
+    mismatches = next(row['mismatches'] for row in rows if row['matcher'] == 'matcher')
+    if mismatches:
+        print(f"{AnimeStyle.ICONS['warning']} 有 {mismatches} 个页面的匹配结果与逐个匹配不一致")
+        return 1
+    return 0
+
+def _cmd_rules(args):
+    """写出规则模板，或校验规则文件并与内置规则比较耗时"""
+    import json
+    if args.init:
+        if os.path.exists(args.file):
+            raise Exception(f"{args.file} 已存在")
+        with open(args.file, 'w', encoding='utf-8') as f:
+            json.dump(ExtractionRules.builtin_rules(), f, ensure_ascii=False, indent=2)
+        print(f"{AnimeStyle.ICONS['success']} 已写出内置规则到 {args.file}")
+        return 0
+    
+    rules = ExtractionRules(args.file).read()
+    matcher = ExtractionRules.compile(rules)
+    pages = None
+    if args.corpus:
+        pages = [LinkExtractor._parse_stream(page) for page in load_corpus(args.corpus)]
+    max_ratio = float(rules.get('max_cost_ratio', ExtractionRules.DEFAULT_COST_RATIO))
+    cost, baseline, ratio = ExtractionRules.check_cost(matcher, max_ratio, pages)
+    print(f"{AnimeStyle.ICONS['info']} 版本 {rules.get('version', '-')}：{len(matcher.keywords)} 个关键词，"
+          f"{len(matcher.script_patterns)} 条脚本正则")
+    print(f"{AnimeStyle.ICONS['success']} 单页匹配 {cost:.3f}ms，内置规则 {baseline:.3f}ms，"
+          f"{ratio:.2f} 倍（上限 {max_ratio:g} 倍）")
+    return 0
+
+def _cmd_importtime(args):
+    """测量导入耗时并与上限比较"""
+    result = measure_import_time(args.module, args.repeat, args.top)
+    print(f"{'模块':<40}{'自身ms':>10}{'累计ms':>10}")
+    for name, self_ms, cumulative_ms in result['modules']:
+        print(f"{name:<40}{self_ms:>10.2f}{cumulative_ms:>10.2f}")
+    within = result['total_ms'] <= args.budget_ms
+    icon = AnimeStyle.ICONS['success'] if within else AnimeStyle.ICONS['error']
+    print(f"{icon} 导入 {args.module} 共 {result['total_ms']:.1f}ms（上限 {args.budget_ms:g}ms）")
+    return 0 if within else 1
+
+def run_headless(argv):
+    """执行无界面子命令，返回进程退出码"""
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, 'func', None):
+        parser.print_help()
+        return 2
+    args.metrics = CrawlMetrics()  # 本次命令中所有爬虫共用
+    exporters = []
+    try:
+        exporters = _start_metrics_exporters(args)
+        return args.func(args)
+    except KeyboardInterrupt:
+        print(f"\n{AnimeStyle.ICONS['warning']} 已中断")
+        return 130
+    except Exception as e:
+        logging.error(f"{args.command} 执行失败: {str(e)}")
+        return 1
+    finally:
+        for exporter in exporters:
+            exporter.stop()
+        if args.metrics.summary()['endpoints']:
+            logging.info(f"抓取指标:\n{args.metrics.format_summary()}")
+
+# ====================== 依赖检查 ======================
+# 模块名 -> (pip包名, 是否必需)；可选依赖缺失时只有对应功能不可用
+DEPENDENCIES = {
+    'requests': ('requests', True),
+    'bs4': ('beautifulsoup4', False),  # bs4链接提取引擎
+    'lxml': ('lxml', False),  # lxml链接提取引擎
+    'cryptography': ('cryptography', False),  # 浏览器Cookie解密
+    'pyarrow': ('pyarrow', False),  # Parquet导出
+    'yaml': ('pyyaml', False),  # YAML提取规则文件
+    'aiohttp': ('aiohttp', False),  # 异步抓取后端
+}
+if sys.platform.startswith('win32'):
+    DEPENDENCIES['win32crypt'] = ('pywin32', False)
+else:
+    DEPENDENCIES['keyring'] = ('keyring', False)  # 读取Linux下浏览器v11 Cookie的口令
+
+@functools.lru_cache(maxsize=None)
+def missing_dependencies(required_only=True):
+    """返回缺失依赖的pip包名列表（只查找模块位置不实际导入，同一进程内结果缓存）"""
+    import importlib.util
+    missing = []
+    for module, (package, required) in DEPENDENCIES.items():
+        if required_only and not required:
+            continue
+        try:
+            found = importlib.util.find_spec(module) is not None
+        except (ImportError, ValueError):
+            found = False
+        if not found:
+            missing.append(package)
+    return tuple(missing)
+
+def measure_import_time(module='wechatspider', repeat=3, top=10):
+    """用 python -X importtime 测量模块导入耗时（取多次中最快一次）
+
+    返回 {'total_ms', 'modules': [(模块名, 自身耗时ms, 累计耗时ms), ...]}，
+    modules按自身耗时降序取前top个，用于定位拖慢启动的导入；
+    输出中没有该模块记录的那次测量不计入，每次都没有时抛出异常。
+    先不计时导入一次写好字节码缓存，测的是日常启动时的导入，不含编译源码的时间。
+    """
+    import subprocess
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)  # 否则过期的.pyc不会更新，每次导入都重新编译
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [script_dir, env.get('PYTHONPATH')]))
+    subprocess.run([sys.executable, '-c', f'import {module}'], env=env, capture_output=True)
+    
+    best = None
+    for _ in range(max(1, repeat)):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            env=env, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            raise Exception(f"导入 {module} 失败: {proc.stderr.strip().splitlines()[-1]}")
+        rows = []
+        total = None
+        for line in proc.stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+            if name.strip() == module:
+                total = int(cumulative_us) / 1000
+        if total is None:
+            continue  # 本次输出中没有该模块的记录
+        if best is None or total < best['total_ms']:
+            best = {'total_ms': total, 'modules': sorted(rows, key=lambda r: -r[1])[:top]}
+    if best is None:
+        raise Exception(f"-X importtime 输出中没有 {module} 的记录（可能在解释器启动时已导入，或模块名不是完整的导入路径），无法测量")
+    return best
+
+# ====================== 主程序入口 ======================
+def main(argv=None):
+    """主函数 (✧ω✧)
+
+    带子命令参数运行时走无界面模式（不显示菜单、不清屏），否则进入交互菜单。
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        sys.exit(run_headless(argv))
+    
+    # 检查必要的库（只查找不导入，不会在启动时调用pip）
+    missing = missing_dependencies()
+    if missing:
+        print(f"{AnimeStyle.ICONS['error']} 缺少依赖库: {', '.join(missing)} (╥_╥)")
+        print(f"{AnimeStyle.ICONS['info']} 请手动运行: pip install {' '.join(missing)}")
+        return
+    
+    # 运行命令行界面
+    cli = WeChatAPICLI()
+    cli.run()
+
+if __name__ == '__main__':
+    import multiprocessing
+    multiprocessing.freeze_support()  # 打包为exe后解析进程也从这里启动
+    main()
     
\ No newline at end of file